@@ -0,0 +1,49 @@
+"""
+Compares the "python" and "array" search engines of CityMap.dijkstras on a city where a few hub locations have thousands
+of roads, with the array engine run both with NumPy (if installed) and with the array module fallback.
+
+Usage: python -m benchmarks.bench_array_engine
+"""
+import random
+import time
+from unittest.mock import patch
+
+from src import arrayengine
+from src.assignment1 import CityMap
+from benchmarks.generators import random_city
+
+
+SIZES = [(50_000, 50_000, 20), (50_000, 50_000, 100)] # (locations, extra roads, hubs)
+HUB_DEGREE = 10_000
+SOURCES = 3
+
+
+def main() -> None:
+    for n, extra, hub_count in SIZES:
+        rng = random.Random(n)
+        roads = random_city(n, extra, seed=n)
+        seen = {(min(u, v), max(u, v)) for u, v, _ in roads}
+        for hub in rng.sample(range(n), hub_count):
+            for v in rng.sample(range(n), HUB_DEGREE):
+                if v != hub and (min(hub, v), max(hub, v)) not in seen:
+                    seen.add((min(hub, v), max(hub, v)))
+                    roads.append((hub, v, rng.randint(50, 100)))
+        city = CityMap(roads, [], [("Grizz", 0)], backend="csr")
+
+        runs = [("python", None), ("array", "array module")]
+        if arrayengine.numpy is not None:
+            runs.append(("array", "numpy"))
+
+        for engine, variant in runs:
+            numpy = arrayengine.numpy if variant == "numpy" else None
+            with patch.object(arrayengine, "numpy", numpy):
+                begin = time.perf_counter()
+                for source in range(SOURCES):
+                    city.dijkstras(start_node=source * (n // SOURCES), engine=engine)
+                elapsed = (time.perf_counter() - begin) / SOURCES
+            label = engine if variant is None else f"{engine} ({variant})"
+            print(f"|L|={n} |R|={len(roads)} hubs={hub_count}x{HUB_DEGREE} {label:<22} {elapsed * 1000:9.1f} ms/search")
+
+
+if __name__ == "__main__":
+    main()
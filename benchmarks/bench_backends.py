@@ -0,0 +1,39 @@
+"""
+Compares the adjacency list and CSR graph backends of CityMap: memory retained by the graph and time per search.
+
+Usage: python -m benchmarks.bench_backends
+"""
+import time
+import tracemalloc
+
+from src.assignment1 import CityMap
+from benchmarks.generators import random_city
+
+
+SIZES = [(50_000, 200_000), (200_000, 1_000_000)] # (locations, extra roads)
+BACKENDS = ["list", "csr"]
+SOURCES = 3
+
+
+def main() -> None:
+    for n, extra in SIZES:
+        roads = random_city(n, extra, seed=n)
+
+        for backend in BACKENDS:
+            tracemalloc.start()
+            city = CityMap(roads, [], [("Grizz", 0)], backend=backend)
+            retained, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            begin = time.perf_counter()
+            for source in range(SOURCES):
+                city.dijkstras(start_node=source * (n // SOURCES))
+            elapsed = (time.perf_counter() - begin) / SOURCES
+
+            print(f"|L|={n:>7} |R|={len(roads):>8} backend={backend:<5} "
+                  f"graph={retained / 2**20:8.1f} MiB  {elapsed * 1000:9.1f} ms/search")
+            del city
+
+
+if __name__ == "__main__":
+    main()
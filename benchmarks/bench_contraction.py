@@ -0,0 +1,56 @@
+"""
+Measures the Contraction Hierarchies index on grid cities: build time, index size (upward roads and shortcuts), and the
+point to point and plan latency against the searches without it.
+
+Usage: python -m benchmarks.bench_contraction
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDES = [50, 100]
+FRIEND_COUNT = 20
+QUERIES = 100
+
+
+def main() -> None:
+    for side in SIDES:
+        n = side * side
+        rng = random.Random(side)
+        roads = grid_city(side, side, seed=side)
+        friends = [(f"friend{i}", rng.randrange(n)) for i in range(FRIEND_COUNT)]
+        city = CityMap(roads, [], friends, backend="csr")
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+
+        distances = run(city, side, "bidirectional", pairs, lambda s, t: city.bidirectional_dijkstras(s, t)[0])
+        plans = run(city, side, "plan", pairs, lambda s, t: city.plan(s, t)[0])
+
+        begin = time.perf_counter()
+        city.build_contraction_hierarchy()
+        build = time.perf_counter() - begin
+        hierarchy = city.contraction
+        print(f"grid {side}x{side} build {build:6.1f} s, {hierarchy.shortcut_count} shortcuts, "
+              f"{hierarchy.edge_count()} upward edges for {len(roads)} roads")
+
+        run(city, side, "ch query", pairs, lambda s, t: city.contraction.query(s, t)[0], distances)
+        run(city, side, "ch plan", pairs, lambda s, t: city.plan(s, t)[0], plans)
+
+
+def run(city: CityMap, side: int, label: str, pairs: list[tuple[int, int]], search, expected: list = None) -> list:
+    lengths = []
+    settled = 0
+    begin = time.perf_counter()
+    for start, end in pairs:
+        lengths.append(search(start, end))
+        settled += city.contraction.settled_count if label == "ch query" else city.settled_count
+    elapsed = (time.perf_counter() - begin) / len(pairs)
+    assert expected is None or lengths == expected
+    print(f"grid {side}x{side} {label:<14} settled={settled / len(pairs):9.0f} {elapsed * 1000:8.2f} ms/query")
+    return lengths
+
+
+if __name__ == "__main__":
+    main()
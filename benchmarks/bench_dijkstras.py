@@ -0,0 +1,31 @@
+"""
+Times CityMap.dijkstras on large generated cities for each priority queue type.
+
+Usage: python -m benchmarks.bench_dijkstras
+"""
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import random_city
+
+
+SIZES = [(10_000, 40_000), (50_000, 200_000), (100_000, 600_000)] # (locations, extra roads)
+QUEUES = ["binary", "indexed"]
+SOURCES = 5
+
+
+def main() -> None:
+    for n, extra in SIZES:
+        roads = random_city(n, extra, seed=n)
+        city = CityMap(roads, [], [("Grizz", 0)])
+
+        for queue in QUEUES:
+            begin = time.perf_counter()
+            for source in range(SOURCES):
+                city.dijkstras(start_node=source * (n // SOURCES), queue=queue)
+            elapsed = (time.perf_counter() - begin) / SOURCES
+            print(f"|L|={n:>7} |R|={len(roads):>7} queue={queue:<8} {elapsed * 1000:9.1f} ms/search")
+
+
+if __name__ == "__main__":
+    main()
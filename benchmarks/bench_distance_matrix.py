@@ -0,0 +1,51 @@
+"""
+Compares CityMap.distance_matrix with running one full dijkstras per row, for a square matrix over clustered dispatch
+points (one set of points, so the symmetric shortcut applies) and a rectangular matrix between two sets.
+
+Usage: python -m benchmarks.bench_distance_matrix
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDE = 150
+POINTS = 100
+CLUSTER = 40 # the points lie in a CLUSTER x CLUSTER corner of the city, like the depots and jobs of one district
+
+
+def main() -> None:
+    n = SIDE * SIDE
+    rng = random.Random(SIDE)
+    city = CityMap(grid_city(SIDE, SIDE, seed=SIDE), [], [("Grizz", 0)], backend="csr")
+    points = rng.sample([y * SIDE + x for y in range(CLUSTER) for x in range(CLUSTER)], 2 * POINTS)
+    sources, targets = points[:POINTS], points[POINTS:]
+
+    begin = time.perf_counter()
+    settled = 0
+    expected = []
+    for source in sources:
+        distance, _ = city.dijkstras(start_node=source)
+        expected.append([distance[t] for t in sources])
+        settled += city.settled_count
+    report(n, "full search per row", time.perf_counter() - begin, settled)
+
+    for label, kwargs in [("square symmetric", {}), ("square", {"symmetric": False})]:
+        begin = time.perf_counter()
+        matrix = city.distance_matrix(sources, **kwargs)
+        report(n, label, time.perf_counter() - begin, city.settled_count)
+        assert [list(row) for row in matrix] == expected
+
+    begin = time.perf_counter()
+    city.distance_matrix(sources, targets)
+    report(n, "rectangular", time.perf_counter() - begin, city.settled_count)
+
+
+def report(n: int, label: str, elapsed: float, settled: int) -> None:
+    print(f"grid {SIDE}x{SIDE} {POINTS}x{POINTS} {label:<20} settled={settled:>9} {elapsed:7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
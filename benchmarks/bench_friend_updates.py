@@ -0,0 +1,50 @@
+"""
+Measures friend and track updates applied locally (move_friend, add_track, remove_track) against rebuilding the city
+from the updated tracks and friends.
+
+Usage: python -m benchmarks.bench_friend_updates
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDE = 200
+TRACKS = 20000
+FRIENDS = 2000
+UPDATES = 50
+
+
+def main() -> None:
+    n = SIDE * SIDE
+    rng = random.Random(SIDE)
+    roads = grid_city(SIDE, SIDE, seed=SIDE)
+    tracks = [(rng.randrange(n), rng.randrange(n), rng.randint(1, 10)) for _ in range(TRACKS)]
+    friends = [(f"friend{i}", rng.randrange(n)) for i in range(FRIENDS)]
+    city = CityMap(roads, tracks, friends)
+
+    updates = []
+    for i in range(UPDATES):
+        updates.append(("move_friend", f"friend{rng.randrange(FRIENDS)}", rng.randrange(n)))
+        updates.append(("add_track", rng.randrange(n), rng.randrange(n), 5))
+        updates.append(("remove_track",) + tracks[i][:2])
+
+    for name in ("move_friend", "add_track", "remove_track"):
+        begin = time.perf_counter()
+        for update in updates:
+            if update[0] == name:
+                getattr(city, name)(*update[1:])
+        elapsed = (time.perf_counter() - begin) / UPDATES
+        print(f"grid {SIDE}x{SIDE} |T|={TRACKS} |F|={FRIENDS} {name:<14} {elapsed * 1e6:10.1f} us/update")
+
+    begin = time.perf_counter()
+    rebuilt = CityMap(roads, list(city.road_graph.tracks), list(city.road_graph.friends))
+    elapsed = time.perf_counter() - begin
+    print(f"grid {SIDE}x{SIDE} |T|={TRACKS} |F|={FRIENDS} {'rebuild':<14} {elapsed * 1e6:10.1f} us")
+    assert rebuilt.pickup_candidates() == city.pickup_candidates()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compares plan (two searches reaching every pickup location) with the fused two layer search of fused_plan, for nearby and
+for random endpoints: states settled and time per plan.
+
+Usage: python -m benchmarks.bench_fused_plan
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDE = 200
+FRIEND_COUNT = 20
+QUERIES = 20
+NEARBY = 10 # nearby endpoints are at most this many blocks apart in each direction
+
+
+def main() -> None:
+    n = SIDE * SIDE
+    rng = random.Random(SIDE)
+    friends = [(f"friend{i}", rng.randrange(n)) for i in range(FRIEND_COUNT)]
+    city = CityMap(grid_city(SIDE, SIDE, seed=SIDE), [], friends, backend="csr")
+
+    nearby = []
+    for _ in range(QUERIES):
+        # a start next to a friend, and a destination a few blocks away
+        _, location = rng.choice(friends)
+        x, y = location % SIDE, location // SIDE
+        dx, dy = rng.randint(-NEARBY, NEARBY), rng.randint(-NEARBY, NEARBY)
+        destination = min(max(y + dy, 0), SIDE - 1) * SIDE + min(max(x + dx, 0), SIDE - 1)
+        nearby.append((location, destination))
+    far = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+
+    for label, pairs in (("nearby", nearby), ("random", far)):
+        expected = run(city, f"{label} plan", pairs, False)
+        assert run(city, f"{label} fused", pairs, True) == expected
+
+
+def run(city: CityMap, label: str, pairs: list[tuple[int, int]], fused: bool) -> list:
+    results = []
+    settled = 0
+    begin = time.perf_counter()
+    for start, destination in pairs:
+        total_time, _, friend, pickup = city.plan(start, destination, fused=fused)
+        results.append((total_time, friend, pickup))
+        settled += city.settled_count
+    elapsed = (time.perf_counter() - begin) / len(pairs)
+    print(f"grid {SIDE}x{SIDE} |F|={FRIEND_COUNT} {label:<14} settled={settled / len(pairs):9.0f} {elapsed * 1000:8.1f} ms/plan")
+    return results
+
+
+if __name__ == "__main__":
+    main()
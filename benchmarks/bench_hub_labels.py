@@ -0,0 +1,58 @@
+"""
+Measures plan with hub labels against plan with the contraction hierarchy and plan with Dijkstra searches on grid cities:
+label build time and size, and time per plan.
+
+Usage: python -m benchmarks.bench_hub_labels
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDES = [50, 100]
+FRIEND_COUNTS = [3, 20]
+QUERIES = 100
+
+
+def main() -> None:
+    for side in SIDES:
+        n = side * side
+        roads = grid_city(side, side, seed=side)
+        for friend_count in FRIEND_COUNTS:
+            rng = random.Random(friend_count)
+            friends = [(f"friend{i}", rng.randrange(n)) for i in range(friend_count)]
+            city = CityMap(roads, [], friends, backend="csr")
+            pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+            label = f"grid {side}x{side} |F|={friend_count:<3}"
+
+            expected = run(city, f"{label} dijkstra", pairs)
+
+            begin = time.perf_counter()
+            city.build_contraction_hierarchy()
+            hierarchy_build = time.perf_counter() - begin
+            run(city, f"{label} ch", pairs, expected)
+
+            begin = time.perf_counter()
+            city.build_hub_labels()
+            labels_build = time.perf_counter() - begin
+            print(f"{label} build ch {hierarchy_build:6.1f} s, labels {labels_build:6.1f} s, "
+                  f"{len(city.hub_labels) / n:6.1f} entries per label")
+            run(city, f"{label} labels", pairs, expected)
+
+
+def run(city: CityMap, label: str, pairs: list[tuple[int, int]], expected: list = None) -> list:
+    results = []
+    begin = time.perf_counter()
+    for start, destination in pairs:
+        total_time, _, friend, pickup = city.plan(start, destination)
+        results.append((total_time, friend, pickup))
+    elapsed = (time.perf_counter() - begin) / len(pairs)
+    assert expected is None or results == expected
+    print(f"{label:<30} {elapsed * 1000:8.2f} ms/plan")
+    return results
+
+
+if __name__ == "__main__":
+    main()
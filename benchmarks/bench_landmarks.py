@@ -0,0 +1,49 @@
+"""
+Compares point to point searches with plain Dijkstra (stopping at the destination), bidirectional Dijkstra and A* with
+landmark (ALT) bounds for several landmark counts: locations settled and time per query, plus the preprocessing time.
+
+Usage: python -m benchmarks.bench_landmarks
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDE = 200
+QUERIES = 50
+LANDMARK_COUNTS = [4, 8, 16]
+
+
+def main() -> None:
+    n = SIDE * SIDE
+    rng = random.Random(SIDE)
+    city = CityMap(grid_city(SIDE, SIDE, seed=SIDE), [], [("Grizz", 0)], backend="csr")
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+
+    expected = run(city, "dijkstra", pairs, lambda s, t: city.dijkstras(start_node=s, targets={t})[0][t])
+    run(city, "bidirectional", pairs, lambda s, t: city.bidirectional_dijkstras(s, t)[0], expected)
+
+    for count in LANDMARK_COUNTS:
+        begin = time.perf_counter()
+        city.build_landmarks(count)
+        preprocessing = time.perf_counter() - begin
+        run(city, f"alt K={count} ({preprocessing:.1f} s prep)", pairs, lambda s, t: city.astar_dijkstras(s, t)[0], expected)
+
+
+def run(city: CityMap, label: str, pairs: list[tuple[int, int]], search, expected: list = None) -> list:
+    lengths = []
+    settled = 0
+    begin = time.perf_counter()
+    for start, end in pairs:
+        lengths.append(search(start, end))
+        settled += city.settled_count
+    elapsed = (time.perf_counter() - begin) / len(pairs)
+    assert expected is None or lengths == expected
+    print(f"grid {SIDE}x{SIDE} {label:<28} settled={settled / len(pairs):9.0f} {elapsed * 1000:8.1f} ms/query")
+    return lengths
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares the peak and retained memory of building a CityMap from lists of road tuples with streaming it from CSV and
+binary files with CityMap.from_files.
+
+Usage: python -m benchmarks.bench_loader
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from src.assignment1 import CityMap
+from src.loader import parse_csv_edges
+from benchmarks.generators import random_city
+
+
+SIZES = [(200_000, 1_000_000)] # (locations, extra roads)
+
+
+def main() -> None:
+    directory = tempfile.mkdtemp()
+    try:
+        for n, extra in SIZES:
+            roads_csv, roads_bin, tracks_csv, friends_csv = write_files(directory, n, extra)
+
+            def from_lists():
+                with open(roads_csv) as file:
+                    roads = list(parse_csv_edges(file, roads_csv))
+                return CityMap(roads, [], [("Grizz", 0)], backend="csr")
+
+            measure(n, "lists + csr backend", from_lists)
+            measure(n, "from_files csv", lambda: CityMap.from_files(roads_csv, tracks_csv, friends_csv))
+            measure(n, "from_files bin", lambda: CityMap.from_files(roads_bin, tracks_csv, friends_csv))
+    finally:
+        shutil.rmtree(directory)
+
+
+def write_files(directory: str, n: int, extra: int) -> tuple[str, str, str, str]:
+    roads = random_city(n, extra, seed=n)
+    roads_csv = os.path.join(directory, "roads.csv")
+    roads_bin = os.path.join(directory, "roads.bin")
+    tracks_csv = os.path.join(directory, "tracks.csv")
+    friends_csv = os.path.join(directory, "friends.csv")
+
+    with open(roads_csv, "w") as file:
+        file.writelines(f"{u},{v},{w}\n" for u, v, w in roads)
+    values = array('i', [value for road in roads for value in road])
+    if sys.byteorder == "big":
+        values.byteswap()
+    with open(roads_bin, "wb") as file:
+        file.write(values.tobytes())
+    with open(tracks_csv, "w") as file:
+        file.write("")
+    with open(friends_csv, "w") as file:
+        file.write("Grizz,0\n")
+
+    return roads_csv, roads_bin, tracks_csv, friends_csv
+
+
+def measure(n: int, label: str, build) -> None:
+    tracemalloc.start()
+    begin = time.perf_counter()
+    city = build()
+    elapsed = time.perf_counter() - begin
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"|L|={n:>7} {label:<20} peak={peak / 2**20:8.1f} MiB  retained={retained / 2**20:8.1f} MiB  {elapsed:6.2f} s")
+    del city
+
+
+if __name__ == "__main__":
+    main()
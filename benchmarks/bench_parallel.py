@@ -0,0 +1,45 @@
+"""
+Measures how CityMap.plan_many scales with the number of worker processes, from 1 to the number of CPUs, against the
+same batch answered in this process.
+
+Usage: python -m benchmarks.bench_parallel [max_workers]
+"""
+import os
+import random
+import sys
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDE = 150
+QUERIES = 400
+
+
+def main() -> None:
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+
+    n = SIDE * SIDE
+    rng = random.Random(SIDE)
+    friends = [(f"friend{i}", rng.randrange(n)) for i in range(10)]
+    city = CityMap(grid_city(SIDE, SIDE, seed=SIDE), [], friends, backend="csr")
+    queries = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+
+    begin = time.perf_counter()
+    expected = city.plan_many(queries)
+    serial = time.perf_counter() - begin
+    print(f"grid {SIDE}x{SIDE} Q={QUERIES} in process      {serial:7.2f} s")
+
+    workers = 1
+    while workers <= max_workers:
+        begin = time.perf_counter()
+        results = city.plan_many(queries, workers=workers)
+        elapsed = time.perf_counter() - begin
+        assert results == expected
+        print(f"grid {SIDE}x{SIDE} Q={QUERIES} workers={workers:<3}     {elapsed:7.2f} s  speedup={serial / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Measures CityMap.plan on a large grid city: locations settled by the two searches and time per plan.
+
+Usage: python -m benchmarks.bench_plan
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDE = 300
+FRIEND_COUNTS = [3, 20]
+QUERIES = 20
+
+
+def main() -> None:
+    n = SIDE * SIDE
+    roads = grid_city(SIDE, SIDE, seed=SIDE)
+
+    for friend_count in FRIEND_COUNTS:
+        rng = random.Random(friend_count)
+        friends = [(f"friend{i}", rng.randrange(n)) for i in range(friend_count)]
+        city = CityMap(roads, [], friends, backend="csr")
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+
+        settled = 0
+        begin = time.perf_counter()
+        for start, destination in pairs:
+            city.plan(start, destination)
+            settled += city.settled_count
+        elapsed = (time.perf_counter() - begin) / QUERIES
+
+        print(f"grid {SIDE}x{SIDE} |F|={friend_count:<3} settled={settled / QUERIES:9.0f} of {2 * n} {elapsed * 1000:9.1f} ms/plan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compares CityMap.plan_many against calling CityMap.plan in a loop, for a batch of queries over a set of hot endpoints.
+The loop is timed on a sample of the batch and scaled up to the full batch.
+
+Usage: python -m benchmarks.bench_plan_many
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDE = 100
+QUERIES = 10_000
+ENDPOINTS = 500
+LOOP_SAMPLE = 200
+
+
+def main() -> None:
+    n = SIDE * SIDE
+    rng = random.Random(SIDE)
+    friends = [(f"friend{i}", rng.randrange(n)) for i in range(10)]
+    city = CityMap(grid_city(SIDE, SIDE, seed=SIDE), [], friends, backend="csr")
+
+    endpoints = rng.sample(range(n), ENDPOINTS)
+    queries = [(rng.choice(endpoints), rng.choice(endpoints)) for _ in range(QUERIES)]
+
+    begin = time.perf_counter()
+    city.plan_many(queries)
+    batch = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    for start, destination in queries[:LOOP_SAMPLE]:
+        city.plan(start, destination)
+    loop = (time.perf_counter() - begin) * QUERIES / LOOP_SAMPLE
+
+    print(f"grid {SIDE}x{SIDE} queries={QUERIES} endpoints={ENDPOINTS}")
+    print(f"plan loop  {loop:8.1f} s (scaled from {LOOP_SAMPLE} queries)")
+    print(f"plan_many  {batch:8.1f} s  speedup {loop / batch:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Compares unidirectional and bidirectional Dijkstra for point to point queries: locations settled and time per query.
+
+Usage: python -m benchmarks.bench_point_to_point
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIZES = [100, 300] # grid side length
+QUERIES = 20
+
+
+def main() -> None:
+    for side in SIZES:
+        n = side * side
+        city = CityMap(grid_city(side, side, seed=side), [], [("Grizz", 0)], backend="csr")
+        rng = random.Random(side)
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+
+        for bidirectional in [False, True]:
+            settled = 0
+            begin = time.perf_counter()
+            for start, end in pairs:
+                city.dijkstras(start_node=start, end_node=end, bidirectional=bidirectional)
+                settled += city.settled_count
+            elapsed = (time.perf_counter() - begin) / QUERIES
+
+            name = "bidirectional" if bidirectional else "unidirectional"
+            print(f"grid {side}x{side} {name:<14} settled={settled / QUERIES:10.0f} {elapsed * 1000:9.1f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Compares the priority queues of CityMap.dijkstras (binary heap, indexed heap and bucket queue) on large generated
+cities for several maximum road weights.
+
+Usage: python -m benchmarks.bench_queues
+"""
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city, random_city
+
+
+CITIES = [
+    ("random 100k", lambda max_weight: random_city(100_000, 400_000, max_weight=max_weight, seed=1)),
+    ("grid 300x300", lambda max_weight: grid_city(300, 300, max_weight=max_weight, seed=1)),
+]
+MAX_WEIGHTS = [10, 100, 1000, 10000]
+QUEUES = ["binary", "indexed", "bucket"]
+SOURCES = 3
+
+
+def main() -> None:
+    for name, generate in CITIES:
+        for max_weight in MAX_WEIGHTS:
+            city = CityMap(generate(max_weight), [], [("Grizz", 0)], backend="csr")
+            n = len(city.road_graph)
+            timings = []
+
+            for queue in QUEUES:
+                begin = time.perf_counter()
+                for source in range(SOURCES):
+                    city.dijkstras(start_node=source * (n // SOURCES), queue=queue)
+                timings.append(f"{queue}={(time.perf_counter() - begin) / SOURCES * 1000:7.1f} ms")
+
+            print(f"{name:<13} C={max_weight:<6} " + "  ".join(timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measures update-then-query latency after a road weight change: CityMap.update_road with the cached trees repaired,
+against rebuilding the city and searching again. Each round changes one random road and then asks for the complete
+trees of a few fixed sources.
+
+Usage: python -m benchmarks.bench_road_updates
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDE = 200
+SOURCES = 4
+ROUNDS = 20
+
+
+def main() -> None:
+    n = SIDE * SIDE
+    rng = random.Random(SIDE)
+    roads = grid_city(SIDE, SIDE, seed=SIDE)
+    friends = [("Grizz", 0)]
+    sources = [rng.randrange(n) for _ in range(SOURCES)]
+    changes = [(rng.randrange(len(roads)), rng.randint(1, 100)) for _ in range(ROUNDS)]
+
+    # repair: the trees stay cached and are repaired after each change
+    city = CityMap(roads, [], friends, cache_entries=SOURCES)
+    for source in sources:
+        city.dijkstras(start_node=source)
+    repaired = []
+    begin = time.perf_counter()
+    for index, weight in changes:
+        u, v, _ = roads[index]
+        city.update_road(u, v, weight)
+        repaired.append([city.dijkstras(start_node=source)[0] for source in sources])
+    report("update_road + repair", time.perf_counter() - begin)
+
+    # rebuild: a new city from the updated road list, then a search per source
+    current = list(roads)
+    rebuilt = []
+    begin = time.perf_counter()
+    for index, weight in changes:
+        u, v, _ = current[index]
+        current[index] = (u, v, weight)
+        city = CityMap(current, [], friends)
+        rebuilt.append([city.dijkstras(start_node=source)[0] for source in sources])
+    report("rebuild + search", time.perf_counter() - begin)
+
+    assert repaired == rebuilt
+
+
+def report(label: str, elapsed: float) -> None:
+    print(f"grid {SIDE}x{SIDE} {SOURCES} trees {label:<22} {elapsed / ROUNDS * 1000:9.1f} ms/update")
+
+
+if __name__ == "__main__":
+    main()
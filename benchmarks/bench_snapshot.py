@@ -0,0 +1,54 @@
+"""
+Compares building a CityMap from its road tuples with loading it from a binary snapshot, with and without mmap, and the
+time per search on the loaded city.
+
+Usage: python -m benchmarks.bench_snapshot
+"""
+import os
+import random
+import tempfile
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import random_city
+
+
+SIZES = [(50_000, 200_000), (200_000, 1_000_000)] # (locations, extra roads)
+SOURCES = 3
+
+
+def main() -> None:
+    for n, extra in SIZES:
+        roads = random_city(n, extra, seed=n)
+        rng = random.Random(n)
+        tracks = [(rng.randrange(n), rng.randrange(n), 1) for _ in range(n // 100)]
+        friends = [(f"friend{i}", rng.randrange(n)) for i in range(100)]
+
+        handle, path = tempfile.mkstemp(suffix=".citymap")
+        os.close(handle)
+        try:
+            for backend in ("list", "csr"):
+                begin = time.perf_counter()
+                city = CityMap(roads, tracks, friends, backend=backend)
+                report(n, len(roads), f"build {backend}", time.perf_counter() - begin, city)
+            city.save(path)
+
+            for use_mmap in (True, False):
+                begin = time.perf_counter()
+                loaded = CityMap.load(path, mmap=use_mmap)
+                report(n, len(roads), f"load mmap={use_mmap}", time.perf_counter() - begin, loaded)
+                del loaded
+        finally:
+            os.remove(path)
+
+
+def report(n: int, road_count: int, label: str, elapsed: float, city: CityMap) -> None:
+    begin = time.perf_counter()
+    for source in range(SOURCES):
+        city.dijkstras(start_node=source * (n // SOURCES))
+    search = (time.perf_counter() - begin) / SOURCES
+    print(f"|L|={n:>7} |R|={road_count:>8} {label:<16} {elapsed * 1000:9.1f} ms  {search * 1000:9.1f} ms/search")
+
+
+if __name__ == "__main__":
+    main()
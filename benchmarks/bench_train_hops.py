@@ -0,0 +1,41 @@
+"""
+Measures the pickup preprocessing of CityMap for max_hops from 1 to 6 on a dense track network, where the number of train
+paths of k hops grows exponentially with k but the frontier search stays linear.
+
+Usage: python -m benchmarks.bench_train_hops
+"""
+import random
+import time
+
+from src.trainnetwork import TrainNetwork
+
+
+SIZES = [20_000, 1_000] # stations, the small network saturates: every friend reaches every station within a few hops
+TRACKS_PER_STATION = 4
+FRIEND_COUNT = 200
+HOPS = range(1, 7)
+
+
+def main() -> None:
+    for stations in SIZES:
+        run(stations)
+
+
+def run(stations: int) -> None:
+    rng = random.Random(stations)
+    tracks = [(u, rng.randrange(stations), rng.randint(1, 10)) for u in range(stations) for _ in range(TRACKS_PER_STATION)]
+    friends = [(f"friend{i}", rng.randrange(stations)) for i in range(FRIEND_COUNT)]
+
+    for max_hops in HOPS:
+        begin = time.perf_counter()
+        network = TrainNetwork(tracks, friends, max_hops)
+        candidates = network.candidates()
+        elapsed = time.perf_counter() - begin
+
+        paths = FRIEND_COUNT * sum(TRACKS_PER_STATION ** hops for hops in range(max_hops + 1))
+        print(f"|L|={stations} |T|={len(tracks)} |F|={FRIEND_COUNT} k={max_hops} paths={paths:>9} "
+              f"candidates={len(candidates):>7} {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
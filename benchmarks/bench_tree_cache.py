@@ -0,0 +1,39 @@
+"""
+Measures CityMap.plan with and without a shortest path tree cache when the same hub locations come up repeatedly.
+
+Usage: python -m benchmarks.bench_tree_cache
+"""
+import random
+import time
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city
+
+
+SIDE = 150
+HUBS = 40
+QUERIES = 300
+CACHE_SIZES = [None, 20, 80]
+
+
+def main() -> None:
+    n = SIDE * SIDE
+    rng = random.Random(SIDE)
+    roads = grid_city(SIDE, SIDE, seed=SIDE)
+    friends = [(f"friend{i}", rng.randrange(n)) for i in range(10)]
+    hubs = rng.sample(range(n), HUBS)
+    queries = [(rng.choice(hubs), rng.choice(hubs)) for _ in range(QUERIES)]
+
+    for cache_entries in CACHE_SIZES:
+        city = CityMap(roads, [], friends, backend="csr", cache_entries=cache_entries)
+        begin = time.perf_counter()
+        for start, destination in queries:
+            city.plan(start, destination)
+        elapsed = (time.perf_counter() - begin) / QUERIES
+
+        stats = city.tree_cache.stats() if city.tree_cache is not None else {}
+        print(f"cache_entries={str(cache_entries):<5} {elapsed * 1000:8.1f} ms/plan  {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares two result files written by benchmarks.runner, e.g. from two commits, and reports the change of the median
+latency and the peak memory of every benchmark they share. Exits with status 1 if any of them got worse by more than
+the threshold, so it can gate a change. Timings are noisy on a busy machine: run with enough --queries, or raise the
+threshold.
+
+Usage: python -m benchmarks.compare old.json new.json [--threshold 0.1]
+"""
+import argparse
+import json
+import sys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diffs two benchmark result files.")
+    parser.add_argument("old", help="the results to compare against")
+    parser.add_argument("new", help="the new results")
+    parser.add_argument("--threshold", type=float, default=0.1, help="the relative slowdown counted as a regression")
+    arguments = parser.parse_args()
+
+    old = load(arguments.old)
+    new = load(arguments.new)
+    regressions = 0
+
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        latency = change(before["latency_ms"]["p50"], after["latency_ms"]["p50"])
+        memory = change(before["peak_memory_bytes"], after["peak_memory_bytes"])
+        worse = latency > arguments.threshold or memory > arguments.threshold
+        regressions += worse
+
+        generator, locations, backend, operation = key
+        print(f"{generator:<10} |L|={locations:>7} {backend:<4} {operation:<9} "
+              f"p50 {before['latency_ms']['p50']:9.2f} -> {after['latency_ms']['p50']:9.2f} ms ({latency:+7.1%}) "
+              f"peak {memory:+7.1%}{'  REGRESSION' if worse else ''}")
+
+    for key in sorted(old.keys() ^ new.keys()):
+        print(f"only in {'old' if key in old else 'new'}: {' '.join(map(str, key))}")
+
+    print(f"{regressions} regression(s) over {arguments.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+def load(path: str) -> dict:
+    """
+    Function description: Reads a result file and indexes its results by (generator, locations, backend, operation).
+
+    Input:
+        path: The JSON file written by benchmarks.runner.
+
+    Output:
+        The dictionary of results.
+    """
+    with open(path) as file:
+        report = json.load(file)
+    return {(result["generator"], result["locations"], result["backend"], result["operation"]): result
+            for result in report["results"]}
+
+
+def change(before: float, after: float) -> float:
+    """
+    Function description: The relative change from before to after, 0 if before is 0.
+    """
+    return (after - before) / before if before else 0.0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import math
+import random
+
+
+def random_city(n: int, extra_roads: int, max_weight: int = 100, seed: int = 0) -> list[tuple[int,int,int]]:
+    """
+    Function description: Generates a connected, simple road network on the locations 0..n-1. A random spanning tree 
+    guarantees connectivity and extra_roads further random roads are added on top of it.
+
+    Input:
+        n: The number of locations.
+        extra_roads: The number of roads added on top of the spanning tree, capped so the city stays a simple graph.
+        max_weight: The largest road travel time, weights are drawn uniformly from 1..max_weight.
+        seed: Seed of the random number generator, the same seed always gives the same city.
+
+    Output:
+        A list of (u, v, w) road tuples.
+
+    Time and space complexity: O(n + extra_roads)
+    """
+    rng = random.Random(seed)
+    extra_roads = min(extra_roads, n * (n - 1) // 2 - (n - 1)) # a simple graph has at most n(n-1)/2 roads
+    roads = []
+    seen = set()
+
+    for v in range(1, n):
+        u = rng.randrange(v)
+        seen.add((u, v))
+        roads.append((u, v, rng.randint(1, max_weight)))
+
+    while len(roads) < n - 1 + extra_roads:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u == v:
+            continue
+        if u > v:
+            u, v = v, u
+        if (u, v) in seen:
+            continue
+        seen.add((u, v))
+        roads.append((u, v, rng.randint(1, max_weight)))
+
+    return roads
+
+
+def grid_city(width: int, height: int, max_weight: int = 100, seed: int = 0) -> list[tuple[int,int,int]]:
+    """
+    Function description: Generates a width x height street grid, location (x, y) is numbered y * width + x and is joined 
+    by a road to its right and lower neighbours. Grids have a large diameter, like real road networks.
+
+    Input:
+        width: The number of locations in each row.
+        height: The number of rows.
+        max_weight: The largest road travel time, weights are drawn uniformly from 1..max_weight.
+        seed: Seed of the random number generator.
+
+    Output:
+        A list of (u, v, w) road tuples.
+
+    Time and space complexity: O(width * height)
+    """
+    rng = random.Random(seed)
+    roads = []
+
+    for y in range(height):
+        for x in range(width):
+            u = y * width + x
+            if x + 1 < width:
+                roads.append((u, u + 1, rng.randint(1, max_weight)))
+            if y + 1 < height:
+                roads.append((u, u + width, rng.randint(1, max_weight)))
+
+    return roads
+
+
+def geometric_city(n: int, average_degree: float = 6, max_weight: int = 100, seed: int = 0) -> list[tuple[int,int,int]]:
+    """
+    Function description: Generates a random geometric road network: n locations are scattered over the unit square and 
+    every two locations closer than a radius are joined by a road whose travel time grows with their distance. The radius 
+    is chosen so a location has about average_degree roads. Components left apart are joined to the component before them 
+    by a road between random members, so the city is connected. Like real road networks, roads are short and local.
+
+    Input:
+        n: The number of locations.
+        average_degree: The expected number of roads per location.
+        max_weight: The travel time of a road as long as the radius, shorter roads take proportionally less (at least 1).
+        seed: Seed of the random number generator.
+
+    Output:
+        A list of (u, v, w) road tuples.
+
+    Time and space complexity: O(n * average_degree) expected, the points are bucketed into cells as wide as the radius.
+    """
+    rng = random.Random(seed)
+    radius = math.sqrt(average_degree / (math.pi * n))
+    points = [(rng.random(), rng.random()) for _ in range(n)]
+
+    # cells[(i, j)] lists the locations in the cell of side radius at column i, row j
+    cells = {}
+    for v, (x, y) in enumerate(points):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(v)
+
+    def weight(u: int, v: int) -> int:
+        return max(1, round(math.dist(points[u], points[v]) / radius * max_weight))
+
+    roads = []
+    parent = list(range(n)) # union find over the components
+
+    def find(v: int) -> int:
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for (i, j), members in cells.items():
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for u in members:
+                    for v in cells.get((i + di, j + dj), ()):
+                        if u < v and math.dist(points[u], points[v]) < radius:
+                            roads.append((u, v, weight(u, v)))
+                            parent[find(u)] = find(v)
+
+    # join the components in a chain, so the city is connected
+    components = {}
+    for v in range(n):
+        components.setdefault(find(v), []).append(v)
+    members = list(components.values())
+    for previous, current in zip(members, members[1:]):
+        u, v = rng.choice(previous), rng.choice(current)
+        roads.append((min(u, v), max(u, v), weight(u, v)))
+
+    return roads
+
+
+def scale_free_city(n: int, roads_per_location: int = 2, max_weight: int = 100, seed: int = 0) -> list[tuple[int,int,int]]:
+    """
+    Function description: Generates a scale free road network by preferential attachment (the Barabasi-Albert model): 
+    every new location is joined to roads_per_location existing locations, picked with probability proportional to their 
+    number of roads. A few hubs end up with very many roads, like interchanges or a city centre.
+
+    Input:
+        n: The number of locations.
+        roads_per_location: The number of roads each new location brings, at least 1.
+        max_weight: The largest road travel time, weights are drawn uniformly from 1..max_weight.
+        seed: Seed of the random number generator.
+
+    Output:
+        A list of (u, v, w) road tuples, a connected simple graph.
+
+    Time and space complexity: O(n * roads_per_location)
+    """
+    rng = random.Random(seed)
+    m = max(1, min(roads_per_location, n - 1))
+    roads = []
+    ends = [] # every location once per road it has, so a uniform pick is proportional to the number of roads
+
+    # a small clique to start from
+    for v in range(1, m + 1):
+        for u in range(v):
+            roads.append((u, v, rng.randint(1, max_weight)))
+            ends.extend((u, v))
+
+    for v in range(m + 1, n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rng.choice(ends))
+        for u in sorted(targets):
+            roads.append((u, v, rng.randint(1, max_weight)))
+            ends.extend((u, v))
+
+    return roads
+
+
+def ring_city(n: int, max_weight: int = 100, seed: int = 0) -> list[tuple[int,int,int]]:
+    """
+    Function description: Generates a ring road: location v is joined to v + 1, and the last location back to 0. A ring 
+    has the largest diameter of any connected city with n roads, so searches have to go all the way round.
+
+    Input:
+        n: The number of locations, at least 3.
+        max_weight: The largest road travel time, weights are drawn uniformly from 1..max_weight.
+        seed: Seed of the random number generator.
+
+    Output:
+        A list of (u, v, w) road tuples.
+
+    Time and space complexity: O(n)
+    """
+    rng = random.Random(seed)
+    return [(v, (v + 1) % n, rng.randint(1, max_weight)) for v in range(n)]
+
+
+def transit(n: int, track_density: float = 0.1, friend_density: float = 0.01, max_weight: int = 100, 
+            seed: int = 0) -> tuple[list[tuple[int,int,int]], list[tuple[str,int]]]:
+    """
+    Function description: Generates the train tracks and friends of a city with n locations. Tracks join random pairs of 
+    locations, the friends start at random locations.
+
+    Input:
+        n: The number of locations.
+        track_density: The number of tracks per location.
+        friend_density: The number of friends per location, there is always at least one friend.
+        max_weight: The largest track travel time.
+        seed: Seed of the random number generator.
+
+    Output:
+        The (tracks, friends) tuple, tracks as (start, end, w) tuples and friends as (name, location) tuples.
+
+    Time and space complexity: O(n * (track_density + friend_density))
+    """
+    rng = random.Random(seed)
+    tracks = []
+    while len(tracks) < round(track_density * n):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            tracks.append((u, v, rng.randint(1, max_weight)))
+    friends = [(f"friend{i}", rng.randrange(n)) for i in range(max(1, round(friend_density * n)))]
+    return tracks, friends
@@ -0,0 +1,175 @@
+"""
+Runs the benchmark suite: for every generator and scale, times CityMap.__init__, full dijkstras searches and plan, and
+records throughput, latency percentiles and peak memory. The results are written to a JSON file, which
+benchmarks.compare can diff against the results of another commit.
+
+Usage: python -m benchmarks.runner [--output results.json] [--scales 1000 10000] [--generators grid ring]
+                                   [--queries 20] [--backend csr] [--track-density 0.1] [--friend-density 0.01]
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+from src.assignment1 import CityMap
+from benchmarks.generators import grid_city, random_city, geometric_city, scale_free_city, ring_city, transit
+
+
+# each generator builds the roads of a city with about n locations from a seed
+GENERATORS = {
+    "grid": lambda n, seed: grid_city(math.isqrt(n), math.isqrt(n), seed=seed),
+    "random": lambda n, seed: random_city(n, 2 * n, seed=seed),
+    "geometric": lambda n, seed: geometric_city(n, seed=seed),
+    "scale_free": lambda n, seed: scale_free_city(n, seed=seed),
+    "ring": lambda n, seed: ring_city(n, seed=seed),
+}
+
+SCALES = [1_000, 10_000]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Times CityMap on generated cities and writes the results as JSON.")
+    parser.add_argument("--output", default="benchmark_results.json", help="the JSON file to write")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES, help="the numbers of locations")
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--queries", type=int, default=20, help="searches and plans timed per city")
+    parser.add_argument("--backend", default="csr", choices=["list", "csr"])
+    parser.add_argument("--track-density", type=float, default=0.1, help="tracks per location")
+    parser.add_argument("--friend-density", type=float, default=0.01, help="friends per location")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    results = []
+    for generator in arguments.generators:
+        for n in arguments.scales:
+            results.extend(run_city(generator, n, arguments))
+
+    report = {"meta": metadata(arguments), "results": results}
+    with open(arguments.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"wrote {len(results)} results to {arguments.output}")
+
+
+def run_city(generator: str, n: int, arguments) -> list[dict]:
+    """
+    Function description: Benchmarks one generated city: its construction, full searches from random sources and plans
+    between random pairs of locations.
+
+    Input:
+        generator: The name of the generator in GENERATORS.
+        n: The number of locations asked for.
+        arguments: The parsed command line arguments.
+
+    Output:
+        One result dictionary per operation, see measure.
+    """
+    seed = arguments.seed + n
+    roads = GENERATORS[generator](n, seed)
+    locations = 1 + max(max(u, v) for u, v, _ in roads)
+    tracks, friends = transit(locations, arguments.track_density, arguments.friend_density, seed=seed)
+    city = {"generator": generator, "locations": locations, "roads": len(roads), "tracks": len(tracks),
+            "friends": len(friends), "backend": arguments.backend}
+
+    def build():
+        return CityMap(roads, tracks, friends, backend=arguments.backend)
+
+    city_map = build()
+    rng = random.Random(seed)
+    sources = [rng.randrange(locations) for _ in range(arguments.queries)]
+    pairs = [(rng.randrange(locations), rng.randrange(locations)) for _ in range(arguments.queries)]
+
+    results = [
+        measure(city, "init", [build] * max(1, arguments.queries // 5)),
+        measure(city, "dijkstras", [lambda source=source: city_map.dijkstras(start_node=source) for source in sources]),
+        measure(city, "plan", [lambda pair=pair: city_map.plan(*pair) for pair in pairs]),
+    ]
+    for result in results:
+        latency = result["latency_ms"]
+        print(f"{generator:<10} |L|={locations:>7} {result['operation']:<9} p50={latency['p50']:9.2f} ms "
+              f"p99={latency['p99']:9.2f} ms {result['throughput_per_s']:9.1f}/s "
+              f"peak={result['peak_memory_bytes'] / 2**20:7.1f} MiB")
+    return results
+
+
+def measure(city: dict, operation: str, calls: list) -> dict:
+    """
+    Function description: Times a list of calls one by one, after one untimed call to warm up, then runs the first again
+    under tracemalloc for its peak memory, so the timings are not slowed down by the tracing.
+
+    Input:
+        city: The description of the city, copied into the result.
+        operation: The name of the operation.
+        calls: The functions to call, without arguments.
+
+    Output:
+        A dictionary with the city, the operation, the number of runs, the throughput in calls per second, the latency
+        percentiles in milliseconds and the peak memory allocated by one call in bytes.
+    """
+    calls[0]() # warm up
+    latencies = []
+    for call in calls:
+        begin = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - begin) * 1000)
+
+    tracemalloc.start()
+    calls[0]()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(city, operation=operation, runs=len(calls), throughput_per_s=1000 * len(latencies) / sum(latencies),
+                latency_ms={"mean": sum(latencies) / len(latencies), "p50": percentile(latencies, 50),
+                            "p90": percentile(latencies, 90), "p99": percentile(latencies, 99), "max": max(latencies)},
+                peak_memory_bytes=peak)
+
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    Function description: Returns the p-th percentile of a list with the nearest rank method: the smallest value that
+    at least p percent of the values are at most.
+
+    Input:
+        values: The values, not empty.
+        p: The percentile, between 0 and 100.
+
+    Output:
+        The percentile.
+
+    Time complexity: O(N log N)
+
+    Space complexity: O(N)
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def metadata(arguments) -> dict:
+    """
+    Function description: Describes the run, so results from different commits and machines can be told apart.
+
+    Input:
+        arguments: The parsed command line arguments.
+
+    Output:
+        A dictionary with the commit, the time, the Python version, the machine and the settings of the run.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "settings": {key: value for key, value in vars(arguments).items() if key != "output"},
+    }
+
+
+if __name__ == "__main__":
+    main()
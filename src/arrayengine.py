@@ -0,0 +1,126 @@
+from array import array
+
+try:
+    import numpy
+except ImportError: # the engine falls back to the array module
+    numpy = None
+
+
+UNREACHED = 1 << 62 # stands in for an infinite distance in the integer distance buffer
+
+VECTOR_DEGREE = 64 # locations with at least this many roads are relaxed with vectorised NumPy operations
+
+
+def array_dijkstras(graph, start_node: int, priority_queue, targets=None,
+                    max_distance: int = None) -> tuple[list, list, int]:
+    """
+    Function description: The search loop of CityMap.dijkstras, with its state kept in typed buffers instead of Python
+    lists: 64 bit integer distance and parent arrays and a byte per location for the settled flags. The roads of each
+    settled location are relaxed from its CSR slice:
+        - A location with at least VECTOR_DEGREE roads (a hub) is relaxed with NumPy, when it is installed, as a
+          vectorised gather (the distances of its neighbours), compare (against the distances through it) and scatter
+          (the improved distances and parents). NumPy views the same buffers without copying them, so a hub with
+          thousands of roads costs a few array operations instead of a Python loop over its roads.
+        - Other locations, and every location without NumPy, are relaxed by a loop over the slices of the CSR arrays,
+          since a NumPy call costs more than the loop for a handful of roads.
+    Improved locations are queued in the order of the slice, so the search settles locations in the same order as the
+    list based loop and returns exactly the same distances and parents. Like the rest of CityMap, this assumes the roads
+    form a simple graph: the scatter of a slice relies on each neighbour appearing in it once.
+
+    Input:
+        graph: A CSRGraph, or any graph with offsets, targets and weights arrays.
+        start_node: The starting location.
+        priority_queue: An empty priority queue, see CityMap.new_priority_queue.
+        targets (optional): The search stops as soon as every one of these locations has been settled.
+        max_distance (optional): The search stops as soon as the closest unsettled location is further than this.
+
+    Output:
+        The distance and parent lists, as CityMap.dijkstras returns them (inf and -1 for locations that were not reached),
+        and the number of settled locations.
+
+    Time complexity: O(|R| log |L|), as CityMap.dijkstras, plus O(|L|) to convert the buffers into the returned lists.
+
+    Space complexity: O(|L| + |R|)
+    """
+    n = len(graph)
+    offsets = graph.offsets
+    road_targets = graph.targets
+    road_weights = graph.weights
+
+    distance = array('q', [UNREACHED]) * n
+    parent = array('q', [-1]) * n
+    settled = bytearray(n) # settled[u] is 1 once u has its final distance
+
+    # NumPy views of the same buffers, for the hubs
+    vectorise = numpy is not None
+    if vectorise:
+        distance_view = numpy.frombuffer(distance, dtype=numpy.int64)
+        parent_view = numpy.frombuffer(parent, dtype=numpy.int64)
+        targets_view = numpy.frombuffer(road_targets, dtype=numpy.int32)
+        weights_view = numpy.frombuffer(road_weights, dtype=numpy.int32)
+
+    distance[start_node] = 0
+    priority_queue.insert(start_node, 0)
+    update = priority_queue.update
+    settled_count = 0
+
+    remaining = None if targets is None else set(targets)
+    if remaining is not None and not remaining:
+        return to_lists(distance, parent) + (0,)
+
+    while not priority_queue.is_empty():
+        u, dist_u = priority_queue.extract_min()
+
+        # skip stale entries, u has already been settled with a shorter distance
+        if settled[u]:
+            continue
+        if max_distance is not None and dist_u > max_distance:
+            break
+        settled[u] = 1
+        settled_count += 1
+
+        if remaining is not None and u in remaining:
+            remaining.remove(u)
+            if not remaining:
+                break
+
+        lo = offsets[u]
+        hi = offsets[u + 1]
+        if vectorise and hi - lo >= VECTOR_DEGREE:
+            # gather the distances of u's neighbours, compare them with the distances through u, scatter the improvements
+            neighbours = targets_view[lo:hi]
+            through_u = weights_view[lo:hi] + numpy.int64(dist_u)
+            improved = through_u < distance_view[neighbours]
+            if improved.any():
+                neighbours = neighbours[improved]
+                through_u = through_u[improved]
+                distance_view[neighbours] = through_u
+                parent_view[neighbours] = u
+                for v, dist_v in zip(neighbours.tolist(), through_u.tolist()):
+                    update(v, dist_v)
+        else:
+            for v, weight in zip(road_targets[lo:hi], road_weights[lo:hi]):
+                if dist_u + weight < distance[v]:
+                    distance[v] = dist_u + weight
+                    parent[v] = u
+                    update(v, dist_u + weight)
+
+    return to_lists(distance, parent) + (settled_count,)
+
+
+def to_lists(distance, parent) -> tuple[list, list]:
+    """
+    Function description: Converts the distance and parent buffers into the lists CityMap.dijkstras returns, with inf for
+    the locations that were not reached.
+
+    Input:
+        distance: The integer distances, UNREACHED for locations that were not reached.
+        parent: The parents, -1 for the start and the locations that were not reached.
+
+    Output:
+        The (distance, parent) tuple of lists.
+
+    Time and space complexity: O(|L|)
+    """
+    inf = float('inf')
+    return [inf if d == UNREACHED else d for d in distance], list(parent)
@@ -1,3 +1,19 @@
+from array import array
+
+from src.minheap import MinHeap, IndexedMinHeap
+from src.bucketqueue import BucketQueue
+from src.graph import Graph
+from src.csrgraph import CSRGraph
+from src.treecache import TreeCache
+from src.snapshot import save_snapshot, load_snapshot, can_snapshot
+from src.loader import EdgeColumns, read_edges, read_friends
+from src.parallel import parallel_plan_many, parallel_distance_rows
+from src.arrayengine import array_dijkstras
+from src.landmarks import Landmarks
+from src.contraction import ContractionHierarchy
+from src.hublabels import HubLabels
+from src.trainnetwork import TrainNetwork
+
 class CityMap:
     """
     Class description:
@@ -6,20 +22,34 @@ class CityMap:
 
     - Roads are represented as undirected edges between locations (nodes), with weights representing travel time.
     - Tracks represent train routes, which only friends can use.
-    - Friends are associated with specific locations, and they can only travel within 2 train hops 
-      from their starting position. This constraint is taken into account when planning routes. 
+    - Friends are associated with specific locations, and they can only travel within max_hops train hops 
+      (2 by default) from their starting position. This constraint is taken into account when planning routes. 
     """
-    def __init__(self, roads: list[tuple[int,int,int]], tracks: list[tuple[int,int,int]], friends: list[tuple[int,str]]) -> None:
+    def __init__(self, roads: list[tuple[int,int,int]], tracks: list[tuple[int,int,int]], friends: list[tuple[int,str]], 
+                 backend: str = "list", cache_entries: int = None, cache_bytes: int = None, max_hops: int = 2, 
+                 engine: str = "python") -> None:
         """
         Function description: 
         Same as the init of the Graph class. Initializes the graph with roads, tracks, and friends data. 
         It constructs the road graph using an adjacency list and associates friends with their respective locations, also 
-        updating train hops for valid locations that are within 2 train stops.
+        updating train hops for valid locations that are within max_hops train stops.
 
         Input:
             roads: List of tuples (start_vertex, end_vertex, weight) representing roads.
             tracks: List of tuples (start_vertex, end_vertex, weight) representing tracks.
             friends: List of tuples (friend_name, location) representing friends and their locations.
+            backend (optional): How the road network is stored.
+                - "list": a Graph, an adjacency list of (u, v, weight) tuples.
+                - "csr": a CSRGraph, flat offsets/targets/weights arrays in compressed sparse row form. It uses far less 
+                  memory on large networks and gives the same results as "list", but the road weights must be integers
+                  below 2^31 (a ValueError is raised otherwise).
+            cache_entries (optional): If given, keep up to this many shortest path trees in a TreeCache.
+            cache_bytes (optional): If given, keep shortest path trees in a TreeCache up to about this many bytes.
+              With either limit set, dijkstras (and so plan) reuses the tree of a location it has searched from before, 
+              evicting the least recently used trees when over the limit. Without either, no trees are cached.
+            max_hops (optional): The largest number of train hops a friend can take to a pickup location, 2 by default.
+              The pickup locations are found one hop at a time, so preprocessing stays linear in max_hops.
+            engine (optional): The default search loop of dijkstras, "python" or "array", see dijkstras.
         
         Output: None
 
@@ -30,6 +60,7 @@ class CityMap:
         Time complexity analysis:
         - O(|R|) to iterate over all roads and add undirected edges.
         - O(|T|) to iterate over the tracks and update the train hops.
+        - O(max_hops * |T|) at most for the search of each friend, one frontier per train hop, see TrainNetwork.
         - We can assume that |F| <= |L| (the number of friends is at most the number of locations)
         - We can also assume that |R| >= |L| - 1 which is the definition of a graph.
         - Therefore we can infer that |R| > |F| (number of raods will always be greater than the number of friends)
@@ -44,10 +75,45 @@ class CityMap:
         dominated by the number of roads |R|.
         """
         # define the roads, tracks and friends inputs as class variables 
-        self.road_graph = Graph(roads, tracks, friends)
+        if backend == "list":
+            self.road_graph = Graph(roads, tracks, friends, max_hops)
+        elif backend == "csr":
+            self.road_graph = CSRGraph(roads, tracks, friends, max_hops)
+        else:
+            raise ValueError(f"Unknown graph backend: {backend}")
+
+        self.init_search_state(cache_entries, cache_bytes, engine)
+
+
+    def init_search_state(self, cache_entries: int = None, cache_bytes: int = None, engine: str = "python") -> None:
+        """
+        Description:
+        Sets up the state kept between searches on self.road_graph: the settled location counter, the optional tree cache and 
+        the default search engine.
+
+        Input:
+            - cache_entries, cache_bytes (optional): The limits of the TreeCache, see __init__.
+            - engine (optional): The default search loop of dijkstras, see __init__.
 
+        Output: None
+
+        Time and space complexity: O(1)
+        """
+        self.settled_count = 0 # number of locations settled by the most recent search
+        self.engine = engine
+        self.landmarks = None # set by build_landmarks or load_landmarks, then point to point searches use A*
+        self.contraction = None # set by build_contraction_hierarchy, then point to point searches and plan use it
+        self.contraction_buckets = None # the target buckets of the pickup locations in self.contraction
+        self.contraction_pickup_version = None # the pickup version of the graph the buckets were built for
+        self.hub_labels = None # set by build_hub_labels or load_hub_labels, then plan looks its distances up in them
 
-    def dijkstras(self, start_node: int, end_node: int = None) -> tuple[list,list] | list:
+        self.tree_cache = None
+        if cache_entries is not None or cache_bytes is not None:
+            self.tree_cache = TreeCache(self.road_graph, max_entries=cache_entries, max_bytes=cache_bytes)
+
+
+    def dijkstras(self, start_node: int, end_node: int = None, queue: str = "binary", bidirectional: bool = True, 
+                  targets: set[int] = None, max_distance: int = None, engine: str = None) -> tuple[list,list] | list:
         """
         Description: 
         Implements Dijkstra's algorithm to find the shortest path from a start node to all other nodes or to a specific end node.
@@ -55,10 +121,39 @@ class CityMap:
         Input:
             - start_node: The starting vertex for the shortest path calculation.
             - end_node (optional): The destination vertex for path reconstruction. If provided, only the path to this node is returned.
+            - queue (optional): The priority queue used for the frontier, see new_priority_queue.
+                - "binary" (default): a plain MinHeap, every relaxation inserts a new entry and stale entries are skipped when 
+                  popped. It settles locations at equal distances in the same order as the original implementation, so 
+                  parents and routes are the same on ties.
+                - "indexed": an IndexedMinHeap, a relaxed vertex that is already queued has its key decreased in place, so the 
+                  heap holds at most one entry per location.
+                - "bucket": a BucketQueue (Dial's algorithm), O(1) inserts and no comparisons, for integer road weights.
+                - "auto": "bucket" when the road weights are small integers, otherwise "indexed".
+              Every queue gives the same distances. The other queues settle locations at equal distances in another order 
+              (the bucket queue in first in first out order), so on ties they may pick other parents, and routes of the same 
+              length, than "binary".
+            - bidirectional (optional): If True and end_node is provided, the path is found with bidirectional_dijkstras, 
+              which stops as soon as the two frontiers have met instead of settling the whole graph. If landmarks have been 
+              built (or loaded) for the current roads, the path is found with astar_dijkstras instead, whatever this is, and 
+              if a contraction hierarchy has been built for the current roads, it answers the query instead of either.
+            - targets (optional): A collection of locations. The search stops as soon as every one of them has been settled. 
+              With end_node, the search stops once end_node and every target are settled, so a cached tree covers both.
+            - max_distance (optional): The search stops as soon as the closest unsettled location is further than this.
+            - engine (optional): The search loop, self.engine (set by __init__) if not given.
+                - "python": distance and parent are Python lists and each road is relaxed by the loop below.
+                - "array": see arrayengine.array_dijkstras, the distances, parents and settled flags live in typed buffers 
+                  and the roads of each settled location are relaxed as one CSR slice, vectorised with NumPy when it is 
+                  installed. It needs the csr backend and returns exactly the same result.
+              The bidirectional search of a point to point query always uses the "python" loop.
 
         Output:
-            - If end_node is provided: Returns the reconstructed path from start_node to end_node.
+            - If end_node is provided: Returns the reconstructed path from start_node to end_node, or an empty list if 
+              end_node cannot be reached from start_node (the original implementation returned [end_node] instead).
             - Otherwise: Returns the distance and parent arrays representing the shortest paths from start_node to all other nodes.
+            - When the search stops early, only the settled locations are guaranteed to have their final distance and parent, 
+              the others hold an upper bound (or inf) instead. The number of settled locations is stored in self.settled_count.
+            - With a tree cache, the returned arrays may be shared with the cache and with later calls, so they must not be 
+              modified. A cache hit settles no locations.
 
         Time complexity: O(|R| log |L|), where:
             - |R| is the number of roads (edges).
@@ -68,16 +163,57 @@ class CityMap:
         - The priority queue (MinHeap) operations take log |L| time per location when we extract the min
         - The time complexty to extract the min from each location is O(|L| log |L|).
         - Each road (edge) is relaxed once, which results in O(|R| log |L|) because we are looping over all the roads |R|
-        and then performing an insert into the minheap which costs log |L|. 
+        and then performing an insert (or decrease key) into the minheap which costs log |L|. 
+        - Each location is settled exactly once, stale entries in the "binary" queue are discarded without relaxing their roads again.
         - Therefore the overall complexity is O(|R| log |L| + |L| log |L|)
         - Since |R| >= |L| - 1, the value |L| becomes negligible in comparison and we can simplify the overall time 
         complexity to O(|R| log |L|).
+        - With targets or max_distance, only the locations closer than the last target (or the bound) are settled, and only 
+        their roads are relaxed.
 
         Space complexity: O(|R|)
         - Since we are initialising the distance and parent arrays with the length of the road graph, the space complexity of
         this becomes O(2|R|).
+        - The "indexed" queue holds at most |L| entries, the "binary" and "bucket" queues can hold up to |R| entries.
         - The constant 2 can be removed, so then the space complexity just becomes O(|R|)
         """
+        if end_node is not None:
+            # only the path to end_node is needed, so stop once it is settled along with any targets the caller gave
+            targets = {end_node} if targets is None else set(targets) | {end_node}
+
+        # reuse a cached tree that is final for every location the caller needs, a bounded search needs a complete tree
+        cache_targets = targets if max_distance is None else None
+        if self.tree_cache is not None:
+            tree = self.tree_cache.get(start_node, cache_targets)
+            if tree is not None:
+                self.settled_count = 0
+                if end_node is not None:
+                    return self.path_from_tree(end_node, tree)
+                return tree
+
+        if end_node is not None and self.has_contraction_hierarchy():
+            _, path = self.contraction.query(start_node, end_node)
+            self.settled_count = self.contraction.settled_count
+            return path
+
+        if end_node is not None and self.landmarks is not None and self.landmarks.version == self.road_graph.version:
+            _, path = self.astar_dijkstras(start_node=start_node, end_node=end_node, queue=queue)
+            return path
+
+        if end_node is not None and bidirectional:
+            _, path = self.bidirectional_dijkstras(start_node=start_node, end_node=end_node, queue=queue)
+            return path
+
+        engine = self.engine if engine is None else engine
+        if engine == "array":
+            if not isinstance(self.road_graph, CSRGraph):
+                raise ValueError("The array engine needs the csr backend")
+            distance, parent, self.settled_count = array_dijkstras(self.road_graph, start_node, self.new_priority_queue(queue), 
+                                                                   targets, max_distance)
+            return self.finish_search(start_node, end_node, distance, parent, targets, max_distance)
+        elif engine != "python":
+            raise ValueError(f"Unknown search engine: {engine}")
+
         # the *len method works bc the list items that are being initialised are immutable and therefore they are all independent copies
         distance = [float('inf')] * len(self.road_graph) # all distances are infinity
         parent = [-1] * len(self.road_graph) # all parents are -1
@@ -85,607 +221,1711 @@ class CityMap:
         distance[start_node] = 0 # the distance from the start vertex to itself is 0
 
         # initialise the priority queue with the start_node havinng a distance of 0
-        priority_queue = MinHeap()
+        priority_queue = self.new_priority_queue(queue)
         priority_queue.insert(start_node, 0)
-
-        
-        # get the graph from the Graph class
-        graph = self.road_graph.get_graph()
+        update = priority_queue.update
+        settled_count = 0
+
+        # the targets that are not settled yet, an empty collection needs no search at all
+        remaining = None if targets is None else set(targets)
+        if remaining is not None and not remaining:
+            self.settled_count = 0
+            return distance, parent
+
+        # roads leaving a vertex: the CSR arrays are indexed in place, like the array engine does, so relaxing a location
+        # allocates nothing, the adjacency list is read through adjacent
+        graph = self.road_graph
+        csr = isinstance(graph, CSRGraph)
+        if csr:
+            offsets, road_targets, road_weights = graph.offsets, graph.targets, graph.weights
+        adjacent = graph.adjacent
 
         while not priority_queue.is_empty():
             u, dist_u = priority_queue.extract_min() # extract vertex with minimum distance
 
+            # skip stale entries, u has already been settled with a shorter distance
+            if dist_u > distance[u]:
+                continue
+
+            # every location left in the queue is further than the bound
+            if max_distance is not None and dist_u > max_distance:
+                break
+            settled_count += 1
+
+            # stop once every target is settled, u itself does not need to be relaxed
+            if remaining is not None and u in remaining:
+                remaining.remove(u)
+                if not remaining:
+                    break
+
             # relaxation step
-            for _, v, weight in graph[u][0]: 
-                if distance[u] + weight < distance[v]:
-                    distance[v] = distance[u] + weight
+            if csr:
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = road_targets[i]
+                    dist_v = dist_u + road_weights[i]
+                    if dist_v < distance[v]:
+                        distance[v] = dist_v
+                        parent[v] = u
+                        update(v, dist_v) # insert v, or lower its priority if it is already queued
+                continue
+
+            for _, v, weight in adjacent(u): 
+                if dist_u + weight < distance[v]:
+                    distance[v] = dist_u + weight
                     parent[v] = u
-                    priority_queue.insert(v, distance[v])
+                    update(v, distance[v]) # insert v, or lower its priority if it is already queued
+
+        self.settled_count = settled_count
+        return self.finish_search(start_node, end_node, distance, parent, targets, max_distance)
+
+
+    def finish_search(self, start_node: int, end_node: int | None, distance: list, parent: list, targets, 
+                      max_distance: int | None) -> tuple[list,list] | list:
+        """
+        Description:
+        The end of a dijkstras search: caches the tree if it may be reused and returns what dijkstras returns.
+
+        Input:
+            - start_node, end_node, targets, max_distance: As passed to dijkstras.
+            - distance, parent: The arrays computed by the search.
+
+        Output:
+            - The path to end_node if it is provided, the distance and parent arrays otherwise.
+
+        Time complexity: O(|L|) for the path reconstruction, O(|targets|) to cache the tree.
+
+        Space complexity: O(|L|)
+        """
+        # bounded searches are not cached, their result depends on the bound
+        if self.tree_cache is not None and max_distance is None:
+            self.tree_cache.put(start_node, (distance, parent), targets)
 
         # reconstructing shortest path if end node is provided
         if end_node is not None:
-            path = self.route_half_reconstruction(end=end_node, parents=parent)
-            return path
+            return self.path_from_tree(end_node, (distance, parent))
 
         # if not, then just return the distance and parent lists
         return distance, parent
-    
 
-    def route_half_reconstruction(self, end: int, parents: list[int]) -> list[int]:
+
+    def path_from_tree(self, end_node: int, tree: tuple[list,list]) -> list[int]:
         """
-        Description: 
-        Reconstructs a path from the given endpoint back to the start using the parent array, which is generated by Dijkstra's algorithm.
-        This method traces the shortest path in reverse, starting from the end location and following the predecessors 
-        recorded in the parents array until it reaches the starting location (where the parent is -1). The path is then reversed to 
-        give the correct order from start to end.
+        Description:
+        Reconstructs the path to end_node from a shortest path tree, see route_half_reconstruction.
 
         Input:
-            - end: The destination location for the path reconstruction.
-            - parents: The parent array, where each index stores the predecessor of the corresponding location.
+            - end_node: The location the path leads to.
+            - tree: The (distance, parent) arrays of a search that settled end_node if it can be reached.
 
         Output:
-            - A list of vertices representing the reconstructed path.
+            - The path from the root of the tree to end_node, an empty list if end_node cannot be reached, as the 
+            bidirectional, A* and contraction hierarchy searches return it.
 
-        Time complexity: O(|L|), where |L| is the number of locations traversed in the path.
-        - The method performs a reverse traversal of the parents array, which requires O(|L|) time, where |L| is the 
-          number of locations in the graph. In the worst case, the entire path from the start to the end needs to be traced, 
-          making the complexity O(|L|).
+        Time complexity: O(|L|)
 
         Space complexity: O(|L|)
-        - The size of the path list is at most O(|L|), as it includes all locations in the path from the start to the end.
-        - Therefore, the space complexity is O(|L|).
         """
-        path = []
-        current = end
-        while current != -1:
-            path.append(current)
-            current = parents[current]
-        path.reverse()
-        return path
+        distance, parent = tree
+        if distance[end_node] == float('inf'):
+            return []
+        return self.route_half_reconstruction(end=end_node, parents=parent)
+    
 
-    def route_full_reconstruction(self, start: int, pickup: int, destination: int) -> list[int]:
+    def bidirectional_dijkstras(self, start_node: int, end_node: int, queue: str = "binary") -> tuple[int, list[int]]:
         """
         Description: 
-        Reconstructs the full route from the start location to the destination location, making a stop at the pickup location.
-        It combines two partial paths using the dijkstra method: one from start to the pickup location and another from pickup 
-        to the destination.
+        Finds the shortest path between two locations with a bidirectional Dijkstra search. Since the roads are undirected, a
+        forward search grows from start_node and a backward search grows from end_node over the same roads. At each step the 
+        side whose frontier is closer is advanced. Whenever a relaxed road joins the two searches, the length of the 
+        start -> end path through it is compared against the best one found so far (best). 
+        The search stops once the two smallest frontier distances add up to at least best, since any path that is not yet 
+        found must leave both frontiers and so cannot be shorter than best.
 
         Input:
-            - start: The starting location of the path.
-            - pickup: The pickup location where a friend is picked up.
-            - destination: The final destination location of the path.
+            - start_node: The starting location.
+            - end_node: The destination location.
+            - queue (optional): The priority queue used for both frontiers, as in dijkstras.
 
         Output:
-            - A list of locations representing the full reconstructed path, including the pickup.
+            - A tuple containing:
+                - The length of the shortest path from start_node to end_node (inf if there is none).
+                - The list of locations on that path (empty if there is none).
 
-        Time Complexity: O(|R| log |L|)
-        - Two calls to Dijkstra's algorithm dominate the time complexity.
-        - Dijkstra's algorithm runs twice, once from start to pickup and once from pickup to destination.
-        - These runs have a complexity of O(|R| log |L|), where |R| is the number of roads (edges) and |L| 
-        is the number of locations (vertices).
-        - Reconstructing the paths is O(|L|), but this is dominated by the dijkstra method.
-        - Therefore, the overall time complexity is O(|R| log |L|).
+        Time complexity: O(|R| log |L|)
+        - In the worst case both searches settle every location, which is twice the work of dijkstras.
+        - In practice each search only settles the locations within about half the start to end distance, which is a 
+        small fraction of the graph for nearby locations.
 
-        Space Complexity: O(|R|)
-        - Two arrays (distance and parent) are used in Dijkstra's algorithm, each of size |R|.
-        - The priority queue (MinHeap) also stores up to |R| elements.
-        - The space required for storing the reconstructed path is proportional to the number of road.
-        - Overall, the space complexity is O(|R|).
+        Space complexity: O(|L|)
+        - Two distance and two parent arrays of size |L| and two priority queues.
         """
-        route_half_1 = self.dijkstras(start_node=start, end_node=pickup)
-        route_half_2 = self.dijkstras(start_node=pickup, end_node=destination)
-
-        route_half_1.pop() # removing the pickup spot
+        n = len(self.road_graph)
+        adjacent = self.road_graph.adjacent
+
+        # index 0 is the forward search from start_node, index 1 is the backward search from end_node
+        distance = ([float('inf')] * n, [float('inf')] * n)
+        parent = ([-1] * n, [-1] * n)
+        queues = (self.new_priority_queue(queue), self.new_priority_queue(queue))
+
+        distance[0][start_node] = 0
+        distance[1][end_node] = 0
+        queues[0].insert(start_node, 0)
+        queues[1].insert(end_node, 0)
+
+        best = 0 if start_node == end_node else float('inf') # length of the shortest start -> end path found so far
+        meeting = start_node if start_node == end_node else -1 # the location where that path crosses between the searches
+        settled_count = 0
+
+        while not queues[0].is_empty() and not queues[1].is_empty():
+            forward_min = queues[0].peek()[1]
+            backward_min = queues[1].peek()[1]
+
+            # stopping rule, no undiscovered path can be shorter than best
+            if forward_min + backward_min >= best:
+                break
+
+            side = 0 if forward_min <= backward_min else 1
+            side_distance = distance[side]
+            side_parent = parent[side]
+            other_distance = distance[1 - side]
+            side_queue = queues[side]
+
+            u, dist_u = side_queue.extract_min()
+            if dist_u > side_distance[u]:
+                continue # stale entry
+            settled_count += 1
+
+            for _, v, weight in adjacent(u):
+                dist_v = dist_u + weight
+                if dist_v < side_distance[v]:
+                    side_distance[v] = dist_v
+                    side_parent[v] = u
+                    side_queue.update(v, dist_v)
+
+                # the road (u, v) joins the two searches
+                if dist_v + other_distance[v] < best:
+                    best = dist_v + other_distance[v]
+                    meeting = v
+
+        self.settled_count = settled_count
+
+        if meeting == -1:
+            return float('inf'), []
+
+        # start -> meeting from the forward tree, then meeting -> end by walking up the backward tree
+        path = self.route_half_reconstruction(end=meeting, parents=parent[0])
+        current = parent[1][meeting]
+        while current != -1:
+            path.append(current)
+            current = parent[1][current]
 
-        route = route_half_1 + route_half_2
+        return best, path
 
-        return route
 
-    def plan(self, start: int, destination: int) -> tuple[int, list, str, int]: # (total_time, route, pickup_friend, pickup_location)
+    def astar_dijkstras(self, start_node: int, end_node: int, queue: str = "auto") -> tuple[int, list[int]]:
         """
         Description:
-        Plans a route from the start location to the destination, ensuring that a friend is picked up at the most suitable location
-        given the constraint that they can't travel more than 2 train hops away from their starting location.
-        The method uses Dijkstra's algorithm twice to calculate the shortest paths: once from the start to all locations and 
-        once from the destination to all locations. It identifies the potential pickup locations of each friend and 
-        finds the distance from the start to that pickup location and from the destination to that pickup location. As it checks all
-        combinations of potential pickup spots, it then compares this shortest distance value with the current shortest valid distance 
-        value, and if it calculates a new combination which has a shorter path, then it updates all the information to make this the
-        new shortest value. Finally, it reconstructs the complete route which includes the optimal pickup location by using 
-        the route_full_reconstruction method which runs dijkstras twice.
+        Finds the shortest path between two locations with A* search, guided by the landmark lower bounds of self.landmarks 
+        (see Landmarks). It is Dijkstra's algorithm with every location queued by its distance from start_node plus a lower 
+        bound on its distance to end_node, so the search heads towards end_node instead of growing in every direction. The 
+        bound is consistent, so each location is settled at most once and the search stops when end_node is settled.
 
         Input:
-            - start: The starting location.
-            - destination: The destination location.
+            - start_node: The starting location.
+            - end_node: The destination location.
+            - queue (optional): "indexed" or "binary", as in dijkstras. The queued priorities are not road weight increments,
+              so "auto" and "bucket" use an "indexed" queue.
 
         Output:
-            - A tuple containing:
-                - total_time: The total travel time for the journey.
-                - route: A list of locations representing the complete route, including the pickup.
-                - pickup_friend: The name of the friend being picked up.
-                - pickup_location: The location where the friend is picked up.
+            - The length of the shortest path and the path as a list of locations, (inf, []) if end_node cannot be reached. 
+            The number of settled locations is stored in self.settled_count.
 
-        Time complexity: O(|R| log |L|)
+        Raises:
+            - ValueError: If no landmarks have been built or loaded.
 
-        - To begin with, this method performs two calls to Dijkstra's algorithm, each of which has a time complexity 
-        of O(|R| log |L|), where:
-            - |R| is the number of roads (edges).
-            - |L| is the number of locations (vertices).
-        - This method then finds the potential pickup locations of the friend(s) by iterating through the each location of the graph
-        which runs at most |L| times (one pickup for each location) giving time complexity of O(|L|).
-        - It then iterates through these pickup locations and performs simple arithmetic to check and update the shortest path if it 
-        finds one, which is done in O(|L|).
-        - After finding the shortest route, it reconstructs the path using 2 runs of dijkstras at most O(2|R| log |L|)
-        - Hence the total time complexity is O(4|R| log|L| + 2|L|).
-        - Since |R| >= |L| - 1, the term |R| log |L| dominates and the constant 4 can be removed.
-        - Therefore, the overall time complexity is O(|R| log |L|).
+        Time complexity: O(K |R| log |L|) in the worst case, where K is the number of landmarks.
+        - Like dijkstras, with an O(K) lower bound computed the first time each location is reached. 
+        - With well spread landmarks only the locations close to a shortest path are settled.
 
-        Space complexity: O(|R|)
-        
-        - The Dijkstra's algorithm uses arrays of size |R| to store distances and parents.
-        - The reconstructed route and potential pickup locations also require space proportional to |R|.
-        - Therefore, the overall space complexity is O(|R|).
+        Space complexity: O(|L|)
         """
-        start_distances, start_parents = self.dijkstras(start_node=start) # finding shortest distance from start to all other nodes
-        destination_distances, destination_parents = self.dijkstras(start_node=destination) # finding shortest distance from destination to all other nodes
+        if self.landmarks is None:
+            raise ValueError("No landmarks, call build_landmarks or load_landmarks first")
+        if queue in ("auto", "bucket"):
+            queue = "indexed"
+
+        n = len(self.road_graph)
+        adjacent = self.road_graph.adjacent
+        h = self.landmarks.heuristic(end_node)
+
+        distance = [float('inf')] * n
+        parent = [-1] * n
+        bound = {} # the lower bound of each reached location, computed once
+
+        distance[start_node] = 0
+        priority_queue = self.new_priority_queue(queue)
+        priority_queue.insert(start_node, h(start_node))
+        update = priority_queue.update
+        settled = bytearray(n)
+        settled_count = 0
 
-        # initialising final values
-        final_total_time = float('inf')
-        route = []
-        pickup_friend = None
-        pickup_location = None
-        final_pickup_trainhops = float('inf')
+        while not priority_queue.is_empty():
+            u, _ = priority_queue.extract_min()
+            if settled[u]:
+                continue # stale entry
+            settled[u] = 1
+            settled_count += 1
+            if u == end_node:
+                break
+
+            dist_u = distance[u]
+            for _, v, weight in adjacent(u):
+                if dist_u + weight < distance[v]:
+                    distance[v] = dist_u + weight
+                    parent[v] = u
+                    if v not in bound:
+                        bound[v] = h(v)
+                    update(v, distance[v] + bound[v])
 
-        # get the graph from the Graph class
-        graph = self.road_graph.get_graph()
+        self.settled_count = settled_count
 
-        potential_pickup_locations = []
+        if distance[end_node] == float('inf'):
+            return float('inf'), []
+        return distance[end_node], self.route_half_reconstruction(end=end_node, parents=parent)
 
-        for i in range(len(graph)):
-            friend_hops = graph[i][1]
-            if friend_hops[0]:
-                potential_pickup_locations.append(friend_hops)
 
-        # Iterating through the potential combinations of pickup locations and updating accordingly
-        for friend, pickup, hops in potential_pickup_locations:
-            total_time = start_distances[pickup] + destination_distances[pickup]
+    def build_landmarks(self, count: int = 16) -> None:
+        """
+        Description:
+        Picks count landmarks by farthest point selection and computes their distance arrays, see Landmarks.select. From then 
+        on, point to point searches (dijkstras with an end_node) use astar_dijkstras, until the roads are modified.
 
-            if (total_time < final_total_time) or (total_time == final_total_time and hops < final_pickup_trainhops):
-                final_total_time = total_time
-                pickup_friend = friend
-                pickup_location = pickup
-                final_pickup_trainhops = hops
+        Input:
+            - count (optional): The number of landmarks, 16 by default. More landmarks give tighter bounds, so fewer settled 
+              locations per search, at the cost of O(|L|) memory and O(1) time per reached location each.
 
-        # reconstructing the route
-        route = self.route_full_reconstruction(start=start, pickup=pickup_location, destination=destination)
+        Output: None
 
-        return final_total_time, route, pickup_friend, pickup_location
+        Time complexity: O(K |R| log |L|)
 
+        Space complexity: O(K |L|)
+        """
+        self.landmarks = Landmarks.select(self, count)
 
 
-    def __str__(self) -> str:
+    def save_landmarks(self, path: str) -> None:
         """
-        Function description: Returns a string representation of the graph, showing each vertex and its edges.
+        Description:
+        Saves the landmarks built with build_landmarks, so they can be loaded instead of being computed again.
 
-        Input: None
+        Input:
+            - path: The file to write.
 
-        Output:
-            A string representation of the graph.
+        Output: None
 
-        Time complexity: O(|R|)
+        Raises:
+            - ValueError: If no landmarks have been built or loaded.
 
-        Time complexity analysis: Each vertex and its list of edges in the road graph are iterated over to build the string.
+        Time and space complexity: O(K |L|)
+        """
+        if self.landmarks is None:
+            raise ValueError("No landmarks, call build_landmarks or load_landmarks first")
+        self.landmarks.save(path)
 
-        Space complexity: O(|R|)
-        
-        Space complexity analysis: The space used for the result list is the number of elements in the road graph.
+
+    def load_landmarks(self, path: str) -> None:
         """
-        result = []
-        for i, edges in enumerate(self.road_graph.get_graph()):
-            result.append(f"Vertex {i}: {edges}")
-        return "\n".join(result)
+        Description:
+        Loads landmarks saved with save_landmarks. They must have been computed on the same roads.
 
+        Input:
+            - path: The file to read.
 
+        Output: None
 
+        Raises:
+            - ValueError: If the file is not a landmark file or has a different number of locations.
 
+        Time and space complexity: O(K |L|)
+        """
+        self.landmarks = Landmarks.load(path, self.road_graph)
 
 
-class Graph:
-    """  
-    Class description: 
-    This class represents a graph with roads, tracks, and friends. It is designed to take an input of roads, tracks and friends and 
-    make a graph data structure in an efficient way which enables a traversal to find the shortest path given that a friend
-    needs to be picked up within 2 train hops of their starting location. The graph is stored as an adjacency list, where vertices 
-    represent locations, and edges represent connections between locations (roads). 
-    """
-    def __init__(self, roads, tracks, friends) -> None:
+    def build_contraction_hierarchy(self, witness_settle_limit: int = 50) -> None:
         """
-        Function description: Initialises the graph with roads, tracks, and friends data. It constructs the road graph
-        using an adjacency list and associates friends with their respective locations, also updating train hops for valid 
-        locations that are within 2 train stops.
+        Description:
+        Builds a Contraction Hierarchies index of the roads, see contraction.ContractionHierarchy, and the target buckets of 
+        the pickup locations. From then on, until the roads are modified:
+            - Point to point searches (dijkstras with an end_node) are bidirectional upward searches in the hierarchy, which 
+              settle a few hundred locations instead of a region of the city.
+            - plan (and plan_many) finds the distances from its start and its destination to every pickup location with 
+              one upward search each, see plan_from_contraction, instead of two Dijkstra searches.
+        Routes found through the hierarchy are shortest routes, but among routes of equal length they may pick a different 
+        one than the Dijkstra searches.
 
         Input:
-            roads: List of tuples (start_vertex, end_vertex, weight) representing roads.
-            tracks: List of tuples (start_vertex, end_vertex, weight) representing tracks.
-            friends: List of tuples (friend_name, location) representing friends and their locations.
-        
-        Output: None
+            - witness_settle_limit (optional): The most locations settled by a witness search while contracting. Smaller 
+              limits build faster but may add shortcuts that are not needed.
 
-        Time complexity: O(|R| + |T|)
-        - |R| is the number of roads.
-        - |T| is the number of tracks.
-        
-        Time complexity analysis:
-        - O(|R|) to iterate over all roads and add undirected edges.
-        - O(|T|) to iterate over the tracks and update the train hops.
-        - We can assume that |F| <= |L| (the number of friends is at most the number of locations)
-        - We can also assume that |R| >= |L| - 1 which is the definition of a graph.
-        - Therefore we can infer that |R| > |F| (number of raods will always be greater than the number of friends)
-        - Hence, O(|F|) is dominated by O(|R|) and thus we can ignore |F| in the complexity.
+        Output: None
 
+        Time complexity: See ContractionHierarchy, plus O(C U log U) for the buckets of C pickup locations.
 
-        Space complexity: O(|R|)
-        
-        Space complexity analysis: The space we are initialising for the adjacency list is the length of 
-        the roads list + 1, the space complexity becomes O(|R|). And since the graph is connected and simple, 
-        the number of locations |L| will not exceed |R| + 1, so the space complexity is dominated by the number of roads.
+        Space complexity: O(|L| + |R| + S + C U), where S is the number of shortcuts.
         """
-        self.roads = roads
-        self.tracks = tracks
-        self.friends = friends
+        self.contraction = ContractionHierarchy(self.road_graph, witness_settle_limit)
+        self.build_contraction_buckets()
 
-        size_initialisation = len(roads) + 1  # Adjust size based on the number of roads and locations
 
-        # Initialize the adjacency list for the road graph
-        self.road_graph = [[[], (None, float('inf'), float('inf'))] for _ in range(size_initialisation)] 
+    def build_contraction_buckets(self) -> None:
+        """
+        Description:
+        Builds the target buckets of the current pickup locations in the contraction hierarchy, see 
+        ContractionHierarchy.target_buckets. They are rebuilt whenever the friends or tracks have changed since.
+
+        Input: None
 
-        self.add_edges_undirected()  # Add the undirected roads to the graph
-        self.add_friend_locations()  # Update the graph with friend locations and their train hops
-        self.filter_graph()  # Remove any unconnected vertices from the graph
+        Output: None
 
+        Time complexity: O(C U log U), for C pickup locations.
 
-    def add_edges_undirected(self) -> None:
+        Space complexity: O(C U)
         """
-        Description:
-        This method adds undirected edges (roads) to the graph's adjacency list. For each road, 
-        it adds the edge to both the start and end vertices, ensuring that the edge is represented 
-        in both directions, since the graph is undirected.
+        self.contraction_buckets = self.contraction.target_buckets(self.road_graph.pickup_locations)
+        self.contraction_pickup_version = self.road_graph.pickup_version
 
-        - For each road, the method adds the edge to the adjacency list of the start vertex.
-        - It then adds the reverse of the same edge to the adjacency list of the end vertex, 
-        ensuring that both directions are accounted for in the undirected graph.
 
-        Input: 
-            - None
+    def has_contraction_hierarchy(self) -> bool:
+        """
+        Description:
+        Whether a contraction hierarchy has been built for the current roads.
 
-        Output: 
-            - None
+        Input: None
 
-        Time Complexity: O(|R|), where |R| is the number of roads.
+        Output:
+            - True if self.contraction can answer queries.
 
-        Time Complexity Analysis:
-        - The method iterates over each road once, adding edges in both directions, which results in O(|R|) complexity.
+        Time and space complexity: O(1)
+        """
+        return self.contraction is not None and self.contraction.version == self.road_graph.version
 
-        Space Complexity: O(1)
 
-        Space Complexity Analysis:
-        - No additional space is used beyond updating the existing graph structure.
+    def build_hub_labels(self, witness_settle_limit: int = 50) -> None:
         """
-        for edge in self.roads:
-            start_vertex, end_vertex, weight = edge
+        Description:
+        Builds a 2-hop hub labelling of the roads from a contraction hierarchy, see hublabels.HubLabels, building the 
+        hierarchy first if there is none for the current roads. From then on, until the roads are modified, plan finds the 
+        distances from its start and destination to every pickup location by looking them up in the labels, with no graph 
+        search, see plan_from_labels, and distance_row answers from them too.
+
+        Input:
+            - witness_settle_limit (optional): See build_contraction_hierarchy.
 
-            self.road_graph[start_vertex][0].append((start_vertex, end_vertex, weight))
-            self.road_graph[end_vertex][0].append((end_vertex, start_vertex, weight))
+        Output: None
 
+        Time complexity: The time of build_contraction_hierarchy, plus O(|L| M^2) where M is the largest label size.
 
-    def add_friend_locations(self) -> None:
+        Space complexity: O(|L| M)
         """
-        Description: 
-        This method updates the graph to reflect the valid pickup locations of friends by calculating the number of train hops 
-        needed to reach other locations within 2 train stops. It works by:
-        
-        1. Assigning each friend to their starting location in the graph with 0 train hops.
-        2. Iterating over all the tracks and checking if there's a friend at the start of each track.
-        3. If a friend is found, the method checks whether reaching the destination location via this track 
-        would reduce the number of train hops.
-        4. If the new number of train hops (current + 1) is less than 2 and less than the existing hops at the 
-        destination, it updates the destination with the friend's name and the updated train hops.
+        if not self.has_contraction_hierarchy():
+            self.build_contraction_hierarchy(witness_settle_limit)
+        self.hub_labels = HubLabels.from_hierarchy(self.contraction, self.road_graph.version)
 
-        Input: 
-            - None 
-            
-        Output:
-            - None
 
-        Time Complexity: O(|T| + |F|), where:
-            - |T| is the number of tracks.
-            - |F| is the number of friends.
+    def save_hub_labels(self, path: str) -> None:
+        """
+        Description:
+        Saves the labels built with build_hub_labels, so they can be loaded instead of being computed again.
 
-        Time Complexity Analysis:
-            - O(|F|) when looping through self.friends and assigning each friend to their starting location.
-            - O(|T|) when iterating over all tracks and updating train hops.
+        Input:
+            - path: The file to write.
 
-        Space Complexity: O(1)
-        
-        Space Complexity Analysis:
-            - The method uses no extra space, as it only updates the existing graph data.
-        """
-        # Assign each friend to their initial location with 0 train hops
-        for friend, location in self.friends:
-            self.road_graph[location][1] = (friend, location, 0)  # Update friend's info at their starting location
+        Output: None
 
-        # Iterate over all tracks to update train hops based on friends' locations
-        for start_vertex, end_vertex, weight in self.tracks:
-            friend_name = self.road_graph[start_vertex][1][0]  # Get the friend's name at the start vertex
-            start_hops = self.road_graph[start_vertex][1][2]   # Get current hops at the start vertex
-            end_hops = self.road_graph[end_vertex][1][2]       # Get current hops at the end vertex
+        Raises:
+            - ValueError: If no hub labels have been built or loaded.
 
-            # If there's a friend at the start vertex and the path to the end vertex has fewer hops, update it
-            if (friend_name is not None) and (start_hops + 1 <= 2) and (start_hops + 1 < end_hops):
-                self.road_graph[end_vertex][1] = (friend_name, end_vertex, start_hops + 1)  # Update destination with friend and hops
+        Time and space complexity: O(|L| M)
+        """
+        if self.hub_labels is None:
+            raise ValueError("No hub labels, call build_hub_labels or load_hub_labels first")
+        self.hub_labels.save(path)
 
 
-    def filter_graph(self) -> None:
+    def load_hub_labels(self, path: str) -> None:
         """
-        Function description: Removes any empty vertices from the graph that are not connected to any edges if there
-        is more than 1 element already in the adjacency list.
+        Description:
+        Loads labels saved with save_hub_labels. They must have been computed on the same roads.
 
-        Input: None
+        Input:
+            - path: The file to read.
 
         Output: None
-        
-        Time complexity: O(1)
-        
-        Time complexity analysis: Only checks the last element of the graph.
 
-        Space complexity: O(1)
-        
-        Space complexity analysis: No extra space is used, it simply modifies the existing structure.
+        Raises:
+            - ValueError: If the file is not a hub label file or has a different number of locations.
+
+        Time and space complexity: O(|L| M)
         """
-        existing_element = self.road_graph[-1][0]
-        if len(self.road_graph) > 1 and not existing_element:
-            self.road_graph.pop()
+        self.hub_labels = HubLabels.load(path, self.road_graph)
 
 
-    def get_graph(self) -> list:
+    def has_hub_labels(self) -> bool:
         """
-        Function description: Returns the graph's adjacency list structure.
+        Description:
+        Whether hub labels have been built or loaded for the current roads.
 
         Input: None
 
         Output:
-            The adjacency list structure of the graph.
+            - True if self.hub_labels can answer distance queries.
 
-        Time complexity: O(1)
-
-        Space complexity: O(1)
+        Time and space complexity: O(1)
         """
-        return self.road_graph
-    
+        return self.hub_labels is not None and self.hub_labels.version == self.road_graph.version
+
 
-    def __len__(self) -> int:
+    def add_road(self, u: int, v: int, weight) -> None:
         """
-        Function description: Returns the number of vertices in the graph.
+        Description:
+        Adds a road between two existing locations, in place, without rebuilding the city. The complete trees in the tree 
+        cache are repaired rather than dropped, see TreeCache.repair. Landmarks, the contraction hierarchy and hub labels 
+        were built for the old roads, so they are no longer used until they are built again.
 
-        Input: None
+        Input:
+            - u, v: The ends of the road.
+            - weight: The travel time of the road.
 
-        Output:
-            The number of vertices in the graph.
+        Output: None
 
-        Time complexity: O(1)
+        Raises:
+            - ValueError: If the city does not use the list backend, a location does not exist, u == v or the road already 
+              exists.
 
-        Space complexity: O(1)
+        Time complexity: O(deg(u) + deg(v)), plus the repair of the cached trees.
+
+        Space complexity: O(1), plus the repair of the cached trees.
         """
-        return len(self.road_graph)
+        self.check_road_updates()
+        self.road_graph.add_road(u, v, weight)
+        self.repair_trees(u, v, None, weight)
 
 
-    def __str__(self) -> str:
+    def update_road(self, u: int, v: int, weight):
         """
-        Function description: Returns a string representation of the graph, showing each vertex and its edges.
+        Description:
+        Changes the travel time of a road, in place, without rebuilding the city, e.g. as traffic changes. The complete 
+        trees in the tree cache are repaired rather than dropped, see add_road.
 
-        Input: None
+        Input:
+            - u, v: The ends of the road.
+            - weight: The new travel time of the road.
 
         Output:
-            A string representation of the graph.
+            - The previous travel time of the road.
 
-        Time complexity: O(|R|)
+        Raises:
+            - ValueError: If the city does not use the list backend, a location does not exist or there is no road u - v.
 
-        Time complexity analysis: Each vertex and its list of edges in the road graph are iterated over to build the string.
+        Time complexity: O(deg(u) + deg(v)), plus the repair of the cached trees.
 
-        Space complexity: O(|R|)
-        
-        Space complexity analysis: The space used for the result list is the number of elements in the road graph.
+        Space complexity: O(1), plus the repair of the cached trees.
         """
-        result = []
-        for i, edges in enumerate(self.road_graph):
-            result.append(f"Vertex {i}: {edges}")
-        return "\n".join(result)
-    
-
+        self.check_road_updates()
+        old_weight = self.road_graph.update_road(u, v, weight)
+        self.repair_trees(u, v, old_weight, weight)
+        return old_weight
 
 
-class MinHeap:
-    """
-    The MinHeap class implements a priority queue using a binary heap data structure. This 
-    structure maintains the heap property, where each parent node has a value less than or equal 
-    to its children, ensuring that the minimum element is always at the root. 
-    """
-    def __init__(self):
+    def remove_road(self, u: int, v: int):
         """
-        Function description: Initialises an empty list to represent the heap.
+        Description:
+        Removes a road, in place, without rebuilding the city. The complete trees in the tree cache are repaired rather 
+        than dropped, see add_road.
 
-        Input: None
+        Input:
+            - u, v: The ends of the road.
+
+        Output:
+            - The travel time of the removed road.
+
+        Raises:
+            - ValueError: If the city does not use the list backend, a location does not exist or there is no road u - v.
+
+        Time complexity: O(deg(u) + deg(v)), plus the repair of the cached trees.
+
+        Space complexity: O(1), plus the repair of the cached trees.
+        """
+        self.check_road_updates()
+        old_weight = self.road_graph.remove_road(u, v)
+        self.repair_trees(u, v, old_weight, None)
+        return old_weight
+
+
+    def check_road_updates(self) -> None:
+        """
+        Description:
+        Checks that the roads of the city can be modified: the CSR arrays of the csr backend (and of loaded snapshots) are 
+        fixed in size, so only the list backend supports road updates.
+
+        Input: None
+
+        Output: None
+
+        Raises:
+            - ValueError: If the city does not use the list backend.
 
-        Output: None
-        
         Time and space complexity: O(1)
         """
-        self.heap = []
+        if not isinstance(self.road_graph, Graph):
+            raise ValueError("Road updates need the list backend")
+
+
+    def repair_trees(self, u: int, v: int, old_weight, new_weight) -> None:
+        """
+        Description:
+        Brings the tree cache, if there is one, up to date with a change of the road u - v, see TreeCache.repair.
+
+        Input:
+            - u, v: The ends of the road.
+            - old_weight: The weight before the change, None if the road was added.
+            - new_weight: The weight after the change, None if the road was removed.
+
+        Output: None
+
+        Time complexity: See TreeCache.repair.
+
+        Space complexity: See TreeCache.repair.
+        """
+        if self.tree_cache is not None:
+            self.tree_cache.repair(u, v, old_weight, new_weight)
+
+
+    def add_friend(self, name: str, location: int) -> None:
+        """
+        Description:
+        Adds a friend, without rebuilding the city. Only the locations the friend can reach within max_hops train hops are 
+        updated, see TrainNetwork.add_friend and update_pickups. Among friends picked up at the same cost with the same 
+        number of hops, the new friend comes after the existing ones.
+
+        Input:
+            - name: The name of the friend.
+            - location: The starting location of the friend.
+
+        Output: None
+
+        Time complexity: O(P_f (k + log P)), where P_f is the number of locations the friend reaches, k the number of 
+        friends at one location and P the number of pickup candidates.
 
-    def parent(self, i):
+        Space complexity: O(P_f)
         """
-        Function description: Returns the index of the parent of the node at index i.
+        self.update_pickups(self.train_network().add_friend(name, location))
+
+
+    def remove_friend(self, name: str) -> int:
+        """
+        Description:
+        Removes a friend, the first given with that name, without rebuilding the city. Only the locations the friend could 
+        reach are updated.
 
         Input:
-            i: Index of the current node.
+            - name: The name of the friend.
 
         Output:
-            The index of the parent node.
-        
-        Time and space complexity: O(1)
-        - Simple arithmetic
+            - The location of the removed friend.
+
+        Raises:
+            - ValueError: If there is no friend with that name.
+
+        Time complexity: O(|F| + P_f (k + log P)), finding the friend and updating the locations it reached.
+
+        Space complexity: O(P_f)
         """
-        return (i - 1) // 2 # O(1)
+        location, touched = self.train_network().remove_friend(name)
+        self.update_pickups(touched)
+        return location
 
-    def left_child(self, i): 
+
+    def move_friend(self, name: str, location: int) -> int:
         """
-        Function description: Returns the index of the left child of the node at index i.
+        Description:
+        Moves a friend, the first given with that name, to another starting location, without rebuilding the city. Only 
+        the locations the friend could reach from its old or its new location are updated.
 
         Input:
-            i: Index of the current node.
+            - name: The name of the friend.
+            - location: The new starting location.
 
         Output:
-            The index of the left child node.
-        
-        Time and space complexity: O(1)
-        - Simple arithmetic
+            - The previous location of the friend.
+
+        Raises:
+            - ValueError: If there is no friend with that name.
+
+        Time complexity: O(|F| + P_f (k + log P))
+
+        Space complexity: O(P_f)
+        """
+        old_location, touched = self.train_network().move_friend(name, location)
+        self.update_pickups(touched)
+        return old_location
+
+
+    def add_track(self, start_vertex: int, end_vertex: int, weight) -> None:
+        """
+        Description:
+        Adds a (directed) train track, without rebuilding the city. Only the friends within max_hops - 1 hops of its start 
+        can use it, so only their pickup locations are searched again, see TrainNetwork.add_track.
+
+        Input:
+            - start_vertex, end_vertex: The ends of the track.
+            - weight: The travel time of the track.
+
+        Output: None
+
+        Time complexity: O(A P_f (k + log P)), for the A friends that can reach start_vertex in fewer than max_hops hops.
+
+        Space complexity: O(A P_f)
         """
-        return 2 * i + 1 # O(1)
+        self.update_pickups(self.train_network().add_track(start_vertex, end_vertex, weight))
+
 
-    def right_child(self, i): 
+    def remove_track(self, start_vertex: int, end_vertex: int):
         """
-        Function description: Returns the index of the right child of the node at index `i`.
+        Description:
+        Removes a train track, e.g. closed for maintenance, without rebuilding the city. Only the friends that could use it 
+        have their pickup locations searched again.
 
         Input:
-            i: Index of the current node.
+            - start_vertex, end_vertex: The ends of the track.
 
         Output:
-            The index of the right child node.
-        
-        Time and space complexity: O(1)
-        - Simple arithmetic
+            - The travel time of the removed track.
+
+        Raises:
+            - ValueError: If there is no such track.
+
+        Time complexity: O(|T| + A P_f (k + log P)), finding the track and updating the affected friends.
+
+        Space complexity: O(A P_f)
         """
-        return 2 * i + 2 # O(1)
+        weight, touched = self.train_network().remove_track(start_vertex, end_vertex)
+        self.update_pickups(touched)
+        return weight
 
-    def insert(self, value, priority):
+
+    def train_network(self) -> TrainNetwork:
         """
-        Function description: Inserts a new element into the heap with the given priority.
-        
+        Description:
+        Returns the TrainNetwork of the city's graph. A graph loaded from a snapshot has none, its pickup candidates were 
+        read from the file, so one is built from its tracks and friends the first time friends or tracks change.
+
+        Input: None
+
+        Output:
+            - The TrainNetwork.
+
+        Time complexity: O(1), or O(|T| + |F| + P) the first time for a loaded graph.
+
+        Space complexity: O(1), or O(|T| + P) the first time for a loaded graph.
+        """
+        graph = self.road_graph
+        if graph.train_network is None:
+            graph.train_network = TrainNetwork(graph.tracks, graph.friends, graph.max_hops)
+        return graph.train_network
+
+
+    def update_pickups(self, touched: set[int]) -> None:
+        """
+        Description:
+        Updates the graph's pickup information for the locations a friend or track change touched, see 
+        Graph.update_pickups. Cached trees stay valid: each remembers the pickup locations it was searched for, and is only 
+        used for the same or fewer. The target buckets of the contraction hierarchy are rebuilt by the next plan.
+
         Input:
-            value: The value to insert.
-            priority: The priority of the value.
-        
+            - touched: The locations whose pickup options changed.
+
         Output: None
-        
-        Time complexity: O(log N)
-        
-        Time complexity analysis: Inserting an element involves appending it to the end of the 
-        list O(1) and then performing a heapify-up operation O(log N).
-        
-        Space complexity: O(1)
-        
-        Space complexity analysis: Only one element is added to the end of the list and then the operations that
-        are performed are in place and therefore the space complexity is constant.
+
+        Time complexity: See Graph.update_pickups.
+
+        Space complexity: See Graph.update_pickups.
+        """
+        self.road_graph.update_pickups(touched)
+
+
+    def new_priority_queue(self, queue: str) -> MinHeap | IndexedMinHeap | BucketQueue:
+        """
+        Description: 
+        Creates an empty priority queue of the given type for a search over this city's locations. Every queue type offers the 
+        same interface (insert, update, extract_min, peek, is_empty), where update(value, priority) inserts value or lowers its 
+        priority if it is already queued. The lazy queues ("binary" and "bucket") keep the old entry, which the searches skip 
+        as stale when it is extracted.
+
+        Input:
+            - queue: The type of priority queue.
+                - "indexed": an IndexedMinHeap with decrease key.
+                - "binary": a MinHeap.
+                - "bucket": a BucketQueue with one bucket per possible road weight, the road weights must be integers.
+                - "auto": "bucket" if every road weight is an integer no larger than the number of locations, otherwise "indexed". 
+                  Setting up the buckets then costs no more than the distance array, and on the benchmarked cities the bucket 
+                  queue was faster than both heaps for every such weight.
+
+        Output:
+            - The new, empty priority queue.
+
+        Time complexity: O(|L|) for "indexed" (the position map), O(C) for "bucket" where C is the largest road weight, 
+        O(1) for "binary".
+
+        Space complexity: O(|L|) for "indexed", O(C) for "bucket", O(1) for "binary".
+        """
+        graph = self.road_graph
+        if queue == "auto":
+            small_weights = graph.integer_weights and graph.max_weight <= len(graph)
+            queue = "bucket" if small_weights else "indexed"
+
+        if queue == "indexed":
+            return IndexedMinHeap(len(graph))
+        if queue == "binary":
+            return MinHeap()
+        if queue == "bucket":
+            if not graph.integer_weights:
+                raise ValueError("A bucket queue needs integer road weights")
+            return BucketQueue(graph.max_weight)
+        raise ValueError(f"Unknown priority queue type: {queue}")
+
+
+    def route_half_reconstruction(self, end: int, parents: list[int]) -> list[int]:
+        """
+        Description: 
+        Reconstructs a path from the given endpoint back to the start using the parent array, which is generated by Dijkstra's algorithm.
+        This method traces the shortest path in reverse, starting from the end location and following the predecessors 
+        recorded in the parents array until it reaches the starting location (where the parent is -1). The path is then reversed to 
+        give the correct order from start to end.
+
+        Input:
+            - end: The destination location for the path reconstruction.
+            - parents: The parent array, where each index stores the predecessor of the corresponding location.
+
+        Output:
+            - A list of vertices representing the reconstructed path.
+
+        Time complexity: O(|L|), where |L| is the number of locations traversed in the path.
+        - The method performs a reverse traversal of the parents array, which requires O(|L|) time, where |L| is the 
+          number of locations in the graph. In the worst case, the entire path from the start to the end needs to be traced, 
+          making the complexity O(|L|).
+
+        Space complexity: O(|L|)
+        - The size of the path list is at most O(|L|), as it includes all locations in the path from the start to the end.
+        - Therefore, the space complexity is O(|L|).
+        """
+        path = []
+        current = end
+        while current != -1:
+            path.append(current)
+            current = parents[current]
+        path.reverse()
+        return path
+
+    def route_full_reconstruction(self, start: int, pickup: int, destination: int) -> list[int]:
+        """
+        Description: 
+        Reconstructs the full route from the start location to the destination location, making a stop at the pickup location.
+        It combines two partial paths using the dijkstra method: one from start to the pickup location and another from pickup 
+        to the destination. Both are point to point queries, so each one runs a bidirectional search that stops once its two 
+        frontiers meet.
+
+        Input:
+            - start: The starting location of the path.
+            - pickup: The pickup location where a friend is picked up.
+            - destination: The final destination location of the path.
+
+        Output:
+            - A list of locations representing the full reconstructed path, including the pickup.
+
+        Time Complexity: O(|R| log |L|)
+        - Two calls to Dijkstra's algorithm dominate the time complexity.
+        - Dijkstra's algorithm runs twice, once from start to pickup and once from pickup to destination.
+        - These runs have a worst case complexity of O(|R| log |L|), where |R| is the number of roads (edges) and |L| 
+        is the number of locations (vertices).
+        - Reconstructing the paths is O(|L|), but this is dominated by the dijkstra method.
+        - Therefore, the overall time complexity is O(|R| log |L|).
+
+        Space Complexity: O(|R|)
+        - Two arrays (distance and parent) are used in Dijkstra's algorithm, each of size |R|.
+        - The priority queue (MinHeap) also stores up to |R| elements.
+        - The space required for storing the reconstructed path is proportional to the number of road.
+        - Overall, the space complexity is O(|R|).
+        """
+        route_half_1 = self.dijkstras(start_node=start, end_node=pickup)
+        route_half_2 = self.dijkstras(start_node=pickup, end_node=destination)
+
+        route_half_1.pop() # removing the pickup spot
+
+        route = route_half_1 + route_half_2
+
+        return route
+
+    def route_from_trees(self, pickup: int, start_parents: list[int], destination_parents: list[int]) -> list[int]:
+        """
+        Description: 
+        Reconstructs the full route from the start location to the destination location through the pickup location, using the 
+        two shortest path trees that plan already computed instead of running Dijkstra's algorithm again. Since the roads are 
+        undirected, following the destination tree's parent pointers from the pickup location leads along a shortest path to 
+        the destination.
+        - The start to pickup half is rebuilt backwards from the pickup in the tree rooted at the start.
+        - The pickup to destination half is walked forwards from the pickup in the tree rooted at the destination.
+
+        Input:
+            - pickup: The pickup location where a friend is picked up.
+            - start_parents: The parent array of Dijkstra's algorithm run from the start location.
+            - destination_parents: The parent array of Dijkstra's algorithm run from the destination location.
+
+        Output:
+            - A list of locations representing the full reconstructed path, including the pickup. Empty if pickup is None, 
+            when there is no pickup location at all.
+
+        Time complexity: O(|L|), where |L| is the number of locations.
+        - Each half follows at most |L| parent pointers.
+
+        Space complexity: O(|L|)
+        - The route holds at most 2|L| locations.
+        """
+        if pickup is None:
+            return []
+
+        route = self.route_half_reconstruction(end=pickup, parents=start_parents)
+
+        current = destination_parents[pickup]
+        while current != -1:
+            route.append(current)
+            current = destination_parents[current]
+
+        return route
+
+    def route_through_pickup(self, pickup: int, destination: int, start_parents: list[int], destination_parents: list[int], 
+                             tree_route: bool = False) -> list[int]:
+        """
+        Description:
+        Reconstructs the route of a plan from the start to the destination through the pickup location. The start to pickup 
+        half is rebuilt from the tree rooted at the start. The pickup to destination half is, by default, found with a 
+        search from the pickup that stops once the destination is settled, so it is exactly the path route_full_reconstruction 
+        takes, including the choice between roads of equal length. With tree_route it is walked up the destination tree 
+        instead, see route_from_trees, which needs no search but may pick another route of the same length.
+
+        Input:
+            - pickup: The pickup location.
+            - destination: The destination location.
+            - start_parents: The parent array of Dijkstra's algorithm run from the start location.
+            - destination_parents: The parent array of Dijkstra's algorithm run from the destination location.
+            - tree_route (optional): Whether to walk the destination tree instead of searching from the pickup.
+
+        Output:
+            - A list of locations representing the full route, including the pickup. The number of locations settled by the 
+            search from the pickup is stored in self.settled_count, 0 with tree_route.
+
+        Time complexity: O(|R| log |L|) for the search from the pickup, O(|L|) with tree_route.
+
+        Space complexity: O(|L|)
         """
-        # Insert the new element at the end of the heap
-        self.heap.append((value, priority)) # O(1)
-        # Move the new element to its correct position
-        self._heapify_up(len(self.heap) - 1)
+        if tree_route:
+            self.settled_count = 0
+            return self.route_from_trees(pickup=pickup, start_parents=start_parents, destination_parents=destination_parents)
 
-    def extract_min(self):
+        route = self.route_half_reconstruction(end=pickup, parents=start_parents)
+        _, pickup_parents = self.dijkstras(start_node=pickup, targets={destination})
+        route += self.route_half_reconstruction(end=destination, parents=pickup_parents)[1:] # the pickup is already in route
+        return route
+
+    def plan(self, start: int, destination: int, fused: bool = False, 
+             tree_route: bool = False) -> tuple[int, list, str, int]: # (total_time, route, pickup_friend, pickup_location)
         """
-        Function description: Extracts and returns the minimum element from the heap.
+        Description:
+        Plans a route from the start location to the destination, ensuring that a friend is picked up at the most suitable location
+        given the constraint that they can't travel more than max_hops train hops away from their starting location.
+        The method first identifies the potential pickup locations of each friend. It then uses Dijkstra's algorithm twice to 
+        calculate the shortest paths: once from the start and once from the destination, each search stopping as soon as every 
+        potential pickup location has been settled. It then finds the distance from the start to that pickup location and from the destination to that pickup location. As it checks all
+        combinations of potential pickup spots, it then compares this shortest distance value with the current shortest valid distance 
+        value, and if it calculates a new combination which has a shorter path, then it updates all the information to make this the
+        new shortest value. Finally, it reconstructs the complete route which includes the optimal pickup location with the 
+        route_through_pickup method: the start to pickup half comes from the parent array it already has, the pickup to 
+        destination half from a third search, from the pickup, that stops once the destination is settled. This keeps the 
+        route of the original implementation when several routes have the same length. With tree_route, the second half is 
+        walked up the destination tree instead, so one plan costs exactly two runs of dijkstras.
+
+        Input:
+            - start: The starting location.
+            - destination: The destination location.
+            - fused (optional): If True, the query is answered by fused_plan, a single search over the locations before and 
+              after the pickup that stops once the destination is reached, instead of the two searches below.
+            - tree_route (optional): If True, the route is rebuilt from the two trees alone, without the search from the 
+              pickup. The total time, friend and pickup stay the same, the route may be another one of the same length.
+
+        Output:
+            - A tuple containing:
+                - total_time: The total travel time for the journey.
+                - route: A list of locations representing the complete route, including the pickup.
+                - pickup_friend: The name of the friend being picked up.
+                - pickup_location: The location where the friend is picked up.
+            - (inf, [], None, None) if there is no friend to pick up, e.g. after every friend has been removed.
+
+        Time complexity: O(|R| log |L|)
+
+        - To begin with, this method gets the potential pickup locations of the friend(s) from the index the graph built when it 
+        was constructed, in O(1).
+        - It then performs two calls to Dijkstra's algorithm, each of which has a worst case time complexity of O(|R| log |L|), where:
+            - |R| is the number of roads (edges).
+            - |L| is the number of locations (vertices).
+        - Both calls stop once the furthest potential pickup location is settled, so pickups close to the start and the destination 
+        settle only a fraction of the graph.
+        - It then iterates through these pickup locations and performs simple arithmetic to check and update the shortest path if it 
+        finds one, which is done in O(C) for C potential pickup locations.
+        - After finding the shortest route, it reconstructs the path with one more search, from the pickup, of at most 
+        O(|R| log |L|), or by following the two parent arrays in O(|L|) with tree_route.
+        - Hence the total time complexity is O(3|R| log|L| + C + |L|).
+        - Since |R| >= |L| - 1, the term |R| log |L| dominates and the constant 3 can be removed.
+        - Therefore, the overall time complexity is O(|R| log |L|).
+
+        Space complexity: O(|R|)
         
+        - The Dijkstra's algorithm uses arrays of size |R| to store distances and parents.
+        - The reconstructed route and potential pickup locations also require space proportional to |R|.
+        - Therefore, the overall space complexity is O(|R|).
+        """
+        if fused:
+            return self.fused_plan(start, destination)
+        if self.has_hub_labels():
+            return self.plan_from_labels(start, destination)
+        if self.has_contraction_hierarchy():
+            return self.plan_from_contraction(start, destination)
+
+        potential_pickup_locations = self.pickup_candidates()
+
+        # both searches can stop once every potential pickup location is settled
+        pickup_targets = self.road_graph.pickup_locations
+
+        start_tree = self.dijkstras(start_node=start, targets=pickup_targets) # finding shortest distance from start to the pickups
+        settled_count = self.settled_count
+        destination_tree = self.dijkstras(start_node=destination, targets=pickup_targets) # finding shortest distance from destination to the pickups
+        settled_count += self.settled_count
+
+        result = self.plan_from_trees(start_tree, destination_tree, potential_pickup_locations, destination, tree_route)
+        self.settled_count += settled_count # plan reports the locations settled by every search
+        return result
+
+
+    def plan_top_k(self, start: int, destination: int, k: int, tree_route: bool = False) -> list[tuple[int, list, str, int, int]]:
+        """
+        Description:
+        Plans the k best pickup options for a journey instead of only the best one. Like plan, it runs Dijkstra's algorithm 
+        from the start and from the destination, each stopping once every potential pickup location is settled. Every 
+        potential pickup (friend, location) is an option, ranked like select_pickup ranks them: by total time, then by the 
+        friend's train hops, then by the order of pickup_candidates. The best k are kept in a bounded heap while the 
+        candidates are scanned, and only their routes are rebuilt, with route_through_pickup as plan rebuilds its route.
+
+        Input:
+            - start: The starting location.
+            - destination: The destination location.
+            - k: The number of options, at least 1.
+            - tree_route (optional): As in plan, the routes are rebuilt from the two trees alone.
+
+        Output:
+            - A list of at most k (total_time, route, pickup_friend, pickup_location, train_hops) tuples, best first. Options 
+            whose pickup cannot be reached from both ends are left out. The first option is the plan of plan.
+
+        Raises:
+            - ValueError: If k is less than 1.
+
+        Time complexity: O(k |R| log |L| + C log k)
+        - Two early exit Dijkstra searches, as in plan.
+        - One pass over the C potential pickups, each costing at most one O(log k) heap operation.
+        - k route reconstructions, each with an early exit search from its pickup, or O(|L|) with tree_route.
+
+        Space complexity: O(|L| + k |L|)
+        - The two trees, the heap of k options and the k routes.
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+
+        potential_pickup_locations = self.pickup_candidates()
+        pickup_targets = self.road_graph.pickup_locations
+
+        start_distances, start_parents = self.dijkstras(start_node=start, targets=pickup_targets)
+        settled_count = self.settled_count
+        destination_distances, destination_parents = self.dijkstras(start_node=destination, targets=pickup_targets)
+        settled_count += self.settled_count
+
+        # the k best options so far, the worst at the root: priorities are the negated (time, hops, rank) keys
+        best = MinHeap()
+        for rank, (friend, pickup, hops) in enumerate(potential_pickup_locations):
+            total_time = start_distances[pickup] + destination_distances[pickup]
+            if total_time == float('inf'):
+                continue
+            if len(best) < k:
+                best.insert(rank, (-total_time, -hops, -rank))
+            else:
+                best.push_pop(rank, (-total_time, -hops, -rank)) # drops the worst of the k + 1
+
+        winners = []
+        while not best.is_empty():
+            rank, _ = best.extract_min()
+            winners.append(rank)
+        winners.reverse() # best first
+
+        options = []
+        for rank in winners:
+            friend, pickup, hops = potential_pickup_locations[rank]
+            route = self.route_through_pickup(pickup, destination, start_parents, destination_parents, tree_route)
+            settled_count += self.settled_count
+            options.append((start_distances[pickup] + destination_distances[pickup], route, friend, pickup, hops))
+
+        self.settled_count = settled_count
+        return options
+
+
+    def fused_plan(self, start: int, destination: int) -> tuple[int, list, str, int]:
+        """
+        Description:
+        Answers a plan query with one Dijkstra search over a two layer graph instead of two searches. Every location appears 
+        twice, before the pickup (layer 0, state v) and after it (layer 1, state v + |L|). Both layers hold all the roads, 
+        and the only way from layer 0 to layer 1 is a free edge at each potential pickup location. The search starts at the 
+        start in layer 0 and stops as soon as the destination is settled in layer 1, so when the start, the destination and 
+        a pickup are close together it settles a small region instead of two searches reaching every pickup location.
+
+        To pick the same friend and pickup location as plan among pickups of equal total time, the priorities in layer 1 are 
+        (time, train hops, candidate rank) tuples, where the last two are fixed when the pickup edge is taken: among routes 
+        of equal time the search prefers the pickup with the fewest train hops, then the first one in pickup_candidates, 
+        exactly like select_pickup.
+
+        Input:
+            - start: The starting location.
+            - destination: The destination location.
+
+        Output:
+            - The (total_time, route, pickup_friend, pickup_location) tuple, as returned by plan. The total time, friend and 
+            pickup are the same as plan, the route may differ among routes of the same length. If the destination cannot be 
+            reached through any pickup, the route is empty.
+
+        Time complexity: O(|R| log |L|) in the worst case, two copies of the roads. Only the states closer than the 
+        destination's layer 1 distance are settled.
+
+        Space complexity: O(|L| + |R|)
+        """
+        n = len(self.road_graph)
+        adjacent = self.road_graph.adjacent
+
+        # the best pickup option at each location: the first of its candidates, which has the fewest train hops
+        crossing = {}
+        for rank, (friend, location, hops) in enumerate(self.pickup_candidates()):
+            if location not in crossing:
+                crossing[location] = (hops, rank, friend)
+
+        label = [None] * (2 * n) # (time, hops, rank) of the best route found to each state so far
+        parent = [-1] * (2 * n)
+        label[start] = (0, 0, 0)
+        priority_queue = MinHeap()
+        priority_queue.insert(start, label[start])
+        target = destination + n
+        settled_count = 0
+
+        while not priority_queue.is_empty():
+            state, key = priority_queue.extract_min()
+            if key > label[state]:
+                continue # stale entry
+            settled_count += 1
+            if state == target:
+                break
+
+            u = state - n if state >= n else state
+            offset = state - u # 0 in layer 0, n in layer 1
+            dist_u, hops, rank = key
+
+            if offset == 0 and u in crossing:
+                # the free pickup edge into layer 1, which fixes the tie breaking part of the priority
+                pickup_hops, pickup_rank, _ = crossing[u]
+                new_key = (dist_u, pickup_hops, pickup_rank)
+                if label[u + n] is None or new_key < label[u + n]:
+                    label[u + n] = new_key
+                    parent[u + n] = state
+                    priority_queue.insert(u + n, new_key)
+
+            for _, v, weight in adjacent(u):
+                new_key = (dist_u + weight, hops, rank)
+                if label[v + offset] is None or new_key < label[v + offset]:
+                    label[v + offset] = new_key
+                    parent[v + offset] = state
+                    priority_queue.insert(v + offset, new_key)
+
+        self.settled_count = settled_count
+
+        if label[target] is None:
+            # no route through a pickup, the pickup reported is the one select_pickup reports when every time is inf
+            if not crossing:
+                return float('inf'), [], None, None
+            hops, rank, friend = min(crossing.values())
+            return float('inf'), [], friend, self.pickup_candidates()[rank][1]
+
+        # walk back from the destination in layer 1, the layer changes at the pickup location
+        route = []
+        pickup_location = None
+        state = target
+        while state != -1:
+            location = state - n if state >= n else state
+            if route and route[-1] == location:
+                pickup_location = location # the pickup edge joins the two copies of the pickup location
+            else:
+                route.append(location)
+            state = parent[state]
+        route.reverse()
+
+        return label[target][0], route, crossing[pickup_location][2], pickup_location
+
+
+    def pickup_candidates(self) -> list[tuple[str, int, int]]:
+        """
+        Description:
+        Returns the potential pickup locations, every location that a friend can reach within max_hops train hops. The graph builds 
+        this index once, when it is constructed, so no location has to be scanned per query.
+
         Input: None
-        
+
         Output:
-            The minimum element (root of the heap).
-        
-        Time complexity: O(log N)
-        
-        Time complexity analysis: Extracting the minimum involves replacing the root with the last 
-        element O(1) and then performing a heapify-down operation O(log N).
-        
+            - A list of (friend, pickup_location, train_hops) tuples, in location order. It is shared, so it must not be modified.
+
+        Time complexity: O(1)
+
         Space complexity: O(1)
-        
-        Space complexity analysis: The space used is for the root element, and does not count towards auxiliary space complexity.
         """
-        if len(self.heap) == 0:
-            return None
-        if len(self.heap) == 1:
-            return self.heap.pop()
+        return self.road_graph.pickup_candidates
 
-        # The root of the heap (minimum element)
-        root = self.heap[0]
-        # Replace the root with the last element in the heap
-        self.heap[0] = self.heap.pop()
-        # Heapify down from the root to maintain the heap property
-        self._heapify_down(0)
 
-        return root
+    def plan_from_trees(self, start_tree: tuple[list,list], destination_tree: tuple[list,list], 
+                        potential_pickup_locations: list[tuple[str, int, int]], destination: int, 
+                        tree_route: bool = False) -> tuple[int, list, str, int]:
+        """
+        Description:
+        Picks the best pickup location for one plan query from the two shortest path trees of its endpoints, and rebuilds the 
+        route through it, see select_pickup and route_through_pickup. The number of locations settled to rebuild the route 
+        is stored in self.settled_count.
+
+        Input:
+            - start_tree: The (distance, parent) arrays of dijkstras run from the start location.
+            - destination_tree: The (distance, parent) arrays of dijkstras run from the destination location.
+            - potential_pickup_locations: The (friend, pickup_location, train_hops) tuples from pickup_candidates.
+            - destination: The destination location.
+            - tree_route (optional): See route_through_pickup.
 
-    def _heapify_up(self, i):
+        Output:
+            - The (total_time, route, pickup_friend, pickup_location) tuple, as returned by plan. (inf, [], None, None) if 
+            there are no potential pickup locations, e.g. after every friend has been removed.
+
+        Time complexity: O(C + |R| log |L|)
+        - One pass over the C potential pickup locations, then the search of route_through_pickup, O(|L|) with tree_route.
+
+        Space complexity: O(|L|)
+        - The reconstructed route.
         """
-        Function description: Moves the element at index i up the heap to its correct position to maintain the heap property.
-        
+        start_distances, start_parents = start_tree
+        destination_distances, destination_parents = destination_tree
+
+        final_total_time, pickup_friend, pickup_location = self.select_pickup(start_distances, destination_distances, 
+                                                                              potential_pickup_locations)
+
+        if pickup_location is None:
+            self.settled_count = 0
+            return final_total_time, [], None, None # no friend to pick up
+
+        # reconstructing the route, an unreachable pickup has no path to search for
+        tree_route = tree_route or final_total_time == float('inf')
+        route = self.route_through_pickup(pickup_location, destination, start_parents, destination_parents, tree_route)
+
+        return final_total_time, route, pickup_friend, pickup_location
+
+
+    def select_pickup(self, start_distances, destination_distances, 
+                      potential_pickup_locations: list[tuple[str, int, int]]) -> tuple[int, str, int]:
+        """
+        Description:
+        Picks the best pickup location from the distances of the start and the destination to every potential pickup 
+        location. A pickup is better if the total time is shorter, or equal with fewer train hops for the friend; among 
+        equal pickups the first one in potential_pickup_locations is kept.
+
         Input:
-            i: The index of the element to move up.
-        
-        Output: None
-        
-        Time complexity: O(log N)
-        
-        Time complexity analysis: The process of moving an element up involves potentially swapping it with its 
-        parent multiple times, which is logarithmic in terms of the number of elements.
-        
+            - start_distances: The travel time from the start to each potential pickup location, indexed by location.
+            - destination_distances: The travel time from the destination to each potential pickup location.
+            - potential_pickup_locations: The (friend, pickup_location, train_hops) tuples from pickup_candidates.
+
+        Output:
+            - The (total_time, pickup_friend, pickup_location) tuple, (inf, None, None) if no pickup can be reached.
+
+        Time complexity: O(C), for C potential pickup locations.
+
         Space complexity: O(1)
-        
-        Space complexity analysis: No additional space is used beyond the existing heap.
         """
-        # Checking if the index is greater than 0 and if the parent of our current priority is greater than the current priority itself 
-        # This ensures we are maintaining the minheap property.
+        # initialising final values
+        final_total_time = float('inf')
+        pickup_friend = None
+        pickup_location = None
+        final_pickup_trainhops = float('inf')
+
+        # Iterating through the potential combinations of pickup locations and updating accordingly
+        for friend, pickup, hops in potential_pickup_locations:
+            total_time = start_distances[pickup] + destination_distances[pickup]
+
+            if (total_time < final_total_time) or (total_time == final_total_time and hops < final_pickup_trainhops):
+                final_total_time = total_time
+                pickup_friend = friend
+                pickup_location = pickup
+                final_pickup_trainhops = hops
+
+        return final_total_time, pickup_friend, pickup_location
+
+
+    def plan_from_labels(self, start: int, destination: int) -> tuple[int, list, str, int]:
+        """
+        Description:
+        Answers a plan query with the hub labels instead of graph searches. d(start, p) + d(p, destination) is evaluated for 
+        every potential pickup location p from the labels alone: the labels of the start and the destination are turned into 
+        dictionaries once, and the label of each pickup location is looked up in them. Only the route through the chosen 
+        pickup is then searched for and unpacked, with two point to point dijkstras calls (answered by the contraction 
+        hierarchy when there is one).
 
-        while i > 0 and self.heap[self.parent(i)][1] > self.heap[i][1]: # O(log(N))
-            # Swapping with parent if the current element's priority is smaller
-            self.heap[i], self.heap[self.parent(i)] = self.heap[self.parent(i)], self.heap[i] # O(1)
-            i = self.parent(i)
+        Input:
+            - start: The starting location.
+            - destination: The destination location.
+
+        Output:
+            - The (total_time, route, pickup_friend, pickup_location) tuple, as returned by plan. The total time and pickup are 
+            the same as plan without the labels, the route may differ among routes of the same length.
 
-    def _heapify_down(self, i):
+        Time complexity: O(C M) for the lookups, where C is the number of potential pickup locations and M the largest 
+        label size, plus two point to point searches for the route.
+
+        Space complexity: O(M + |L|)
         """
-        Function description: Moves the element at index i down the heap to its correct position to maintain the heap property.
-        
+        labels = self.hub_labels
+        start_label = labels.label(start)
+        destination_label = labels.label(destination)
+
+        start_distances = {}
+        destination_distances = {}
+        for pickup in self.road_graph.pickup_locations:
+            start_distances[pickup] = labels.distance_from_label(start_label, pickup)
+            destination_distances[pickup] = labels.distance_from_label(destination_label, pickup)
+
+        final_total_time, pickup_friend, pickup_location = self.select_pickup(start_distances, destination_distances, 
+                                                                              self.pickup_candidates())
+
+        route = []
+        settled_count = 0
+        if final_total_time != float('inf'):
+            # the two halves share the pickup location
+            route = self.dijkstras(start_node=start, end_node=pickup_location)
+            settled_count = self.settled_count
+            route += self.dijkstras(start_node=pickup_location, end_node=destination)[1:]
+            settled_count += self.settled_count
+
+        self.settled_count = settled_count
+        return final_total_time, route, pickup_friend, pickup_location
+
+
+    def plan_from_contraction(self, start: int, destination: int) -> tuple[int, list, str, int]:
+        """
+        Description:
+        Answers a plan query with the contraction hierarchy instead of Dijkstra searches. The distances from the start and 
+        from the destination to every pickup location come from one upward search each, combined with the target buckets 
+        of the pickup locations (see ContractionHierarchy.one_to_many). Only the route through the chosen pickup is then 
+        found, with two point to point queries whose shortcuts are unpacked into roads.
+
         Input:
-            i: The index of the element to move down.
-        
+            - start: The starting location.
+            - destination: The destination location.
+
+        Output:
+            - The (total_time, route, pickup_friend, pickup_location) tuple, as returned by plan. The total time and pickup are 
+            the same as plan without the hierarchy, the route may differ among routes of the same length.
+
+        Time complexity: O(U log U + B + C + P), where U is the size of an upward search, B the number of bucket entries 
+        it meets, C the number of potential pickup locations and P the number of roads of the route.
+
+        Space complexity: O(U + C + P)
+        """
+        hierarchy = self.contraction
+        pickup_targets = self.road_graph.pickup_locations
+        if self.contraction_pickup_version != self.road_graph.pickup_version:
+            self.build_contraction_buckets() # the friends or tracks have changed
+
+        start_distances = hierarchy.one_to_many(start, self.contraction_buckets, pickup_targets)
+        settled_count = hierarchy.settled_count
+        destination_distances = hierarchy.one_to_many(destination, self.contraction_buckets, pickup_targets)
+        settled_count += hierarchy.settled_count
+
+        final_total_time, pickup_friend, pickup_location = self.select_pickup(start_distances, destination_distances, 
+                                                                              self.pickup_candidates())
+
+        route = []
+        if pickup_location is not None:
+            # the two halves share the pickup location
+            _, route = hierarchy.query(start, pickup_location)
+            settled_count += hierarchy.settled_count
+            _, second_half = hierarchy.query(pickup_location, destination)
+            settled_count += hierarchy.settled_count
+            route += second_half[1:]
+
+        self.settled_count = settled_count
+        return final_total_time, route, pickup_friend, pickup_location
+
+
+    def plan_many(self, queries: list[tuple[int, int]], workers: int = None, chunk_size: int = None, 
+                  tree_route: bool = False) -> list[tuple[int, list, str, int]]:
+        """
+        Description:
+        Answers a batch of plan queries. Every query needs the shortest path tree of its start and of its destination, and 
+        a tree only depends on the location it is grown from, so each distinct endpoint of the batch is searched once and 
+        its tree is shared by every query that starts or ends there. A tree is computed the first time a query needs it and 
+        dropped after the last query that uses it, so only the trees of endpoints that are still to come are kept in memory.
+
+        The pickup to destination half of each route comes from a search from the pickup, as in plan. The queries are 
+        grouped by pickup once every pickup is known, and one search per distinct pickup stops once all the destinations 
+        of its queries are settled. With tree_route, the routes are rebuilt from the endpoint trees alone, see plan.
+
+        With hub labels or a contraction hierarchy for the current roads, each query is answered by plan_from_labels or 
+        plan_from_contraction instead, whose lookups are too cheap to be worth sharing.
+
+        With workers, the batch is answered by a pool of that many worker processes instead, see parallel.parallel_plan_many. 
+        The graph is placed in shared memory once in the snapshot format, every worker reads it in place, and the queries 
+        are sent to the workers in chunks of consecutive queries. Only the roads, tracks and friends are shared: each worker 
+        answers its chunks with the shared endpoint trees above, without this city's hub labels, contraction hierarchy or 
+        tree cache. The snapshot format needs integer road weights below 2^31 and integer track weights (see 
+        snapshot.can_snapshot), for any other graph workers is ignored and the batch is answered in this process.
+
+        Input:
+            - queries: A list of (start, destination) tuples.
+            - workers (optional): The number of worker processes, None to answer the batch in this process.
+            - chunk_size (optional): The number of queries sent to a worker at a time, about 4 chunks per worker by default.
+            - tree_route (optional): As in plan.
+
+        Output:
+            - A list with the (total_time, route, pickup_friend, pickup_location) tuple of each query, in input order. The 
+            total time, friend and pickup of each result are the same as calling plan on that query with the same tree_route, 
+            and so is the route in this process. With workers on a city that has hub labels, a contraction hierarchy or a tree cache, the route 
+            may differ from plan's among routes of the same length, since the workers search without them.
+
+        Time complexity: O((E + P) |R| log |L| + Q |L|), where:
+            - E is the number of distinct endpoints in the batch.
+            - P is the number of distinct pickup locations chosen, 0 with tree_route.
+            - Q is the number of queries.
+        - One Dijkstra search per distinct endpoint and per distinct pickup instead of three per query.
+        - The candidate scan and route reconstruction for each query.
+
+        Space complexity: O(E |L| + Q |L|)
+        - In the worst case every endpoint's tree is still needed, plus the returned routes.
+        """
+        if workers is not None and can_snapshot(self.road_graph):
+            results, self.settled_count = parallel_plan_many(self, queries, workers, chunk_size, tree_route)
+            return results
+
+        if self.has_hub_labels() or self.has_contraction_hierarchy():
+            results = []
+            settled_count = 0
+            for start, destination in queries:
+                results.append(self.plan(start, destination, tree_route=tree_route))
+                settled_count += self.settled_count
+            self.settled_count = settled_count
+            return results
+
+        potential_pickup_locations = self.pickup_candidates()
+        pickup_targets = self.road_graph.pickup_locations
+
+        # the index of the last query that uses each endpoint
+        last_use = {}
+        for i, (start, destination) in enumerate(queries):
+            last_use[start] = i
+            last_use[destination] = i
+
+        trees = {}
+        settled_count = 0
+        results = []
+        waiting = {} # pickup -> the queries whose route still needs its pickup to destination half
+
+        for i, (start, destination) in enumerate(queries):
+            for endpoint in (start, destination):
+                if endpoint not in trees:
+                    trees[endpoint] = self.dijkstras(start_node=endpoint, targets=pickup_targets)
+                    settled_count += self.settled_count
+
+            (start_distances, start_parents), (destination_distances, _) = trees[start], trees[destination]
+            total_time, pickup_friend, pickup_location = self.select_pickup(start_distances, destination_distances, 
+                                                                            potential_pickup_locations)
+            if tree_route or total_time == float('inf'):
+                results.append(self.plan_from_trees(trees[start], trees[destination], potential_pickup_locations, 
+                                                    destination, tree_route=True))
+            else:
+                route = self.route_half_reconstruction(end=pickup_location, parents=start_parents)
+                results.append((total_time, route, pickup_friend, pickup_location))
+                waiting.setdefault(pickup_location, []).append(i)
+
+            # drop the trees that no later query needs
+            for endpoint in (start, destination):
+                if last_use.get(endpoint) == i:
+                    del trees[endpoint]
+                    del last_use[endpoint]
+
+        # one search per distinct pickup completes the routes of all its queries, as route_through_pickup does for one
+        for pickup_location, indices in waiting.items():
+            _, pickup_parents = self.dijkstras(start_node=pickup_location, targets={queries[i][1] for i in indices})
+            settled_count += self.settled_count
+            for i in indices:
+                route = results[i][1]
+                route += self.route_half_reconstruction(end=queries[i][1], parents=pickup_parents)[1:]
+
+        self.settled_count = settled_count # locations settled by every search of the batch
+        return results
+
+
+
+    def distance_matrix(self, sources: list[int], targets: list[int] = None, workers: int = None, chunk_size: int = None, 
+                        symmetric: bool = True) -> list[array]:
+        """
+        Description:
+        Computes the travel time from every source to every target. One Dijkstra search is run per distinct source, and each 
+        search stops as soon as every target it is needed for has been settled, so only the part of the city closer than 
+        the furthest target is explored and no full distance list is kept.
+
+        The roads are undirected, so the time from a to b is the time from b to a. When the sources and the targets are the 
+        same set of locations (and symmetric is True), the search from the i-th distinct source only needs the sources after 
+        it, the entries before it being known from the earlier searches. This halves the entries searched for, and the last 
+        source needs no search at all.
+
+        Input:
+            - sources: The start locations, one row each.
+            - targets (optional): The destination locations, one column each. The sources by default.
+            - workers (optional): The number of worker processes computing rows in parallel, see parallel.run_in_workers. 
+              None to compute every row in this process.
+            - chunk_size (optional): The number of rows sent to a worker at a time.
+            - symmetric (optional): Whether to use the symmetry of the roads when sources and targets are the same set.
+
+        Output:
+            - The matrix, as one array('d') row per source: matrix[i][j] is the travel time from sources[i] to targets[j], 
+            inf if it cannot be reached. self.settled_count holds the number of locations settled by all the searches.
+
+        Time complexity: O(S |R| log |L| + S T), where S is the number of distinct sources and T the number of targets.
+        - One early exit search per distinct source, and O(1) per entry of the matrix.
+
+        Space complexity: O(|L| + S T)
+        - One search at a time, plus the matrix.
+        """
+        if targets is None:
+            targets = sources
+
+        unique_sources = list(dict.fromkeys(sources))
+        unique_targets = list(dict.fromkeys(targets))
+        symmetric = symmetric and set(unique_sources) == set(unique_targets)
+
+        # each job is a source and the targets its search has to settle
+        if symmetric:
+            jobs = [(source, unique_sources[i + 1:]) for i, source in enumerate(unique_sources[:-1])]
+        else:
+            jobs = [(source, unique_targets) for source in unique_sources]
+
+        if workers is None:
+            rows = []
+            settled_count = 0
+            for source, job_targets in jobs:
+                rows.append(self.distance_row(source, job_targets))
+                settled_count += self.settled_count
+        else:
+            rows, settled_count = parallel_distance_rows(self, jobs, workers, chunk_size)
+
+        travel_time = {} # (source, target) -> travel time
+        for (source, job_targets), row in zip(jobs, rows):
+            for target, time in zip(job_targets, row):
+                travel_time[source, target] = time
+                if symmetric:
+                    travel_time[target, source] = time
+
+        self.settled_count = settled_count
+        return [array('d', [0 if source == target else travel_time[source, target] for target in targets]) 
+                for source in sources]
+
+
+    def distance_row(self, source: int, targets: list[int]) -> list:
+        """
+        Description:
+        Returns the travel times from source to each of the targets, with a search that stops once they are all settled, or 
+        from the hub labels without any search when they are current.
+
+        Input:
+            - source: The start location.
+            - targets: The destination locations.
+
+        Output:
+            - The travel time to each target, in order, inf for those that cannot be reached.
+
+        Time complexity: O(|R| log |L|) in the worst case, see dijkstras.
+
+        Space complexity: O(|L|)
+        """
+        if self.has_hub_labels():
+            self.settled_count = 0
+            label = self.hub_labels.label(source)
+            return [self.hub_labels.distance_from_label(label, target) for target in targets]
+
+        distance, _ = self.dijkstras(start_node=source, targets=targets)
+        return [distance[target] for target in targets]
+
+
+    @classmethod
+    def from_iterables(cls, roads, tracks, friends, max_hops: int = 2, cache_entries: int = None, 
+                       cache_bytes: int = None) -> "CityMap":
+        """
+        Description:
+        Builds a city from iterables of roads, tracks and friends, e.g. generators reading them from a database, without ever 
+        holding them as lists of tuples. The edges are streamed in chunks into EdgeColumns, three arrays of 32 bit integers, 
+        from which the csr backend is built directly. The columns are dropped once the graph is built, so the peak memory 
+        is about the size of the CSR arrays plus 12 bytes per road.
+
+        Input:
+            - roads: An iterable of (start_vertex, end_vertex, weight) tuples with integer weights, it is read once.
+            - tracks: An iterable of (start_vertex, end_vertex, weight) tuples with integer weights, it is read once.
+            - friends: An iterable of (friend_name, location) tuples.
+            - max_hops, cache_entries, cache_bytes (optional): See __init__.
+
+        Output:
+            - The CityMap, using the csr backend. It plans exactly like CityMap(roads, tracks, friends, backend="csr").
+
+        Time complexity: O(|R| + |T| + |F|), see CSRGraph.
+
+        Space complexity: O(|L| + |R| + |T| + |F|)
+        """
+        road_columns = EdgeColumns()
+        road_columns.extend(roads)
+        track_columns = EdgeColumns()
+        track_columns.extend(tracks)
+        return cls.from_columns(road_columns, track_columns, list(friends), max_hops, cache_entries, cache_bytes)
+
+
+    @classmethod
+    def from_files(cls, roads_path: str, tracks_path: str, friends_path: str, max_hops: int = 2, 
+                   cache_entries: int = None, cache_bytes: int = None) -> "CityMap":
+        """
+        Description:
+        Builds a city straight from its files, streaming them in chunks like from_iterables. See loader.read_edges and 
+        loader.read_friends for the file formats: roads and tracks are CSV files of start,end,weight lines or .bin files of 
+        32 bit integer triples, friends are CSV files of name,location lines.
+
+        Input:
+            - roads_path, tracks_path, friends_path: The files to read.
+            - max_hops, cache_entries, cache_bytes (optional): See __init__.
+
+        Output:
+            - The CityMap, using the csr backend.
+
+        Raises:
+            - ValueError: If a file is malformed.
+
+        Time complexity: O(|R| + |T| + |F|)
+
+        Space complexity: O(|L| + |R| + |T| + |F|)
+        """
+        return cls.from_columns(read_edges(roads_path), read_edges(tracks_path), read_friends(friends_path), 
+                                max_hops, cache_entries, cache_bytes)
+
+
+    @classmethod
+    def from_columns(cls, roads: EdgeColumns, tracks: EdgeColumns, friends: list[tuple[str, int]], max_hops: int, 
+                     cache_entries: int, cache_bytes: int) -> "CityMap":
+        """
+        Description:
+        Builds a city using the csr backend from roads and tracks already read into EdgeColumns.
+
+        Input:
+            - roads, tracks: The EdgeColumns of the roads and tracks.
+            - friends: List of tuples (friend_name, location).
+            - max_hops, cache_entries, cache_bytes: See __init__.
+
+        Output:
+            - The CityMap.
+
+        Time complexity: O(|R| + |T| + |F|)
+
+        Space complexity: O(|L| + |R|)
+        """
+        city = cls.__new__(cls)
+        city.road_graph = CSRGraph(roads, tracks, friends, max_hops)
+        city.init_search_state(cache_entries, cache_bytes)
+        return city
+
+
+    def save(self, path: str) -> None:
+        """
+        Description:
+        Saves the city to a binary snapshot file, see snapshot.save_snapshot for the format. CityMap.load can then rebuild the 
+        city without parsing the roads again.
+
+        Input:
+            - path: The file to write.
+
         Output: None
-        
-        Time complexity: O(log N)
-        
-        Time complexity analysis: The process of moving an element down involves potentially swapping it 
-        with its children multiple times, which is logarithmic in terms of the number of elements.
-        
-        Space complexity: O(1)
-        
-        Space complexity analysis: No additional space is used beyond the existing heap.
+
+        Raises:
+            - ValueError: If the city has fractional road or track weights.
+
+        Time complexity: O(|L| + |R| + |T| + |F| + P), where P is the number of pickup candidates.
+
+        Space complexity: O(|L| + |R|) for the list backend, O(|T| + |F| + P) for the csr backend.
         """
-        # Move the element at index i down the heap to its correct position
-        current_smallest_index = i
-        left_child_index = self.left_child(i)
-        right_child_index = self.right_child(i)
+        save_snapshot(self.road_graph, path)
 
-        # Checking if left_child_index and right_child_index children exist and if so checking if their value is smaller than our current smallest value
-        # If both these conditions are true then we swap these two indices so that minheap is maintained
 
-        if left_child_index < len(self.heap) and self.heap[left_child_index][1] < self.heap[current_smallest_index][1]:
-            current_smallest_index = left_child_index # O(1)
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, cache_entries: int = None, cache_bytes: int = None) -> "CityMap":
+        """
+        Description:
+        Loads a city saved with CityMap.save. The loaded city uses the csr backend. With mmap, its road arrays are read straight 
+        from the memory mapped file, so worker processes loading the same snapshot share one page cached copy of the roads and 
+        start without building any per road objects.
+
+        Input:
+            - path: The snapshot file.
+            - mmap (optional): Whether to memory map the file rather than read it into memory, True by default.
+            - cache_entries, cache_bytes (optional): The limits of the TreeCache, see __init__.
+
+        Output:
+            - The loaded CityMap, it plans exactly like the city that was saved.
+
+        Raises:
+            - ValueError: If the file is not a snapshot or has an unsupported format version.
 
-        if right_child_index < len(self.heap) and self.heap[right_child_index][1] < self.heap[current_smallest_index][1]:
-            current_smallest_index = right_child_index # O(1)
+        Time complexity: O(|L| + |T| + |F| + P), see snapshot.load_snapshot.
+
+        Space complexity: O(|L| + |T| + |F| + P)
+        """
+        city = cls.__new__(cls)
+        city.road_graph = load_snapshot(path, use_mmap=mmap)
+        city.init_search_state(cache_entries, cache_bytes)
+        return city
 
-        if current_smallest_index != i:
-            # Swap and continue heapifying down
-            self.heap[i], self.heap[current_smallest_index] = self.heap[current_smallest_index], self.heap[i]
-            self._heapify_down(current_smallest_index) # recursive call O(log(N))
 
-    def is_empty(self):
-        return len(self.heap) == 0
\ No newline at end of file
+    def __str__(self) -> str:
+        """
+        Function description: Returns a string representation of the graph, showing each vertex and its edges.
+
+        Input: None
+
+        Output:
+            A string representation of the graph.
+
+        Time complexity: O(|R|)
+
+        Time complexity analysis: Each vertex and its list of edges in the road graph are iterated over to build the string.
+
+        Space complexity: O(|R|)
+        
+        Space complexity analysis: The space used for the result list is the number of elements in the road graph.
+        """
+        result = []
+        for i, edges in enumerate(self.road_graph.get_graph()):
+            result.append(f"Vertex {i}: {edges}")
+        return "\n".join(result)
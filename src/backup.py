@@ -1,10 +1,11 @@
 from minheap import MinHeap
 class CityMap:
-    def __init__(self, roads: list[tuple[int,int,int]], tracks: list[tuple[int,int,int]], friends: list[tuple[int,str]]) -> None:
+    def __init__(self, roads: list[tuple[int,int,int]], tracks: list[tuple[int,int,int]], friends: list[tuple[int,str]], max_hops: int = 2) -> None:
         # define the roads, tracks and friends inputs as class variables 
         self.roads = roads
         self.tracks = tracks
         self.friends = friends
+        self.max_hops = max_hops # the largest number of train hops a friend can take
 
         size_initialisation = len(self.roads) + 1 # O(|R|) + O(1) => O(|R|)
 
@@ -56,7 +57,7 @@ class CityMap:
             for v, weight, edge_type in self.adj_list[u]: 
                 if edge_type_input == edge_type: # making sure to traverse the roads and tracks separately
 
-                    if edge_type == "T" and train_hops[u] < 2: # checking if the pickup node in within 2 nodes distance
+                    if edge_type == "T" and train_hops[u] < self.max_hops: # checking if the pickup node in within max_hops nodes distance
                         if distance[u] + weight < distance[v]:
                             distance[v] = distance[u] + weight
                             parent[v] = u
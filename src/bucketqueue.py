@@ -0,0 +1,128 @@
+from collections import deque
+
+
+class BucketQueue:
+    """
+    The BucketQueue class implements a monotone priority queue for non-negative integer priorities (Dial's algorithm).
+    It relies on two properties of Dijkstra's algorithm with integer road weights of at most max_weight:
+    - the extracted priorities never decrease, and
+    - every queued priority lies between the last extracted priority and that priority plus max_weight.
+    Hence max_weight + 1 buckets used as a circular array are enough, bucket p % (max_weight + 1) holds the values with
+    priority p. Inserting is O(1) and extracting only scans forward over empty buckets, with no comparisons between
+    queued values.
+
+    Like the MinHeap, the queue is lazy: updating a value that is already queued inserts a second copy with the lower
+    priority, and the caller skips the stale copy when it is extracted.
+    """
+    def __init__(self, max_weight: int):
+        """
+        Function description: Initialises an empty queue with max_weight + 1 buckets.
+
+        Input:
+            max_weight: The largest road weight of the graph being searched.
+
+        Output: None
+
+        Time and space complexity: O(C), where C is max_weight.
+        """
+        self.buckets = [deque() for _ in range(max_weight + 1)] # first in, first out within a bucket
+        self.bucket_count = max_weight + 1
+        self.current = 0 # the smallest priority that can still be in the queue
+        self.size = 0
+
+    def insert(self, value, priority: int) -> None:
+        """
+        Function description: Inserts a value with the given priority.
+
+        Input:
+            value: The value to insert.
+            priority: The priority of the value, between the last extracted priority (0 before the first extraction) and that 
+            priority plus max_weight.
+
+        Output: None
+
+        Time and space complexity: O(1)
+        """
+        self.buckets[priority % self.bucket_count].append(value)
+        self.size += 1
+
+    def update(self, value, priority: int) -> None:
+        """
+        Function description: Inserts a value, or lowers its priority if it is already queued. The queue is lazy, so this is
+        the same as insert and the old copy becomes stale.
+
+        Input:
+            value: The value to insert.
+            priority: The priority of the value.
+
+        Output: None
+
+        Time and space complexity: O(1)
+        """
+        self.insert(value, priority)
+
+    def peek(self):
+        """
+        Function description: Returns the minimum element without removing it from the queue.
+
+        Input: None
+
+        Output:
+            The (value, priority) tuple with the smallest priority, or None if the queue is empty.
+
+        Time complexity: O(C) in the worst case, amortised over the scan of extract_min.
+
+        Space complexity: O(1)
+        """
+        if self.size == 0:
+            return None
+        self._advance()
+        return self.buckets[self.current % self.bucket_count][0], self.current
+
+    def extract_min(self):
+        """
+        Function description: Extracts and returns an element with the smallest priority.
+
+        Input: None
+
+        Output:
+            The (value, priority) tuple with the smallest priority, or None if the queue is empty.
+
+        Time complexity: O(C) in the worst case
+
+        Time complexity analysis: Empty buckets are skipped until the next non-empty one. Since the priorities never
+        decrease, each bucket position is skipped at most once per priority value, so a whole search costs O(|R| + D)
+        where D is the largest distance found.
+
+        Space complexity: O(1)
+        """
+        if self.size == 0:
+            return None
+        self._advance()
+        self.size -= 1
+        return self.buckets[self.current % self.bucket_count].popleft(), self.current
+
+    def _advance(self) -> None:
+        """
+        Function description: Moves current forward to the first non-empty bucket. The queue must not be empty.
+
+        Input: None
+
+        Output: None
+
+        Time complexity: O(C)
+
+        Space complexity: O(1)
+        """
+        buckets = self.buckets
+        bucket_count = self.bucket_count
+        current = self.current
+        while not buckets[current % bucket_count]:
+            current += 1
+        self.current = current
+
+    def is_empty(self) -> bool:
+        return self.size == 0
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,406 @@
+from src.minheap import MinHeap
+
+
+class ContractionHierarchy:
+    """
+    Class description:
+    A Contraction Hierarchies index of a road graph. Every location is given a rank, and the locations are contracted
+    (removed) from the graph in rank order. Contracting v adds a shortcut u - w, with weight d(u, v) + d(v, w), between any
+    two remaining neighbours of v whose shortest path runs through v, so the distances between the remaining locations do
+    not change. A shortcut remembers the location it skips, so paths can be unpacked back into roads.
+
+    Every shortest path then has a version that only goes up in rank and then down, so a point to point query is a
+    bidirectional Dijkstra that only follows roads and shortcuts to higher ranked locations ("upward") from both ends.
+    These upward searches settle a few hundred locations even on very large road networks.
+
+    The roads are undirected, so a single upward adjacency serves both directions of the query.
+    """
+    def __init__(self, graph, witness_settle_limit: int = 50) -> None:
+        """
+        Function description: Builds the index: orders the locations by a lazily updated priority and contracts them.
+
+        The priority of a location is its edge difference (the shortcuts its contraction would add minus the roads it
+        would remove) plus the number of its neighbours already contracted, which keeps the hierarchy shallow and the
+        contractions spread over the graph. Priorities change as neighbours are contracted, so a location taken from the
+        queue has its priority recomputed and is only contracted if it is still the smallest.
+
+        Whether a shortcut u - w is needed is decided by a witness search, a Dijkstra search from u that avoids v and
+        settles at most witness_settle_limit locations. If it finds no path from u to w as short as the one through v, the
+        shortcut is added. Giving up early only adds unnecessary shortcuts, it never loses a distance.
+
+        Input:
+            graph: A Graph or CSRGraph.
+            witness_settle_limit (optional): The most locations a witness search settles.
+
+        Output: None
+
+        Time complexity: O(|L| D^2 W log W) in practice, where D is the degree of a location when it is contracted and W
+        is witness_settle_limit. There is no useful worst case bound, the number of shortcuts depends on the ordering.
+
+        Space complexity: O(|L| + |R| + S), where S is the number of shortcuts.
+        """
+        n = len(graph)
+        self.version = graph.version
+        self.witness_settle_limit = witness_settle_limit
+
+        # adjacency of the graph that is left, neighbours[v][w] = (weight, middle), middle being -1 for an original road
+        neighbours = [{} for _ in range(n)]
+        for u in range(n):
+            for _, v, weight in graph.adjacent(u):
+                if v != u and (v not in neighbours[u] or weight < neighbours[u][v][0]):
+                    neighbours[u][v] = (weight, -1)
+        self.neighbours = neighbours
+
+        self.rank = [0] * n
+        self.up = [None] * n # up[v][w] = (weight, middle) for the roads and shortcuts from v to higher ranked w
+        self.shortcut_count = 0
+        contracted_neighbours = [0] * n
+
+        queue = MinHeap()
+        for v in range(n):
+            queue.insert(v, self.priority(v, contracted_neighbours))
+
+        next_rank = 0
+        while not queue.is_empty():
+            v, _ = queue.extract_min()
+
+            # lazy update: contract v only if its current priority is still the smallest
+            current = self.priority(v, contracted_neighbours)
+            if not queue.is_empty() and current > queue.peek()[1]:
+                queue.insert(v, current)
+                continue
+
+            self.rank[v] = next_rank
+            next_rank += 1
+            for w in neighbours[v]:
+                contracted_neighbours[w] += 1
+            self.contract(v)
+
+        del self.neighbours
+
+
+    def shortcuts(self, v: int) -> list[tuple[int, int, int]]:
+        """
+        Function description: Finds the shortcuts that contracting v would add to the remaining graph.
+
+        Input:
+            v: A location that has not been contracted.
+
+        Output:
+            The list of (u, w, weight) shortcuts, one per needed pair u < w of remaining neighbours.
+
+        Time complexity: O(D^2 + D W log W), D witness searches of at most W settled locations.
+
+        Space complexity: O(D^2)
+        """
+        around = self.neighbours[v]
+        result = []
+        for u, (weight_u, _) in around.items():
+            # the furthest the witness search from u ever needs to look
+            limit = weight_u + max((weight for w, (weight, _) in around.items() if w != u), default=0)
+            witness = self.witness_search(u, v, limit)
+            for w, (weight_w, _) in around.items():
+                if w > u and witness.get(w, float('inf')) > weight_u + weight_w:
+                    result.append((u, w, weight_u + weight_w))
+        return result
+
+
+    def witness_search(self, source: int, avoid: int, limit) -> dict[int, int]:
+        """
+        Function description: A Dijkstra search over the remaining graph from source that never enters avoid, stops once
+        the closest queued location is further than limit, and settles at most witness_settle_limit locations.
+
+        Input:
+            source: The location to search from.
+            avoid: The location being contracted.
+            limit: The largest distance of interest.
+
+        Output:
+            A dictionary from each reached location to the distance found, an upper bound for the locations not settled.
+
+        Time complexity: O(W D log W), where W is witness_settle_limit.
+
+        Space complexity: O(W D)
+        """
+        distance = {source: 0}
+        queue = MinHeap()
+        queue.insert(source, 0)
+        settled = 0
+
+        while not queue.is_empty() and settled < self.witness_settle_limit:
+            u, dist_u = queue.extract_min()
+            if dist_u > distance[u]:
+                continue
+            if dist_u > limit:
+                break
+            settled += 1
+            for v, (weight, _) in self.neighbours[u].items():
+                if v != avoid and dist_u + weight < distance.get(v, float('inf')):
+                    distance[v] = dist_u + weight
+                    queue.insert(v, dist_u + weight)
+
+        return distance
+
+
+    def priority(self, v: int, contracted_neighbours: list[int]) -> int:
+        """
+        Function description: The contraction priority of v, smaller is contracted first: the number of shortcuts its
+        contraction adds, minus the number of roads it removes, plus the number of its neighbours already contracted.
+
+        Input:
+            v: A location that has not been contracted.
+            contracted_neighbours: The number of contracted neighbours of each location.
+
+        Output:
+            The priority.
+
+        Time complexity: See shortcuts.
+
+        Space complexity: See shortcuts.
+        """
+        return len(self.shortcuts(v)) - len(self.neighbours[v]) + contracted_neighbours[v]
+
+
+    def contract(self, v: int) -> None:
+        """
+        Function description: Contracts v: its remaining roads become its upward roads, the shortcuts it needs are added
+        between its neighbours and it is removed from the remaining graph.
+
+        Input:
+            v: The location with the next rank.
+
+        Output: None
+
+        Time complexity: See shortcuts.
+
+        Space complexity: O(D^2)
+        """
+        neighbours = self.neighbours
+        for u, w, weight in self.shortcuts(v):
+            if w not in neighbours[u] or weight < neighbours[u][w][0]:
+                neighbours[u][w] = (weight, v)
+                neighbours[w][u] = (weight, v)
+                self.shortcut_count += 1
+
+        self.up[v] = neighbours[v]
+        for w in neighbours[v]:
+            del neighbours[w][v]
+        neighbours[v] = None
+
+
+    def upward_search(self, source: int) -> tuple[dict, dict]:
+        """
+        Function description: A complete Dijkstra search from source over the upward roads and shortcuts only.
+
+        Input:
+            source: The location to search from.
+
+        Output:
+            The distance and parent dictionaries of the locations reached, parent[v] being the location v was reached from.
+
+        Time complexity: O(U log U), where U is the size of the upward search space of source, typically a few hundred.
+
+        Space complexity: O(U)
+        """
+        distance = {source: 0}
+        parent = {source: -1}
+        queue = MinHeap()
+        queue.insert(source, 0)
+        up = self.up
+
+        while not queue.is_empty():
+            u, dist_u = queue.extract_min()
+            if dist_u > distance[u]:
+                continue
+            for v, (weight, _) in up[u].items():
+                if dist_u + weight < distance.get(v, float('inf')):
+                    distance[v] = dist_u + weight
+                    parent[v] = u
+                    queue.insert(v, dist_u + weight)
+
+        return distance, parent
+
+
+    def query(self, start: int, end: int) -> tuple[int, list[int]]:
+        """
+        Function description: Finds the shortest path between two locations with a bidirectional upward search. Each side
+        stops once its closest queued location is at least as far as the best path found, and the path is unpacked into
+        roads.
+
+        Input:
+            start: The starting location.
+            end: The destination location.
+
+        Output:
+            The length of the shortest path and the path as a list of locations, (inf, []) if end cannot be reached.
+
+        Time complexity: O(U log U) for the searches plus O(P) to unpack a path of P roads.
+
+        Space complexity: O(U + P)
+        """
+        up = self.up
+        distance = ({start: 0}, {end: 0})
+        parent = ({start: -1}, {end: -1})
+        queues = (MinHeap(), MinHeap())
+        queues[0].insert(start, 0)
+        queues[1].insert(end, 0)
+
+        best = 0 if start == end else float('inf')
+        meeting = start if start == end else -1
+        self.settled_count = 0
+
+        while True:
+            # advance the side whose closest queued location is closer, while it can still improve best
+            sides = [side for side in (0, 1) if not queues[side].is_empty() and queues[side].peek()[1] < best]
+            if not sides:
+                break
+            side = min(sides, key=lambda s: queues[s].peek()[1])
+
+            u, dist_u = queues[side].extract_min()
+            if dist_u > distance[side][u]:
+                continue
+            self.settled_count += 1
+
+            other = distance[1 - side]
+            if u in other and dist_u + other[u] < best:
+                best = dist_u + other[u]
+                meeting = u
+
+            side_distance = distance[side]
+            for v, (weight, _) in up[u].items():
+                if dist_u + weight < side_distance.get(v, float('inf')):
+                    side_distance[v] = dist_u + weight
+                    parent[side][v] = u
+                    queues[side].insert(v, dist_u + weight)
+
+        if meeting == -1:
+            return float('inf'), []
+
+        # start -> meeting -> end in the hierarchy, then every shortcut is unpacked
+        forward = []
+        current = meeting
+        while current != -1:
+            forward.append(current)
+            current = parent[0][current]
+        forward.reverse()
+        current = parent[1][meeting]
+        while current != -1:
+            forward.append(current)
+            current = parent[1][current]
+
+        return best, self.unpack(forward)
+
+
+    def one_to_many(self, source: int, buckets: dict[int, list[tuple[int, int]]], targets) -> dict[int, int]:
+        """
+        Function description: Finds the distances from source to many targets at once. The buckets hold, for every location
+        x, the (target, distance) pairs of the targets whose upward search reaches x, see target_buckets. The shortest path
+        to a target meets its upward search at the highest ranked location on it, so the distance to target is the
+        smallest d(source, x) + d(x, target) over the locations x reached by the upward search from source.
+
+        Input:
+            source: The location to search from.
+            buckets: The buckets of the targets, from target_buckets.
+            targets: The targets.
+
+        Output:
+            A dictionary from each target to its distance from source, inf if it cannot be reached.
+
+        Time complexity: O(U log U + B), where B is the number of bucket entries at the locations reached.
+
+        Space complexity: O(U + |targets|)
+        """
+        result = dict.fromkeys(targets, float('inf'))
+        distance, _ = self.upward_search(source)
+        self.settled_count = len(distance)
+        for x, dist_x in distance.items():
+            for target, to_target in buckets.get(x, ()):
+                if dist_x + to_target < result[target]:
+                    result[target] = dist_x + to_target
+        return result
+
+
+    def target_buckets(self, targets) -> dict[int, list[tuple[int, int]]]:
+        """
+        Function description: Runs the upward search of every target and files each location it reaches under that
+        location, for one_to_many. They only depend on the targets, so they can be reused for every source.
+
+        Input:
+            targets: The target locations.
+
+        Output:
+            A dictionary from each location x to the list of (target, d(x, target)) pairs.
+
+        Time complexity: O(T U log U), for T targets.
+
+        Space complexity: O(T U)
+        """
+        buckets = {}
+        for target in targets:
+            distance, _ = self.upward_search(target)
+            for x, dist_x in distance.items():
+                buckets.setdefault(x, []).append((target, dist_x))
+        return buckets
+
+
+    def unpack(self, path: list[int]) -> list[int]:
+        """
+        Function description: Replaces every shortcut of a path in the hierarchy by the roads it stands for.
+
+        Input:
+            path: A path whose consecutive locations are joined by a road or a shortcut.
+
+        Output:
+            The same path, with consecutive locations joined by roads.
+
+        Time complexity: O(P), where P is the number of roads of the unpacked path.
+
+        Space complexity: O(P)
+        """
+        result = path[:1]
+        for a, b in zip(path, path[1:]):
+            # unpack the edge a - b depth first, with a stack instead of recursion
+            stack = [(a, b)]
+            while stack:
+                u, w = stack.pop()
+                middle = self.middle(u, w)
+                if middle == -1:
+                    result.append(w)
+                else:
+                    stack.append((middle, w))
+                    stack.append((u, middle))
+        return result
+
+
+    def middle(self, u: int, w: int) -> int:
+        """
+        Function description: The location a shortcut between u and w skips, -1 if they are joined by a road. The edge is
+        stored as an upward edge of its lower ranked end.
+
+        Input:
+            u, w: The ends of a road or shortcut of the hierarchy.
+
+        Output:
+            The skipped location, or -1.
+
+        Time and space complexity: O(1)
+        """
+        if self.rank[u] < self.rank[w]:
+            return self.up[u][w][1]
+        return self.up[w][u][1]
+
+
+    def edge_count(self) -> int:
+        """
+        Function description: The number of upward roads and shortcuts stored, which is the size of the index.
+
+        Input: None
+
+        Output:
+            The number of edges.
+
+        Time complexity: O(|L|)
+
+        Space complexity: O(1)
+        """
+        return sum(len(edges) for edges in self.up)
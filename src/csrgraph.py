@@ -0,0 +1,332 @@
+from array import array
+
+from src.trainnetwork import TrainNetwork
+
+
+WEIGHT_LIMIT = 2 ** 31 # road weights are stored as 32 bit signed integers
+
+
+class CSRGraph:
+    """
+    Class description:
+    This class stores the same roads, tracks and friends information as the Graph class, but keeps the road network in
+    compressed sparse row (CSR) form instead of a list of lists of tuples. The roads leaving vertex u are stored in the
+    flat arrays targets[offsets[u]:offsets[u + 1]] and weights[offsets[u]:offsets[u + 1]]. Every directed edge therefore
+    costs two machine integers instead of a tuple object, and the roads of one vertex sit next to each other in memory.
+
+    The roads of each vertex are stored in the same order as the Graph class stores them, so shortest path searches over
+    both backends relax roads in the same order and break ties the same way.
+
+    The weights array holds 32 bit signed integers, so unlike the Graph class the road weights must be integers between
+    -2^31 and 2^31 - 1. Roads with other weights are rejected with a ValueError.
+    """
+    def __init__(self, roads, tracks, friends, max_hops: int = 2) -> None:
+        """
+        Function description: Initialises the CSR arrays from the roads with a counting sort on the start vertex of each
+        directed edge, and records the friend pickup information for each location.
+
+        Input:
+            roads: List of tuples (start_vertex, end_vertex, weight) representing roads.
+            tracks: List of tuples (start_vertex, end_vertex, weight) representing tracks.
+            friends: List of tuples (friend_name, location) representing friends and their locations.
+            max_hops (optional): The largest number of train hops a friend can take to a pickup location, 2 by default.
+
+        Output: None
+
+        Time complexity: O(|R| + |T|)
+
+        Time complexity analysis:
+        - O(|R|) to count the degree of every vertex, O(|L|) for the prefix sums and O(|R|) to place every directed edge.
+        - O(|T|) to iterate over the tracks and update the train hops, as in the Graph class.
+
+        Space complexity: O(|R|)
+
+        Space complexity analysis: offsets holds |L| + 1 integers, targets and weights hold 2|R| integers each.
+
+        Raises:
+            - ValueError: If a road weight is not an integer that fits in 32 bits.
+        """
+        self.vertex_count = 1
+        for u, v, _ in roads:
+            self.vertex_count = max(self.vertex_count, u + 1, v + 1)
+        for _, location in friends:
+            self.vertex_count = max(self.vertex_count, location + 1)
+
+        self.build_csr(roads)
+        self.tracks = tracks
+        self.friends = friends
+        self.max_hops = max_hops
+        self.version = 0 # incremented whenever the graph is modified, so that caches built on it can tell they are out of date
+        self.pickup_version = 0 # incremented whenever the friends or tracks change, the roads stay the same
+
+        # friend_info[v] is the (friend, location, hops) tuple of the friend with the fewest train hops that can be picked up at v
+        self.friend_info = [(None, float('inf'), float('inf'))] * self.vertex_count
+        self.add_friend_locations(tracks, friends)
+        self.build_pickup_candidates()
+
+
+    @classmethod
+    def from_arrays(cls, offsets, targets, weights, max_weight: int, tracks, friends, max_hops: int,
+                    pickup_candidates: list[tuple[str, int, int]]) -> "CSRGraph":
+        """
+        Function description: Builds a graph around existing CSR arrays and pickup candidates, without touching the roads.
+        Used to load snapshots, where the arrays are memory mapped views of the file.
+
+        Input:
+            offsets, targets, weights: The CSR arrays, anything that can be indexed and sliced like an array of integers.
+            max_weight: The largest road weight.
+            tracks: List of tuples (start_vertex, end_vertex, weight) representing tracks.
+            friends: List of tuples (friend_name, location) representing friends and their locations.
+            max_hops: The largest number of train hops a friend can take to a pickup location.
+            pickup_candidates: The (friend, location, hops) pickup options, ordered as build_pickup_candidates orders them.
+
+        Output:
+            The new CSRGraph. It has no train_network, the pickup information comes from pickup_candidates.
+
+        Time complexity: O(|L| + P)
+
+        Space complexity: O(|L| + P)
+        """
+        graph = cls.__new__(cls)
+        graph.vertex_count = len(offsets) - 1
+        graph.offsets = offsets
+        graph.targets = targets
+        graph.weights = weights
+        graph.max_weight = max_weight
+        graph.integer_weights = True # snapshots only store 32 bit integer weights, see snapshot.save_snapshot
+        graph.tracks = tracks
+        graph.friends = friends
+        graph.max_hops = max_hops
+        graph.version = 0
+        graph.train_network = None
+
+        # the first candidate of each location is the one with the fewest train hops
+        graph.friend_info = [(None, float('inf'), float('inf'))] * graph.vertex_count
+        for candidate in reversed(pickup_candidates):
+            graph.friend_info[candidate[1]] = candidate
+
+        graph.pickup_candidates = pickup_candidates
+        graph.pickup_locations = set(location for _, location, _ in pickup_candidates)
+        graph.pickup_version = 0
+        return graph
+
+
+    def build_csr(self, roads) -> None:
+        """
+        Function description: Builds the offsets, targets and weights arrays from the roads. Every road is stored once in
+        each direction since the roads are undirected. Also records the largest road weight.
+
+        Input:
+            roads: List of tuples (start_vertex, end_vertex, weight) representing roads.
+
+        Output: None
+
+        Raises:
+            - ValueError: If a road weight is not an integer that fits in 32 bits.
+
+        Time complexity: O(|L| + |R|)
+
+        Space complexity: O(|L| + |R|)
+        """
+        n = self.vertex_count
+
+        # offsets[u + 1] first counts the degree of u, the prefix sum then turns the counts into start positions
+        offsets = array('q', bytes(8 * (n + 1)))
+        for u, v, _ in roads:
+            offsets[u + 1] += 1
+            offsets[v + 1] += 1
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+
+        targets = array('i', bytes(4 * offsets[n]))
+        weights = array('i', bytes(4 * offsets[n]))
+        cursor = offsets[:-1] # next free slot of each vertex
+        max_weight = 0
+
+        for u, v, weight in roads:
+            if not isinstance(weight, int) or not -WEIGHT_LIMIT <= weight < WEIGHT_LIMIT:
+                raise ValueError(f"Road {u} - {v} has weight {weight!r}, the csr backend needs 32 bit integer weights")
+            if weight > max_weight:
+                max_weight = weight
+
+            i = cursor[u]
+            targets[i] = v
+            weights[i] = weight
+            cursor[u] = i + 1
+
+            i = cursor[v]
+            targets[i] = u
+            weights[i] = weight
+            cursor[v] = i + 1
+
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.max_weight = max_weight # largest road weight, used to size bucket queues
+        self.integer_weights = True # the weights array only holds integers, checked above
+
+
+    def add_friend_locations(self, tracks, friends) -> None:
+        """
+        Function description: Records the valid pickup locations of friends within max_hops train hops of their starting
+        location with a TrainNetwork, in the same way as Graph.add_friend_locations.
+
+        Input:
+            tracks: List of tuples (start_vertex, end_vertex, weight) representing tracks.
+            friends: List of tuples (friend_name, location) representing friends and their locations.
+
+        Output: None
+
+        Time complexity: O(|T| + |F| + P), where P is the number of (friend, location) pickup pairs.
+
+        Space complexity: O(|T| + P)
+        """
+        self.train_network = TrainNetwork(tracks, friends, self.max_hops)
+
+        for location in self.train_network.pickups:
+            if location < self.vertex_count:
+                self.friend_info[location] = self.train_network.best_pickup(location)
+
+
+    def build_pickup_candidates(self) -> None:
+        """
+        Function description: Builds the pickup candidate index in the same way as Graph.build_pickup_candidates.
+
+        Input: None
+
+        Output: None
+
+        Time complexity: O(P log P), where P is the number of pickup options.
+
+        Space complexity: O(P)
+        """
+        self.pickup_candidates = [] # (friend, location, hops) tuples in location order
+        for friend, location, hops in self.train_network.candidates():
+            if location < self.vertex_count:
+                self.pickup_candidates.append((friend, location, hops))
+
+        self.pickup_locations = set(location for _, location, _ in self.pickup_candidates)
+
+
+    def update_pickups(self, touched: set[int]) -> None:
+        """
+        Function description: Brings the pickup information up to date after the train network changed a friend or a 
+        track: the best pickup stored in friend_info, the pickup candidates and their locations, for the touched locations 
+        only. The friends and tracks attributes become live views of the train network's.
+
+        Input:
+            touched: The locations whose pickup options changed, as reported by the TrainNetwork.
+
+        Output: None
+
+        Time complexity: O(|touched| (k + log P)), see TrainNetwork.update_candidates.
+
+        Space complexity: O(k) per touched location.
+        """
+        network = self.train_network
+        network.update_candidates(self.pickup_candidates, self.pickup_locations, touched, self.vertex_count)
+        for location in touched:
+            if location < self.vertex_count:
+                self.friend_info[location] = self.train_network.best_pickup(location) or (None, float('inf'), float('inf'))
+
+        self.friends = network.friends.values()
+        self.tracks = network.tracks.values()
+        self.pickup_version += 1
+
+
+    def adjacent(self, u: int):
+        """
+        Function description: Returns the roads leaving vertex u as (u, v, weight) tuples, read in place from u's range of
+        the CSR arrays without copying it. The search loop of CityMap.dijkstras indexes the arrays itself instead.
+
+        Input:
+            u: The vertex whose roads are returned.
+
+        Output:
+            An iterator of (u, v, weight) tuples, one for each road leaving u.
+
+        Time complexity: O(deg(u))
+
+        Space complexity: O(1)
+        """
+        targets = self.targets
+        weights = self.weights
+        for i in range(self.offsets[u], self.offsets[u + 1]):
+            yield u, targets[i], weights[i]
+
+
+    def get_graph(self) -> "CSRAdjacencyView":
+        """
+        Function description: Returns a read only view that can be indexed like the adjacency list of the Graph class,
+        so code written against Graph.get_graph keeps working with this backend.
+
+        Input: None
+
+        Output:
+            A CSRAdjacencyView of this graph.
+
+        Time complexity: O(1)
+
+        Space complexity: O(1)
+        """
+        return CSRAdjacencyView(self)
+
+
+    def __len__(self) -> int:
+        """
+        Function description: Returns the number of vertices in the graph.
+
+        Input: None
+
+        Output:
+            The number of vertices in the graph.
+
+        Time complexity: O(1)
+
+        Space complexity: O(1)
+        """
+        return self.vertex_count
+
+
+    def __str__(self) -> str:
+        """
+        Function description: Returns a string representation of the graph, in the same format as the Graph class.
+
+        Input: None
+
+        Output:
+            A string representation of the graph.
+
+        Time complexity: O(|R|)
+
+        Space complexity: O(|R|)
+        """
+        result = []
+        for i, edges in enumerate(self.get_graph()):
+            result.append(f"Vertex {i}: {edges}")
+        return "\n".join(result)
+
+
+
+class CSRAdjacencyView:
+    """
+    Class description:
+    A read only, list like view of a CSRGraph. Indexing vertex u builds the same [edges, (friend, location, hops)] pair
+    that the Graph class stores for u, on demand, from the CSR arrays.
+    """
+    def __init__(self, graph: CSRGraph) -> None:
+        self.graph = graph
+
+    def __getitem__(self, u: int) -> list:
+        if u < 0:
+            u += len(self.graph)
+        if not 0 <= u < len(self.graph):
+            raise IndexError("vertex index out of range")
+        return [list(self.graph.adjacent(u)), self.graph.friend_info[u]]
+
+    def __len__(self) -> int:
+        return len(self.graph)
+
+    def __iter__(self):
+        for u in range(len(self.graph)):
+            yield self[u]
@@ -1,21 +1,25 @@
+from src.trainnetwork import TrainNetwork
+
+
 class Graph:
     """  
     Class description: 
     This class represents a graph with roads, tracks, and friends. It is designed to take an input of roads, tracks and friends and 
     make a graph data structure in an efficient way which enables a traversal to find the shortest path given that a friend
-    needs to be picked up within 2 train hops of their starting location. The graph is stored as an adjacency list, where vertices 
+    needs to be picked up within max_hops train hops (2 by default) of their starting location. The graph is stored as an adjacency list, where vertices 
     represent locations, and edges represent connections between locations (roads). 
     """
-    def __init__(self, roads, tracks, friends) -> None:
+    def __init__(self, roads, tracks, friends, max_hops: int = 2) -> None:
         """
         Function description: Initialises the graph with roads, tracks, and friends data. It constructs the road graph
         using an adjacency list and associates friends with their respective locations, also updating train hops for valid 
-        locations that are within 2 train stops.
+        locations that are within max_hops train stops.
 
         Input:
             roads: List of tuples (start_vertex, end_vertex, weight) representing roads.
             tracks: List of tuples (start_vertex, end_vertex, weight) representing tracks.
             friends: List of tuples (friend_name, location) representing friends and their locations.
+            max_hops (optional): The largest number of train hops a friend can take to a pickup location, 2 by default.
         
         Output: None
 
@@ -41,6 +45,9 @@ class Graph:
         self.roads = roads
         self.tracks = tracks
         self.friends = friends
+        self.max_hops = max_hops
+        self.version = 0 # incremented whenever the graph is modified, so that caches built on it can tell they are out of date
+        self.pickup_version = 0 # incremented whenever the friends or tracks change, the roads stay the same
 
         size_initialisation = len(roads) + 1  # Adjust size based on the number of roads and locations
 
@@ -50,6 +57,7 @@ class Graph:
         self.add_edges_undirected()  # Add the undirected roads to the graph
         self.add_friend_locations()  # Update the graph with friend locations and their train hops
         self.filter_graph()  # Remove any unconnected vertices from the graph
+        self.build_pickup_candidates()  # Index the locations where a friend can be picked up
 
 
     def add_edges_undirected(self) -> None:
@@ -62,6 +70,8 @@ class Graph:
         - For each road, the method adds the edge to the adjacency list of the start vertex.
         - It then adds the reverse of the same edge to the adjacency list of the end vertex, 
         ensuring that both directions are accounted for in the undirected graph.
+        - It also records the largest road weight and whether every weight is an integer, which decides whether 
+        a bucket queue can be used for the shortest path searches.
 
         Input: 
             - None
@@ -79,25 +89,37 @@ class Graph:
         Space Complexity Analysis:
         - No additional space is used beyond updating the existing graph structure.
         """
+        max_weight = 0
+        integer_weights = True
+
         for edge in self.roads:
             start_vertex, end_vertex, weight = edge
 
             self.road_graph[start_vertex][0].append((start_vertex, end_vertex, weight))
             self.road_graph[end_vertex][0].append((end_vertex, start_vertex, weight))
 
+            if weight > max_weight:
+                max_weight = weight
+            if integer_weights and not isinstance(weight, int):
+                integer_weights = False
+
+        self.max_weight = max_weight # largest road weight, used to size bucket queues
+        self.integer_weights = integer_weights # bucket queues need integer weights
+
 
     def add_friend_locations(self) -> None:
         """
         Description: 
         This method updates the graph to reflect the valid pickup locations of friends by calculating the number of train hops 
-        needed to reach other locations within 2 train stops. It works by:
+        needed to reach other locations within max_hops train stops. It works by:
         
-        1. Assigning each friend to their starting location in the graph with 0 train hops.
-        2. Iterating over all the tracks and checking if there's a friend at the start of each track.
-        3. If a friend is found, the method checks whether reaching the destination location via this track 
-        would reduce the number of train hops.
-        4. If the new number of train hops (current + 1) is less than 2 and less than the existing hops at the 
-        destination, it updates the destination with the friend's name and the updated train hops.
+        1. Building a TrainNetwork, which indexes the tracks leaving each location and runs a breadth first search from 
+        every friend's starting location, one train hop (frontier) at a time, up to max_hops hops.
+        2. Recording, for every location reached, each (friend, hops) pair with the fewest hops that friend needs.
+        3. Storing at each such location the pickup with the fewest train hops (the earliest given friend among equals) 
+        in the adjacency list, where it was stored before.
+
+        Since the search follows the tracks out of each location, the result does not depend on the order of the tracks.
 
         Input: 
             - None 
@@ -105,32 +127,48 @@ class Graph:
         Output:
             - None
 
-        Time Complexity: O(|T| + |F|), where:
+        Time Complexity: O(|T| + |F| + P), where:
             - |T| is the number of tracks.
             - |F| is the number of friends.
+            - P is the number of (friend, location) pickup pairs found, see TrainNetwork.
 
         Time Complexity Analysis:
-            - O(|F|) when looping through self.friends and assigning each friend to their starting location.
-            - O(|T|) when iterating over all tracks and updating train hops.
+            - O(|T|) to index the tracks leaving each location.
+            - O(|F| + P) for the breadth first searches of all friends.
 
-        Space Complexity: O(1)
+        Space Complexity: O(|T| + P)
         
         Space Complexity Analysis:
-            - The method uses no extra space, as it only updates the existing graph data.
+            - The track index and the pickup pairs of the TrainNetwork.
         """
-        # Assign each friend to their initial location with 0 train hops
-        for friend, location in self.friends:
-            self.road_graph[location][1] = (friend, location, 0)  # Update friend's info at their starting location
+        self.train_network = TrainNetwork(self.tracks, self.friends, self.max_hops)
+
+        # Store the pickup with the fewest train hops at each location reached by a friend
+        for location in self.train_network.pickups:
+            if location < len(self.road_graph):
+                self.road_graph[location][1] = self.train_network.best_pickup(location)
+
+
+    def build_pickup_candidates(self) -> None:
+        """
+        Function description: Builds the pickup candidate index: every (friend, location, hops) pickup option found by the 
+        TrainNetwork, ordered by location, then train hops, then the order the friends were given in, and the set of those 
+        locations.
+
+        Input: None
 
-        # Iterate over all tracks to update train hops based on friends' locations
-        for start_vertex, end_vertex, weight in self.tracks:
-            friend_name = self.road_graph[start_vertex][1][0]  # Get the friend's name at the start vertex
-            start_hops = self.road_graph[start_vertex][1][2]   # Get current hops at the start vertex
-            end_hops = self.road_graph[end_vertex][1][2]       # Get current hops at the end vertex
+        Output: None
+
+        Time complexity: O(P log P), where P is the number of pickup options.
+
+        Space complexity: O(P)
+        """
+        self.pickup_candidates = [] # (friend, location, hops) tuples in location order
+        for friend, location, hops in self.train_network.candidates():
+            if location < len(self.road_graph):
+                self.pickup_candidates.append((friend, location, hops))
 
-            # If there's a friend at the start vertex and the path to the end vertex has fewer hops, update it
-            if (friend_name is not None) and (start_hops + 1 <= 2) and (start_hops + 1 < end_hops):
-                self.road_graph[end_vertex][1] = (friend_name, end_vertex, start_hops + 1)  # Update destination with friend and hops
+        self.pickup_locations = set(location for _, location, _ in self.pickup_candidates)
 
 
     def filter_graph(self) -> None:
@@ -155,6 +193,206 @@ class Graph:
             self.road_graph.pop()
 
 
+    def add_road(self, u: int, v: int, weight) -> None:
+        """
+        Function description: Adds the road u - v to the adjacency list in place, in both directions, and increments the 
+        graph's version.
+
+        Input:
+            u, v: The ends of the road, two different existing locations.
+            weight: The travel time of the road.
+
+        Output: None
+
+        Raises:
+            ValueError: If a location does not exist, u == v, or the road already exists (use update_road).
+
+        Time complexity: O(deg(u) + deg(v)), to check the road does not exist yet.
+
+        Space complexity: O(1)
+        """
+        self.check_road_ends(u, v)
+        if self.road_weight(u, v) is not None:
+            raise ValueError(f"The road {u} - {v} already exists")
+
+        self.road_graph[u][0].append((u, v, weight))
+        self.road_graph[v][0].append((v, u, weight))
+        self.note_weight(weight)
+        self.version += 1
+
+
+    def update_road(self, u: int, v: int, weight):
+        """
+        Function description: Changes the travel time of the road u - v in place, in both directions, and increments the 
+        graph's version.
+
+        Input:
+            u, v: The ends of the road.
+            weight: The new travel time of the road.
+
+        Output:
+            The previous travel time of the road.
+
+        Raises:
+            ValueError: If a location does not exist or there is no road u - v.
+
+        Time complexity: O(deg(u) + deg(v))
+
+        Space complexity: O(1)
+        """
+        self.check_road_ends(u, v)
+        old_weight = self.road_weight(u, v)
+        if old_weight is None:
+            raise ValueError(f"There is no road {u} - {v}")
+
+        for a, b in ((u, v), (v, u)):
+            edges = self.road_graph[a][0]
+            for i, (_, target, _) in enumerate(edges):
+                if target == b:
+                    edges[i] = (a, b, weight)
+                    break
+        self.note_weight(weight)
+        self.version += 1
+        return old_weight
+
+
+    def remove_road(self, u: int, v: int):
+        """
+        Function description: Removes the road u - v from the adjacency list in place, in both directions, and increments 
+        the graph's version. The locations themselves stay, even without roads.
+
+        Input:
+            u, v: The ends of the road.
+
+        Output:
+            The travel time of the removed road.
+
+        Raises:
+            ValueError: If a location does not exist or there is no road u - v.
+
+        Time complexity: O(deg(u) + deg(v))
+
+        Space complexity: O(1)
+        """
+        self.check_road_ends(u, v)
+        old_weight = self.road_weight(u, v)
+        if old_weight is None:
+            raise ValueError(f"There is no road {u} - {v}")
+
+        for a, b in ((u, v), (v, u)):
+            edges = self.road_graph[a][0]
+            for i, (_, target, _) in enumerate(edges):
+                if target == b:
+                    edges.pop(i)
+                    break
+        self.version += 1
+        return old_weight
+
+
+    def road_weight(self, u: int, v: int):
+        """
+        Function description: Returns the travel time of the road u - v.
+
+        Input:
+            u, v: The ends of the road.
+
+        Output:
+            The travel time, or None if there is no such road.
+
+        Time complexity: O(deg(u))
+
+        Space complexity: O(1)
+        """
+        for _, target, weight in self.road_graph[u][0]:
+            if target == v:
+                return weight
+        return None
+
+
+    def check_road_ends(self, u: int, v: int) -> None:
+        """
+        Function description: Checks that u and v can be the ends of a road: two different locations of the graph.
+
+        Input:
+            u, v: The ends of the road.
+
+        Output: None
+
+        Raises:
+            ValueError: If they cannot.
+
+        Time and space complexity: O(1)
+        """
+        for location in (u, v):
+            if not 0 <= location < len(self.road_graph):
+                raise ValueError(f"Unknown location {location}")
+        if u == v:
+            raise ValueError(f"A road cannot start and end at location {u}")
+
+
+    def note_weight(self, weight) -> None:
+        """
+        Function description: Updates the largest road weight and the integer weights flag for a road given a new weight. 
+        Neither is lowered when a road gets shorter or is removed, so max_weight stays an upper bound, which is all a 
+        bucket queue needs.
+
+        Input:
+            weight: The travel time of the new or updated road.
+
+        Output: None
+
+        Time and space complexity: O(1)
+        """
+        if weight > self.max_weight:
+            self.max_weight = weight
+        if not isinstance(weight, int):
+            self.integer_weights = False
+
+
+    def update_pickups(self, touched: set[int]) -> None:
+        """
+        Function description: Brings the pickup information up to date after the train network changed a friend or a 
+        track: the best pickup stored in the adjacency list, the pickup candidates and their locations, for the touched locations 
+        only. The friends and tracks attributes become live views of the train network's.
+
+        Input:
+            touched: The locations whose pickup options changed, as reported by the TrainNetwork.
+
+        Output: None
+
+        Time complexity: O(|touched| (k + log P)), see TrainNetwork.update_candidates.
+
+        Space complexity: O(k) per touched location.
+        """
+        network = self.train_network
+        network.update_candidates(self.pickup_candidates, self.pickup_locations, touched, len(self.road_graph))
+        for location in touched:
+            if location < len(self.road_graph):
+                self.road_graph[location][1] = self.train_network.best_pickup(location) or (None, float('inf'), float('inf'))
+
+        self.friends = network.friends.values()
+        self.tracks = network.tracks.values()
+        self.pickup_version += 1
+
+
+    def adjacent(self, u: int) -> list[tuple[int,int,int]]:
+        """
+        Function description: Returns the roads leaving vertex u. This is the accessor used by the shortest path searches, 
+        so that they work the same way over this adjacency list and over the CSRGraph backend.
+
+        Input:
+            u: The vertex whose roads are returned.
+
+        Output:
+            A list of (u, v, weight) tuples, one for each road leaving u.
+
+        Time complexity: O(1)
+
+        Space complexity: O(1)
+        """
+        return self.road_graph[u][0]
+
+
     def get_graph(self) -> list:
         """
         Function description: Returns the graph's adjacency list structure.
@@ -0,0 +1,236 @@
+import struct
+from array import array
+
+
+MAGIC = b"CITYHUB\0"
+FORMAT_VERSION = 1
+
+# magic, format version, location count, label entry count
+HEADER = struct.Struct("<8sIqq")
+
+
+class HubLabels:
+    """
+    Class description:
+    A 2-hop hub labelling of a road graph. Every location v has a label, a list of (hub, d(v, hub)) entries, such that for
+    any two locations s and t some hub on a shortest path between them is in both labels. The travel time from s to t is
+    then the smallest d(s, hub) + d(hub, t) over the hubs the two labels share, found by merging the two labels, which are
+    sorted by hub. No graph search is needed.
+
+    The labels are built from a contraction hierarchy: the label of v is its upward search space, computed from the
+    labels of its upward neighbours in decreasing rank order, and pruned of the entries that are not exact distances. The
+    roads are undirected, so one label per location serves both directions.
+
+    The labels of all locations are stored back to back in flat arrays, in CSR form: the entries of v are
+    hubs[offsets[v]:offsets[v + 1]] and distances[offsets[v]:offsets[v + 1]].
+    """
+    def __init__(self, offsets: array, hubs: array, distances: array, version: int = 0) -> None:
+        """
+        Function description: Wraps label arrays that have already been computed, see from_hierarchy and load.
+
+        Input:
+            offsets: |L| + 1 offsets into hubs and distances.
+            hubs: The hubs of each label, in increasing order.
+            distances: The distance from the location to each hub.
+            version (optional): The version of the graph the labels were computed on.
+
+        Output: None
+
+        Time and space complexity: O(1)
+        """
+        self.offsets = offsets
+        self.hubs = hubs
+        self.distances = distances
+        self.version = version
+
+
+    @classmethod
+    def from_hierarchy(cls, hierarchy, version: int = 0) -> "HubLabels":
+        """
+        Function description: Computes the labels from a contraction hierarchy. The locations are labelled from the highest
+        rank down, the label of v being {(v, 0)} together with, for each upward edge (v, w, weight), the label of w with
+        weight added, keeping the shortest distance per hub. An entry (hub, d) is then pruned if the labels already show a
+        shorter path from v to hub, through another hub of v. The entry of the highest ranked location of a shortest path
+        is always exact, so it is never pruned and the labels still cover every pair.
+
+        Input:
+            hierarchy: A ContractionHierarchy.
+            version (optional): The version of the graph the hierarchy was built on.
+
+        Output:
+            The HubLabels.
+
+        Time complexity: O(|L| M^2) in the worst case, where M is the largest label size (typically a few hundred).
+
+        Space complexity: O(|L| M)
+        """
+        n = len(hierarchy.rank)
+        by_rank = sorted(range(n), key=hierarchy.rank.__getitem__, reverse=True)
+        labels = [None] * n # labels[v] is a dictionary from hub to distance while building
+
+        for v in by_rank:
+            label = {v: 0}
+            for w, (weight, _) in hierarchy.up[v].items():
+                for hub, to_hub in labels[w].items():
+                    if weight + to_hub < label.get(hub, float('inf')):
+                        label[hub] = weight + to_hub
+
+            # prune the entries that another hub of v gives a shorter path to, the hub's own label is already final
+            pruned = {v: 0}
+            for hub, to_hub in label.items():
+                if hub != v and all(label.get(other, float('inf')) + via >= to_hub for other, via in labels[hub].items()):
+                    pruned[hub] = to_hub
+            labels[v] = pruned
+
+        offsets = array('q', [0])
+        hubs = array('i')
+        distances = array('q')
+        for v in range(n):
+            for hub in sorted(labels[v]):
+                hubs.append(hub)
+                distances.append(labels[v][hub])
+            offsets.append(len(hubs))
+
+        return cls(offsets, hubs, distances, version)
+
+
+    def distance(self, u: int, v: int) -> tuple[int, int]:
+        """
+        Function description: Finds the travel time between two locations by merging their labels.
+
+        Input:
+            u, v: The two locations.
+
+        Output:
+            The travel time and the hub it goes through, (inf, -1) if v cannot be reached from u.
+
+        Time complexity: O(M), the size of the two labels.
+
+        Space complexity: O(1)
+        """
+        hubs = self.hubs
+        distances = self.distances
+        i, i_end = self.offsets[u], self.offsets[u + 1]
+        j, j_end = self.offsets[v], self.offsets[v + 1]
+
+        best = float('inf')
+        meeting = -1
+        while i < i_end and j < j_end:
+            if hubs[i] < hubs[j]:
+                i += 1
+            elif hubs[i] > hubs[j]:
+                j += 1
+            else:
+                if distances[i] + distances[j] < best:
+                    best = distances[i] + distances[j]
+                    meeting = hubs[i]
+                i += 1
+                j += 1
+        return best, meeting
+
+
+    def label(self, v: int) -> dict[int, int]:
+        """
+        Function description: Returns the label of a location as a dictionary from hub to distance, to look one label up
+        against many others.
+
+        Input:
+            v: The location.
+
+        Output:
+            The label.
+
+        Time and space complexity: O(M)
+        """
+        lo, hi = self.offsets[v], self.offsets[v + 1]
+        return dict(zip(self.hubs[lo:hi], self.distances[lo:hi]))
+
+
+    def distance_from_label(self, label: dict[int, int], v: int):
+        """
+        Function description: The travel time between the location whose label is given and v, by looking every entry of
+        the label of v up in it.
+
+        Input:
+            label: A label returned by label.
+            v: The other location.
+
+        Output:
+            The travel time, inf if there is no common hub.
+
+        Time complexity: O(M)
+
+        Space complexity: O(1)
+        """
+        best = float('inf')
+        lo, hi = self.offsets[v], self.offsets[v + 1]
+        for hub, to_hub in zip(self.hubs[lo:hi], self.distances[lo:hi]):
+            through_hub = label.get(hub)
+            if through_hub is not None and through_hub + to_hub < best:
+                best = through_hub + to_hub
+        return best
+
+
+    def save(self, path: str) -> None:
+        """
+        Function description: Writes the labels to a binary file: a header, then the offsets, hubs and distances arrays, in
+        the byte order of this machine.
+
+        Input:
+            path: The file to write.
+
+        Output: None
+
+        Time and space complexity: O(|L| M)
+        """
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(self.offsets) - 1, len(self.hubs)))
+            self.offsets.tofile(file)
+            self.hubs.tofile(file)
+            self.distances.tofile(file)
+
+
+    @classmethod
+    def load(cls, path: str, graph) -> "HubLabels":
+        """
+        Function description: Reads labels written by save.
+
+        Input:
+            path: The file to read.
+            graph: The graph the labels will be used on, its number of locations must match the file.
+
+        Output:
+            The HubLabels, considered up to date with the graph's current version.
+
+        Raises:
+            ValueError: If the file is not a hub label file, is truncated or was computed for a graph with a different
+            number of locations.
+
+        Time and space complexity: O(|L| M)
+        """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is not a hub label file")
+            magic, version, n, entries = HEADER.unpack(header)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a hub label file of version {FORMAT_VERSION}")
+            if n != len(graph):
+                raise ValueError(f"{path} has labels for {n} locations, the graph has {len(graph)}")
+
+            try:
+                offsets = array('q')
+                offsets.fromfile(file, n + 1)
+                hubs = array('i')
+                hubs.fromfile(file, entries)
+                distances = array('q')
+                distances.fromfile(file, entries)
+            except EOFError:
+                raise ValueError(f"{path} is truncated") from None
+
+        return cls(offsets, hubs, distances, graph.version)
+
+
+    def __len__(self) -> int:
+        return len(self.hubs)
+
@@ -0,0 +1,184 @@
+import struct
+from array import array
+
+
+MAGIC = b"CITYALT\0"
+FORMAT_VERSION = 1
+
+# magic, format version, landmark count, location count
+HEADER = struct.Struct("<8sIIq")
+
+
+class Landmarks:
+    """
+    Class description:
+    Landmark distances for A* search with the ALT (A*, landmarks, triangle inequality) lower bound. For a landmark l and
+    any two locations v and t, the triangle inequality gives d(v, t) >= |d(l, t) - d(l, v)|, and since the roads are
+    undirected the distances to and from a landmark are the same array. The largest of these bounds over all landmarks is
+    an admissible and consistent heuristic, so A* with it settles every location at most once and finds shortest paths.
+
+    The landmarks are picked by farthest point selection: each new landmark is the location furthest from the landmarks
+    chosen so far, which spreads them around the edge of the city where their bounds are tightest.
+    """
+    def __init__(self, landmarks: list[int], distances: list[array], version: int = 0) -> None:
+        """
+        Function description: Wraps landmark distance arrays that have already been computed, see select and load.
+
+        Input:
+            landmarks: The landmark locations.
+            distances: distances[i][v] is the travel time between landmarks[i] and v, inf if v cannot be reached.
+            version (optional): The version of the graph the distances were computed on.
+
+        Output: None
+
+        Time and space complexity: O(1)
+        """
+        self.landmarks = landmarks
+        self.distances = distances
+        self.version = version
+
+
+    @classmethod
+    def select(cls, city, count: int) -> "Landmarks":
+        """
+        Function description: Picks count landmarks by farthest point selection and computes their distance arrays. The
+        first landmark is the location furthest from location 0, every next one the location whose distance to its
+        closest landmark is largest. Locations that cannot be reached are never picked.
+
+        Input:
+            city: The CityMap whose roads the landmarks are computed on.
+            count: The number of landmarks, at least 1.
+
+        Output:
+            The Landmarks.
+
+        Raises:
+            ValueError: If count is less than 1.
+
+        Time complexity: O(K |R| log |L|), one full Dijkstra search per landmark (plus the search from location 0).
+
+        Space complexity: O(K |L|)
+        """
+        if count < 1:
+            raise ValueError(f"count must be at least 1, got {count}")
+
+        n = len(city.road_graph)
+        start_distance, _ = city.dijkstras(start_node=0)
+        landmarks = []
+        distances = []
+        closest = list(start_distance) # distance from each location to its closest landmark (to location 0 at first)
+
+        while len(landmarks) < min(count, n):
+            # the reachable location furthest from every landmark so far
+            furthest = -1
+            for v in range(n):
+                if closest[v] != float('inf') and (furthest == -1 or closest[v] > closest[furthest]):
+                    furthest = v
+            if furthest == -1 or furthest in landmarks:
+                break
+
+            distance, _ = city.dijkstras(start_node=furthest)
+            if not landmarks:
+                closest = list(distance) # from now on, only the landmarks count
+            else:
+                closest = [min(pair) for pair in zip(closest, distance)]
+            landmarks.append(furthest)
+            distances.append(array('d', distance))
+
+        return cls(landmarks, distances, city.road_graph.version)
+
+
+    def heuristic(self, target: int):
+        """
+        Function description: Returns the ALT lower bound on the travel time to target, as a function of the location.
+
+        Input:
+            target: The location the A* search is heading to.
+
+        Output:
+            A function h with h(v) <= d(v, target) for every location v, and h(u) <= weight + h(v) for every road (u, v).
+
+        Time complexity: O(K) to build, O(K) per call.
+
+        Space complexity: O(K)
+        """
+        inf = float('inf')
+        rows = [(row, row[target]) for row in self.distances if row[target] != inf]
+
+        def h(v: int):
+            bound = 0
+            for row, to_target in rows:
+                to_v = row[v]
+                if to_v != inf:
+                    difference = to_target - to_v if to_target > to_v else to_v - to_target
+                    if difference > bound:
+                        bound = difference
+            return bound
+
+        return h
+
+
+    def save(self, path: str) -> None:
+        """
+        Function description: Writes the landmarks and their distance arrays to a binary file: a header, the landmark
+        locations as 64 bit integers, then one array of |L| doubles per landmark, in the byte order of this machine.
+
+        Input:
+            path: The file to write.
+
+        Output: None
+
+        Time and space complexity: O(K |L|)
+        """
+        n = len(self.distances[0]) if self.distances else 0
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(self.landmarks), n))
+            array('q', self.landmarks).tofile(file)
+            for row in self.distances:
+                row.tofile(file)
+
+
+    @classmethod
+    def load(cls, path: str, graph) -> "Landmarks":
+        """
+        Function description: Reads landmarks written by save.
+
+        Input:
+            path: The file to read.
+            graph: The graph the landmarks will be used on, its number of locations must match the file.
+
+        Output:
+            The Landmarks, considered up to date with the graph's current version.
+
+        Raises:
+            ValueError: If the file is not a landmark file, is truncated or was computed for a graph with a different number 
+            of locations.
+
+        Time and space complexity: O(K |L|)
+        """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is not a landmark file")
+            magic, version, count, n = HEADER.unpack(header)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a landmark file of version {FORMAT_VERSION}")
+            if n != len(graph):
+                raise ValueError(f"{path} has landmarks for {n} locations, the graph has {len(graph)}")
+
+            try:
+                landmarks = array('q')
+                landmarks.fromfile(file, count)
+                distances = []
+                for _ in range(count):
+                    row = array('d')
+                    row.fromfile(file, n)
+                    distances.append(row)
+            except EOFError:
+                raise ValueError(f"{path} is truncated") from None
+
+        return cls(list(landmarks), distances, graph.version)
+
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
@@ -0,0 +1,182 @@
+import sys
+from array import array
+
+
+CHUNK_SIZE = 1 << 16 # edges read from a file at a time
+
+
+class EdgeColumns:
+    """
+    Class description:
+    A compact, re-iterable list of (start_vertex, end_vertex, weight) edges, stored as three arrays of 32 bit integers
+    instead of one tuple per edge. Iterating over it yields the edges as tuples, so it can be passed anywhere a list of
+    road tuples is expected, while only costing 12 bytes per edge.
+    """
+    def __init__(self) -> None:
+        self.starts = array('i')
+        self.ends = array('i')
+        self.weights = array('i')
+
+    def extend(self, edges) -> None:
+        """
+        Function description: Appends the edges of an iterable of (start_vertex, end_vertex, weight) tuples, one chunk at a
+        time so the iterable is never held in memory.
+
+        Input:
+            edges: An iterable of (start_vertex, end_vertex, weight) tuples, e.g. a generator.
+
+        Output: None
+
+        Time complexity: O(E)
+
+        Space complexity: O(CHUNK_SIZE) on top of the columns.
+        """
+        chunk = []
+        for edge in edges:
+            chunk.append(edge)
+            if len(chunk) == CHUNK_SIZE:
+                self.extend_chunk(chunk)
+                chunk = []
+        self.extend_chunk(chunk)
+
+    def extend_chunk(self, chunk: list[tuple[int, int, int]]) -> None:
+        """
+        Function description: Appends a list of edges to the three columns.
+
+        Input:
+            chunk: A list of (start_vertex, end_vertex, weight) tuples.
+
+        Output: None
+
+        Time and space complexity: O(len(chunk))
+        """
+        if chunk:
+            starts, ends, weights = zip(*chunk)
+            self.starts.extend(starts)
+            self.ends.extend(ends)
+            self.weights.extend(weights)
+
+    def extend_flat(self, values: array) -> None:
+        """
+        Function description: Appends edges given as a flat array of start_vertex, end_vertex, weight triples.
+
+        Input:
+            values: An array whose length is a multiple of 3.
+
+        Output: None
+
+        Time and space complexity: O(len(values))
+        """
+        self.starts.extend(values[0::3])
+        self.ends.extend(values[1::3])
+        self.weights.extend(values[2::3])
+
+    def __iter__(self):
+        return zip(self.starts, self.ends, self.weights)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+def read_edges(path: str) -> EdgeColumns:
+    """
+    Function description: Reads the edges of a road or track file in chunks. Files ending in .bin hold little endian 32 bit
+    integer triples (start_vertex, end_vertex, weight), any other file is a CSV file with one start_vertex,end_vertex,weight
+    edge per line. Blank lines, lines starting with # and a header line are skipped.
+
+    Input:
+        path: The file to read.
+
+    Output:
+        The edges, as EdgeColumns.
+
+    Raises:
+        ValueError: If a line of a CSV file is not three integers, or a binary file is not a whole number of triples.
+
+    Time complexity: O(E), where E is the number of edges.
+
+    Space complexity: O(E), 12 bytes per edge.
+    """
+    columns = EdgeColumns()
+
+    if path.endswith(".bin"):
+        with open(path, "rb") as file:
+            while True:
+                values = array('i')
+                values.frombytes(file.read(3 * CHUNK_SIZE * values.itemsize))
+                if not values:
+                    break
+                if len(values) % 3:
+                    raise ValueError(f"{path} does not hold whole (start, end, weight) triples")
+                if sys.byteorder == "big":
+                    values.byteswap()
+                columns.extend_flat(values)
+        return columns
+
+    with open(path) as file:
+        columns.extend(parse_csv_edges(file, path))
+    return columns
+
+
+def parse_csv_edges(lines, path: str):
+    """
+    Function description: Parses start_vertex,end_vertex,weight lines into tuples, lazily.
+
+    Input:
+        lines: An iterable of lines, e.g. an open file.
+        path: The name of the file, for error messages.
+
+    Output:
+        A generator of (start_vertex, end_vertex, weight) tuples.
+
+    Time complexity: O(1) per line
+
+    Space complexity: O(1)
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = line.split(",")
+        try:
+            if len(fields) != 3:
+                raise ValueError
+            yield int(fields[0]), int(fields[1]), int(fields[2])
+        except ValueError:
+            if line_number == 1: # a header line
+                continue
+            raise ValueError(f"{path}:{line_number}: expected start,end,weight, got {line!r}") from None
+
+
+def read_friends(path: str) -> list[tuple[str, int]]:
+    """
+    Function description: Reads a CSV file with one name,location friend per line. Blank lines, lines starting with # and a
+    header line are skipped.
+
+    Input:
+        path: The file to read.
+
+    Output:
+        The list of (friend_name, location) tuples.
+
+    Raises:
+        ValueError: If a line is not a name followed by an integer location.
+
+    Time and space complexity: O(|F|)
+    """
+    friends = []
+    with open(path) as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, _, location = line.rpartition(",")
+            try:
+                if not name:
+                    raise ValueError
+                friends.append((name, int(location)))
+            except ValueError:
+                if line_number == 1: # a header line
+                    continue
+                raise ValueError(f"{path}:{line_number}: expected name,location, got {line!r}") from None
+    return friends
@@ -3,10 +3,14 @@ class MinHeap:
     The MinHeap class implements a priority queue using a binary heap data structure. This 
     structure maintains the heap property, where each parent node has a value less than or equal 
     to its children, ensuring that the minimum element is always at the root. 
+
+    The values and their priorities are kept in two parallel lists, so comparisons read a priority directly instead of 
+    indexing into a (value, priority) tuple. Sifting moves a hole instead of swapping: the elements in the way are shifted 
+    by one level and the sifted element is written once, at its final position.
     """
     def __init__(self):
         """
-        Function description: Initialises an empty list to represent the heap.
+        Function description: Initialises empty lists to represent the heap.
 
         Input: None
 
@@ -14,7 +18,23 @@ class MinHeap:
         
         Time and space complexity: O(1)
         """
-        self.heap = []
+        self.values = [] # heap ordered values
+        self.priorities = [] # priorities parallel to self.values
+
+    @property
+    def heap(self) -> list[tuple]:
+        """
+        Function description: Returns the heap as a list of (value, priority) tuples in heap order, the layout used before 
+        the values and priorities were split into parallel lists.
+
+        Input: None
+
+        Output:
+            A new list of (value, priority) tuples.
+
+        Time and space complexity: O(N)
+        """
+        return list(zip(self.values, self.priorities))
 
     def parent(self, i):
         """
@@ -82,9 +102,54 @@ class MinHeap:
         are performed are in place and therefore the space complexity is constant.
         """
         # Insert the new element at the end of the heap
-        self.heap.append((value, priority)) # O(1)
+        self.values.append(value) # O(1)
+        self.priorities.append(priority) # O(1)
         # Move the new element to its correct position
-        self._heapify_up(len(self.heap) - 1)
+        self._heapify_up(len(self.values) - 1)
+
+    def update(self, value, priority):
+        """
+        Function description: Inserts a value, or lowers its priority if it is already in the heap. The heap does not track 
+        positions, so this is the same as insert and the old entry becomes stale, to be skipped by the caller when extracted.
+        
+        Input:
+            value: The value to insert.
+            priority: The priority of the value.
+        
+        Output: None
+        
+        Time complexity: O(log N)
+        
+        Space complexity: O(1)
+        """
+        self.insert(value, priority)
+
+    def heapify(self, items):
+        """
+        Function description: Replaces the contents of the heap with the given elements, building the heap bottom up 
+        instead of inserting the elements one at a time.
+        
+        Input:
+            items: An iterable of (value, priority) tuples.
+        
+        Output: None
+        
+        Time complexity: O(N)
+        
+        Time complexity analysis: Every internal node is sifted down once, starting from the last one. A node at height h 
+        moves at most h levels and there are at most N / 2^(h+1) nodes of height h, so the total work is bounded by 
+        N * sum(h / 2^(h+1)) = O(N), compared to O(N log N) for N inserts.
+        
+        Space complexity: O(N)
+        """
+        self.values = []
+        self.priorities = []
+        for value, priority in items:
+            self.values.append(value)
+            self.priorities.append(priority)
+
+        for i in range(len(self.values) // 2 - 1, -1, -1):
+            self._heapify_down(i)
 
     def extract_min(self):
         """
@@ -93,7 +158,7 @@ class MinHeap:
         Input: None
         
         Output:
-            The minimum element (root of the heap).
+            The minimum element (root of the heap) as a (value, priority) tuple, or None if the heap is empty.
         
         Time complexity: O(log N)
         
@@ -104,20 +169,95 @@ class MinHeap:
         
         Space complexity analysis: The space used is for the root element, and does not count towards auxiliary space complexity.
         """
-        if len(self.heap) == 0:
+        values = self.values
+        if not values:
             return None
-        if len(self.heap) == 1:
-            return self.heap.pop()
+
+        priorities = self.priorities
+        last_value = values.pop()
+        last_priority = priorities.pop()
+        if not values:
+            return last_value, last_priority
 
         # The root of the heap (minimum element)
-        root = self.heap[0]
+        root = values[0], priorities[0]
         # Replace the root with the last element in the heap
-        self.heap[0] = self.heap.pop()
+        values[0] = last_value
+        priorities[0] = last_priority
         # Heapify down from the root to maintain the heap property
         self._heapify_down(0)
 
         return root
 
+    def push_pop(self, value, priority):
+        """
+        Function description: Inserts a new element and then extracts the minimum element, as one operation. If the new 
+        element is no larger than the root it is returned straight away without touching the heap.
+        
+        Input:
+            value: The value to insert.
+            priority: The priority of the value.
+        
+        Output:
+            The minimum element of the heap including the new one, as a (value, priority) tuple.
+        
+        Time complexity: O(log N)
+        
+        Time complexity analysis: At most one heapify-down, compared to a heapify-up and a heapify-down for insert 
+        followed by extract_min.
+        
+        Space complexity: O(1)
+        """
+        priorities = self.priorities
+        if not priorities or priority <= priorities[0]:
+            return value, priority
+
+        root = self.values[0], priorities[0]
+        self.values[0] = value
+        priorities[0] = priority
+        self._heapify_down(0)
+        return root
+
+    def replace(self, value, priority):
+        """
+        Function description: Extracts the minimum element and then inserts a new element, as one operation. The returned 
+        element may have a larger priority than the new one.
+        
+        Input:
+            value: The value to insert.
+            priority: The priority of the value.
+        
+        Output:
+            The minimum element before the new one was inserted, as a (value, priority) tuple.
+        
+        Time complexity: O(log N)
+        
+        Space complexity: O(1)
+        """
+        if not self.values:
+            raise IndexError("replace on an empty heap")
+
+        root = self.values[0], self.priorities[0]
+        self.values[0] = value
+        self.priorities[0] = priority
+        self._heapify_down(0)
+        return root
+
+    def peek(self):
+        """
+        Function description: Returns the minimum element without removing it from the heap.
+        
+        Input: None
+        
+        Output:
+            The minimum element (root of the heap), or None if the heap is empty.
+        
+        Time and space complexity: O(1)
+        """
+        if not self.values:
+            return None
+        return self.values[0], self.priorities[0]
+
     def _heapify_up(self, i):
         """
         Function description: Moves the element at index i up the heap to its correct position to maintain the heap property.
@@ -129,20 +269,31 @@ class MinHeap:
         
         Time complexity: O(log N)
         
-        Time complexity analysis: The process of moving an element up involves potentially swapping it with its 
-        parent multiple times, which is logarithmic in terms of the number of elements.
+        Time complexity analysis: The element moves up at most one level per iteration, which is logarithmic in terms of 
+        the number of elements. Each level costs one comparison and one move of the parent into the hole.
         
         Space complexity: O(1)
         
         Space complexity analysis: No additional space is used beyond the existing heap.
         """
-        # Checking if the index is greater than 0 and if the parent of our current priority is greater than the current priority itself 
+        values = self.values
+        priorities = self.priorities
+        value = values[i]
+        priority = priorities[i]
+
+        # While the parent of the hole has a larger priority, move the parent down into the hole
         # This ensures we are maintaining the minheap property.
+        while i > 0:
+            parent = (i - 1) >> 1
+            parent_priority = priorities[parent]
+            if parent_priority <= priority:
+                break
+            values[i] = values[parent]
+            priorities[i] = parent_priority
+            i = parent
 
-        while i > 0 and self.heap[self.parent(i)][1] > self.heap[i][1]: # O(log(N))
-            # Swapping with parent if the current element's priority is smaller
-            self.heap[i], self.heap[self.parent(i)] = self.heap[self.parent(i)], self.heap[i] # O(1)
-            i = self.parent(i)
+        values[i] = value
+        priorities[i] = priority
 
     def _heapify_down(self, i):
         """
@@ -155,31 +306,270 @@ class MinHeap:
         
         Time complexity: O(log N)
         
-        Time complexity analysis: The process of moving an element down involves potentially swapping it 
-        with its children multiple times, which is logarithmic in terms of the number of elements.
+        Time complexity analysis: The element moves down at most one level per iteration, which is logarithmic in terms of 
+        the number of elements.
         
         Space complexity: O(1)
         
-        Space complexity analysis: No additional space is used beyond the existing heap.
+        Space complexity analysis: No additional space is used beyond the existing heap, the loop is iterative.
         """
-        # Move the element at index i down the heap to its correct position
-        current_smallest_index = i
-        left_child_index = self.left_child(i)
-        right_child_index = self.right_child(i)
-
-        # Checking if left_child_index and right_child_index children exist and if so checking if their value is smaller than our current smallest value
-        # If both these conditions are true then we swap these two indices so that minheap is maintained
+        values = self.values
+        priorities = self.priorities
+        size = len(values)
+        value = values[i]
+        priority = priorities[i]
 
-        if left_child_index < len(self.heap) and self.heap[left_child_index][1] < self.heap[current_smallest_index][1]:
-            current_smallest_index = left_child_index # O(1)
+        child = 2 * i + 1
+        while child < size:
+            # Pick the right child only if it is strictly smaller than the left child
+            child_priority = priorities[child]
+            right = child + 1
+            if right < size and priorities[right] < child_priority:
+                child = right
+                child_priority = priorities[right]
 
-        if right_child_index < len(self.heap) and self.heap[right_child_index][1] < self.heap[current_smallest_index][1]:
-            current_smallest_index = right_child_index # O(1)
+            # Stop once neither child is smaller, otherwise move the smaller child up into the hole
+            if child_priority >= priority:
+                break
+            values[i] = values[child]
+            priorities[i] = child_priority
+            i = child
+            child = 2 * i + 1
 
-        if current_smallest_index != i:
-            # Swap and continue heapifying down
-            self.heap[i], self.heap[current_smallest_index] = self.heap[current_smallest_index], self.heap[i]
-            self._heapify_down(current_smallest_index) # recursive call O(log(N))
+        values[i] = value
+        priorities[i] = priority
 
     def is_empty(self):
-        return len(self.heap) == 0
\ No newline at end of file
+        return len(self.values) == 0
+
+    def __len__(self):
+        return len(self.values)
+
+
+class IndexedMinHeap:
+    """
+    The IndexedMinHeap class implements a priority queue over the integer values 0..capacity-1 using a binary heap 
+    together with a position map. The position map records where each value currently sits in the heap, which allows 
+    the priority of a value that is already queued to be lowered in place (decrease_key) instead of inserting a second, 
+    stale copy of it. As a result the heap never holds more than one entry per value, so its size is bounded by the 
+    number of values (|L| when used by Dijkstra's algorithm).
+    """
+    def __init__(self, capacity: int):
+        """
+        Function description: Initialises an empty heap and a position map for values in the range 0..capacity-1.
+
+        Input:
+            capacity: The number of distinct values that may be stored in the heap.
+
+        Output: None
+
+        Time and space complexity: O(N), where N is the capacity.
+        - The position map is initialised with -1 (not in the heap) for every possible value.
+        """
+        self.values = [] # heap ordered values
+        self.priorities = [] # priorities parallel to self.values
+        self.position = [-1] * capacity # position[value] is the index of value in the heap, or -1 if absent
+
+    def insert(self, value: int, priority) -> None:
+        """
+        Function description: Inserts a value that is not yet in the heap with the given priority.
+
+        Input:
+            value: The value to insert, must not already be in the heap.
+            priority: The priority of the value.
+
+        Output: None
+
+        Time complexity: O(log N)
+
+        Time complexity analysis: The value is appended to the end of the heap O(1) and then sifted up O(log N).
+
+        Space complexity: O(1)
+        """
+        self.values.append(value)
+        self.priorities.append(priority)
+        self.position[value] = len(self.values) - 1
+        self._sift_up(len(self.values) - 1)
+
+    def decrease_key(self, value: int, priority) -> None:
+        """
+        Function description: Lowers the priority of a value that is already in the heap. If the new priority is not 
+        smaller than the current one, the heap is left unchanged.
+
+        Input:
+            value: The value whose priority is lowered, must already be in the heap.
+            priority: The new priority of the value.
+
+        Output: None
+
+        Time complexity: O(log N)
+
+        Time complexity analysis: The position map gives the index of the value in O(1), then it is sifted up O(log N).
+
+        Space complexity: O(1)
+        """
+        i = self.position[value]
+        if priority < self.priorities[i]:
+            self.priorities[i] = priority
+            self._sift_up(i)
+
+    def update(self, value: int, priority) -> None:
+        """
+        Function description: Inserts a value, or lowers its priority in place if it is already in the heap.
+
+        Input:
+            value: The value to insert or update.
+            priority: The priority of the value.
+
+        Output: None
+
+        Time complexity: O(log N)
+
+        Space complexity: O(1)
+        """
+        if self.position[value] == -1:
+            self.insert(value, priority)
+        else:
+            self.decrease_key(value, priority)
+
+    def contains(self, value: int) -> bool:
+        """
+        Function description: Checks whether a value is currently in the heap.
+
+        Input:
+            value: The value to look for.
+
+        Output:
+            True if the value is in the heap, False otherwise.
+
+        Time and space complexity: O(1)
+        """
+        return self.position[value] != -1
+
+    def peek(self):
+        """
+        Function description: Returns the minimum element without removing it from the heap.
+
+        Input: None
+
+        Output:
+            The (value, priority) tuple at the root of the heap, or None if the heap is empty.
+
+        Time and space complexity: O(1)
+        """
+        if not self.values:
+            return None
+        return self.values[0], self.priorities[0]
+
+    def extract_min(self):
+        """
+        Function description: Extracts and returns the minimum element from the heap.
+
+        Input: None
+
+        Output:
+            The (value, priority) tuple at the root of the heap, or None if the heap is empty.
+
+        Time complexity: O(log N)
+
+        Time complexity analysis: The last element is moved into the root O(1) and then sifted down O(log N).
+
+        Space complexity: O(1)
+        """
+        if not self.values:
+            return None
+
+        root_value = self.values[0]
+        root_priority = self.priorities[0]
+        self.position[root_value] = -1
+
+        last_value = self.values.pop()
+        last_priority = self.priorities.pop()
+        if self.values:
+            # Move the last element into the root and restore the heap property
+            self.values[0] = last_value
+            self.priorities[0] = last_priority
+            self.position[last_value] = 0
+            self._sift_down(0)
+
+        return root_value, root_priority
+
+    def _sift_up(self, i: int) -> None:
+        """
+        Function description: Moves the element at index i up the heap to its correct position. Instead of swapping at 
+        every level, larger parents are shifted down into the hole and the element is written once at the end.
+
+        Input:
+            i: The index of the element to move up.
+
+        Output: None
+
+        Time complexity: O(log N)
+
+        Space complexity: O(1)
+        """
+        values = self.values
+        priorities = self.priorities
+        position = self.position
+        value = values[i]
+        priority = priorities[i]
+
+        while i > 0:
+            parent = (i - 1) >> 1
+            if priorities[parent] <= priority:
+                break
+            # Move the parent down into the hole
+            values[i] = values[parent]
+            priorities[i] = priorities[parent]
+            position[values[i]] = i
+            i = parent
+
+        values[i] = value
+        priorities[i] = priority
+        position[value] = i
+
+    def _sift_down(self, i: int) -> None:
+        """
+        Function description: Moves the element at index i down the heap to its correct position. Smaller children are 
+        shifted up into the hole and the element is written once at the end.
+
+        Input:
+            i: The index of the element to move down.
+
+        Output: None
+
+        Time complexity: O(log N)
+
+        Space complexity: O(1)
+        """
+        values = self.values
+        priorities = self.priorities
+        position = self.position
+        size = len(values)
+        value = values[i]
+        priority = priorities[i]
+
+        child = 2 * i + 1
+        while child < size:
+            # Pick the smaller of the two children
+            right = child + 1
+            if right < size and priorities[right] < priorities[child]:
+                child = right
+            if priority <= priorities[child]:
+                break
+            # Move the child up into the hole
+            values[i] = values[child]
+            priorities[i] = priorities[child]
+            position[values[i]] = i
+            i = child
+            child = 2 * i + 1
+
+        values[i] = value
+        priorities[i] = priority
+        position[value] = i
+
+    def is_empty(self) -> bool:
+        return len(self.values) == 0
+
+    def __len__(self) -> int:
+        return len(self.values)
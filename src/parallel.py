@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+
+from src.snapshot import snapshot_sections, snapshot_size, graph_from_buffer
+
+
+# the CityMap of each worker process, attached to the shared snapshot by attach_worker
+worker_city = None
+worker_memory = None
+
+
+def parallel_plan_many(city, queries: list[tuple[int, int]], workers: int = None, chunk_size: int = None,
+                       tree_route: bool = False) -> tuple[list, int]:
+    """
+    Function description: Answers a batch of plan queries on a pool of worker processes, see run_in_workers. The queries
+    are split into chunks of consecutive queries and each chunk is answered with plan_many, so queries of a chunk share
+    their endpoint trees.
+
+    Input:
+        city: The CityMap to plan on.
+        queries: A list of (start, destination) tuples.
+        workers (optional): The number of worker processes, the number of CPUs by default.
+        chunk_size (optional): The number of queries sent to a worker at a time. By default the batch is split into
+        about 4 chunks per worker, to balance the load while keeping endpoint sharing within chunks.
+        tree_route (optional): Passed on to plan_many.
+
+    Output:
+        The list of results, in input order, and the total number of locations settled by the workers.
+
+    Time complexity: O(|L| + |R|) to fill the shared memory plus the time of plan_many on each chunk, divided over the
+    workers.
+
+    Space complexity: O(|L| + |R|) for the shared snapshot, plus O(|L| + |T| + |F| + P) per worker.
+    """
+    return run_in_workers(city, partial(plan_chunk, tree_route=tree_route), queries, workers, chunk_size)
+
+
+def parallel_distance_rows(city, jobs: list[tuple[int, list[int]]], workers: int = None,
+                           chunk_size: int = None) -> tuple[list, int]:
+    """
+    Function description: Computes rows of a distance matrix on a pool of worker processes, see run_in_workers and
+    CityMap.distance_row.
+
+    Input:
+        city: The CityMap to search on.
+        jobs: A list of (source, targets) tuples, one per row.
+        workers (optional): The number of worker processes, the number of CPUs by default.
+        chunk_size (optional): The number of rows sent to a worker at a time, about 4 chunks per worker by default.
+
+    Output:
+        The list of rows, in the order of jobs, and the total number of locations settled by the workers.
+
+    Time complexity: O(|L| + |R|) to fill the shared memory plus one early exit search per row, divided over the workers.
+
+    Space complexity: O(|L| + |R|) for the shared snapshot, plus O(|L| + |T| + |F| + P) per worker.
+    """
+    return run_in_workers(city, distance_chunk, jobs, workers, chunk_size)
+
+
+def run_in_workers(city, task, items: list, workers: int = None, chunk_size: int = None) -> tuple[list, int]:
+    """
+    Function description: Runs a task over a list of items on a pool of worker processes. The city's graph is written
+    once into a block of shared memory in the snapshot format, and every worker builds a CityMap whose CSR arrays are
+    read in place from that block, so the roads are neither pickled nor copied per worker. The items are sent to the
+    workers in chunks of consecutive items.
+
+    Input:
+        city: The CityMap the task runs on.
+        task: A module level function taking a chunk of items and returning a list with one result per item and the
+        number of locations it settled, it runs in the workers on worker_city.
+        items: The items.
+        workers (optional): The number of worker processes, the number of CPUs by default.
+        chunk_size (optional): The number of items sent to a worker at a time, about 4 chunks per worker by default.
+
+    Output:
+        The list of results, in the order of items, and the total number of locations settled by the workers.
+
+    Raises:
+        ValueError: If workers or chunk_size is less than 1.
+
+    Time complexity: O(|L| + |R|) to fill the shared memory plus the task, divided over the workers.
+
+    Space complexity: O(|L| + |R|) for the shared snapshot, plus O(|L| + |T| + |F| + P) per worker.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(items) // (4 * workers)))
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if not chunks:
+        return [], 0
+
+    sections = snapshot_sections(city.road_graph)
+    memory = shared_memory.SharedMemory(create=True, size=snapshot_size(sections))
+    try:
+        position = 0
+        for section in sections:
+            memory.buf[position:position + len(section)] = section
+            position += len(section)
+
+        results = []
+        settled_count = 0
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=attach_worker,
+                                 initargs=(memory.name, city.engine)) as executor:
+            for chunk_results, chunk_settled in executor.map(task, chunks):
+                results.extend(chunk_results)
+                settled_count += chunk_settled
+        return results, settled_count
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def attach_worker(memory_name: str, engine: str) -> None:
+    """
+    Function description: Runs once in each worker process, attaching to the shared snapshot and building the worker's
+    CityMap on top of it.
+
+    Input:
+        memory_name: The name of the shared memory block holding the snapshot.
+        engine: The search engine of the city the workers run for.
+
+    Output: None
+
+    Time complexity: O(|L| + |T| + |F| + P), see snapshot.graph_from_buffer.
+
+    Space complexity: O(|L| + |T| + |F| + P)
+    """
+    global worker_city, worker_memory
+    from src.assignment1 import CityMap # imported here, assignment1 imports this module
+
+    worker_memory = shared_memory.SharedMemory(name=memory_name)
+    worker_city = CityMap.__new__(CityMap)
+    worker_city.road_graph = graph_from_buffer(worker_memory.buf, memory_name)
+    worker_city.init_search_state(engine=engine)
+
+
+def plan_chunk(chunk: list[tuple[int, int]], tree_route: bool = False) -> tuple[list, int]:
+    """
+    Function description: Answers a chunk of queries in a worker process.
+
+    Input:
+        chunk: A list of (start, destination) tuples.
+        tree_route (optional): Passed on to plan_many.
+
+    Output:
+        The results of plan_many on the chunk and the number of locations it settled.
+
+    Time complexity: See CityMap.plan_many.
+
+    Space complexity: See CityMap.plan_many.
+    """
+    results = worker_city.plan_many(chunk, tree_route=tree_route)
+    return results, worker_city.settled_count
+
+
+def distance_chunk(jobs: list[tuple[int, list[int]]]) -> tuple[list, int]:
+    """
+    Function description: Computes a chunk of distance matrix rows in a worker process.
+
+    Input:
+        jobs: A list of (source, targets) tuples.
+
+    Output:
+        The row of each job, see CityMap.distance_row, and the number of locations settled.
+
+    Time complexity: One early exit search per job.
+
+    Space complexity: O(|L|) per search.
+    """
+    rows = []
+    settled_count = 0
+    for source, targets in jobs:
+        rows.append(worker_city.distance_row(source, targets))
+        settled_count += worker_city.settled_count
+    return rows, settled_count
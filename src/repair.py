@@ -0,0 +1,134 @@
+from src.minheap import MinHeap
+
+
+def repair_tree(graph, tree: tuple[list, list], u: int, v: int, old_weight, new_weight) -> tuple[list, list]:
+    """
+    Function description: Repairs a complete shortest path tree after the road u - v changed from old_weight to
+    new_weight, in the style of Ramalingam and Reps: only the locations whose distance can change are searched again.
+        - A shorter (or new) road can only improve the locations it gives a shorter path to, see repair_decrease.
+        - A longer (or removed) road can only lengthen the locations below it in the tree, and only if it is a tree road,
+          see repair_increase.
+    The graph must already hold the new weight (or no longer hold the road).
+
+    Input:
+        graph: The Graph the tree was computed on, after the change.
+        tree: The (distance, parent) lists of a complete search. They are not modified, they may be shared.
+        u, v: The ends of the road.
+        old_weight: The weight before the change, None if the road was added.
+        new_weight: The weight after the change, None if the road was removed.
+
+    Output:
+        The repaired (distance, parent) lists, the same as a new search gives up to the choice among equal paths.
+
+    Time complexity: O(|L|) to copy the tree, plus O(A log A + R_A) where A is the number of locations whose distance
+    changes (or that lie below a lengthened tree road) and R_A the number of their roads.
+
+    Space complexity: O(|L|)
+    """
+    distance, parent = tree
+    if old_weight is None or (new_weight is not None and new_weight < old_weight):
+        return repair_decrease(graph, (list(distance), list(parent)), u, v, new_weight)
+    if new_weight is None or new_weight > old_weight:
+        if parent[v] == u or parent[u] == v:
+            return repair_increase(graph, (list(distance), list(parent)), u, v)
+    return tree # a longer road off the tree, or the same weight, changes nothing
+
+
+def repair_decrease(graph, tree: tuple[list, list], u: int, v: int, weight) -> tuple[list, list]:
+    """
+    Function description: Repairs a tree, in place, after the road u - v became shorter or was added. If the road gives
+    one of its ends a shorter path, that end is improved and the improvement spreads with a Dijkstra search that only
+    queues locations whose distance improves.
+
+    Input:
+        graph: The Graph the tree was computed on, after the change.
+        tree: The (distance, parent) lists to repair.
+        u, v: The ends of the road.
+        weight: The new weight of the road.
+
+    Output:
+        The repaired tree.
+
+    Time complexity: O(A log A + R_A), for the A improved locations and their R_A roads.
+
+    Space complexity: O(A)
+    """
+    distance, parent = tree
+    queue = MinHeap()
+    for a, b in ((u, v), (v, u)):
+        if distance[a] + weight < distance[b]:
+            distance[b] = distance[a] + weight
+            parent[b] = a
+            queue.insert(b, distance[b])
+
+    while not queue.is_empty():
+        x, dist_x = queue.extract_min()
+        if dist_x > distance[x]:
+            continue # stale entry
+        for _, y, road_weight in graph.adjacent(x):
+            if dist_x + road_weight < distance[y]:
+                distance[y] = dist_x + road_weight
+                parent[y] = x
+                queue.insert(y, distance[y])
+
+    return tree
+
+
+def repair_increase(graph, tree: tuple[list, list], u: int, v: int) -> tuple[list, list]:
+    """
+    Function description: Repairs a tree, in place, after the tree road between u and v became longer or was removed.
+    Only the subtree below the road can lengthen. Each location of the subtree first gets its best distance through a
+    neighbour outside the subtree, then a Dijkstra search restricted to the subtree settles their final distances.
+    Locations of the subtree with no path left get inf and parent -1.
+
+    Input:
+        graph: The Graph the tree was computed on, after the change.
+        tree: The (distance, parent) lists to repair.
+        u, v: The ends of the road, one is the parent of the other in the tree.
+
+    Output:
+        The repaired tree.
+
+    Time complexity: O(|L|) to find the subtree, plus O(A log A + R_A) for the A locations of the subtree and their
+    R_A roads.
+
+    Space complexity: O(|L|)
+    """
+    distance, parent = tree
+    child = v if parent[v] == u else u
+
+    # the subtree below child, from the children of every location
+    children = [[] for _ in range(len(parent))]
+    for x, p in enumerate(parent):
+        if p != -1:
+            children[p].append(x)
+    affected = set()
+    stack = [child]
+    while stack:
+        x = stack.pop()
+        affected.add(x)
+        stack.extend(children[x])
+
+    # every affected location starts from its best neighbour outside the subtree
+    queue = MinHeap()
+    for x in affected:
+        distance[x] = float('inf')
+        parent[x] = -1
+        for _, y, weight in graph.adjacent(x):
+            if y not in affected and distance[y] + weight < distance[x]:
+                distance[x] = distance[y] + weight
+                parent[x] = y
+        if distance[x] != float('inf'):
+            queue.insert(x, distance[x])
+
+    while not queue.is_empty():
+        x, dist_x = queue.extract_min()
+        if dist_x > distance[x]:
+            continue # stale entry
+        for _, y, weight in graph.adjacent(x):
+            if y in affected and dist_x + weight < distance[y]:
+                distance[y] = dist_x + weight
+                parent[y] = x
+                queue.insert(y, distance[y])
+
+    return tree
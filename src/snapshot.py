@@ -0,0 +1,270 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from src.csrgraph import CSRGraph, WEIGHT_LIMIT
+
+
+MAGIC = b"CITYMAP\0"
+FORMAT_VERSION = 1
+
+# magic, format version, byte order of the arrays (0 little, 1 big), vertex count, directed road entries, largest road
+# weight, max train hops, track count, friend count, bytes of friend names, pickup candidate count
+HEADER = struct.Struct("<8sII8q")
+
+ALIGNMENT = 8 # every section starts on a multiple of 8 bytes, so it can be read in place as an array of integers
+
+
+def snapshot_sections(graph) -> list:
+    """
+    Function description: Lays a graph out in the binary snapshot format that load_snapshot can memory map: a header
+    followed by these sections, each padded to 8 bytes:
+        - offsets: |L| + 1 64 bit integers, the CSR offsets of the roads leaving each location.
+        - targets, weights: 32 bit integers, one per directed road entry.
+        - tracks: 3 64 bit integers (start, end, weight) per track.
+        - friend locations and friend name lengths: a 64 bit integer per friend each, then the UTF-8 friend names.
+        - pickup candidates: 3 32 bit integers (friend, location, hops) per candidate, friend being the index of the
+          first friend with that name.
+    The arrays are written in the byte order of this machine, which the header records.
+
+    Input:
+        graph: A Graph or CSRGraph with integer road and track weights.
+
+    Output:
+        The list of sections, each a bytes like object, padding included.
+
+    Raises:
+        ValueError: If a road or track weight is not an integer, or a road weight does not fit in 32 bits.
+
+    Time complexity: O(|L| + |R| + |T| + |F| + P), where P is the number of pickup candidates.
+
+    Space complexity: O(|L| + |R|) for the CSR arrays of a Graph, O(|T| + |F| + P) for a CSRGraph.
+    """
+    if not graph.integer_weights:
+        raise ValueError("Only graphs with integer road weights can be saved")
+
+    offsets, targets, weights = csr_arrays(graph)
+
+    tracks = array('q')
+    for start_vertex, end_vertex, weight in graph.tracks:
+        if weight != int(weight):
+            raise ValueError("Only graphs with integer track weights can be saved")
+        tracks.extend((start_vertex, end_vertex, int(weight)))
+
+    friend_locations = array('q', [location for _, location in graph.friends])
+    encoded_names = [name.encode("utf-8") for name, _ in graph.friends]
+    name_lengths = array('q', [len(name) for name in encoded_names])
+    names = b"".join(encoded_names)
+
+    # candidates refer to friends by the index of the first friend with their name
+    friend_index = {}
+    for i, (name, _) in enumerate(graph.friends):
+        friend_index.setdefault(name, i)
+    candidates = array('i')
+    for friend, location, hops in graph.pickup_candidates:
+        candidates.extend((friend_index[friend], location, hops))
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0 if sys.byteorder == "little" else 1, len(graph), len(targets),
+                         graph.max_weight, graph.max_hops, len(graph.tracks), len(graph.friends), len(names),
+                         len(graph.pickup_candidates))
+
+    sections = []
+    for section in (header, offsets, targets, weights, tracks, friend_locations, name_lengths, names, candidates):
+        data = memoryview(section).cast('B')
+        sections.append(data)
+        sections.append(bytes(-len(data) % ALIGNMENT))
+    return sections
+
+
+def can_snapshot(graph) -> bool:
+    """
+    Function description: Checks whether a graph can be laid out by snapshot_sections: its road weights are integers
+    below 2^31 and its track weights are integers.
+
+    Input:
+        graph: A Graph or CSRGraph.
+
+    Output:
+        True if snapshot_sections accepts the graph, False otherwise.
+
+    Time complexity: O(|T|)
+
+    Space complexity: O(1)
+    """
+    if not graph.integer_weights or graph.max_weight >= WEIGHT_LIMIT:
+        return False
+    return all(weight == int(weight) for _, _, weight in graph.tracks)
+
+
+def save_snapshot(graph, path: str) -> None:
+    """
+    Function description: Writes a graph to a binary snapshot file, see snapshot_sections for the format.
+
+    Input:
+        graph: A Graph or CSRGraph with integer road and track weights.
+        path: The file to write.
+
+    Output: None
+
+    Raises:
+        ValueError: If a road or track weight is not an integer, or a road weight does not fit in 32 bits.
+
+    Time complexity: O(|L| + |R| + |T| + |F| + P)
+
+    Space complexity: O(|L| + |R|) for a Graph, O(|T| + |F| + P) for a CSRGraph.
+    """
+    sections = snapshot_sections(graph)
+    with open(path, "wb") as file:
+        file.writelines(sections)
+
+
+def snapshot_size(sections: list) -> int:
+    """
+    Function description: Returns the size in bytes of a snapshot laid out by snapshot_sections.
+
+    Input:
+        sections: The list returned by snapshot_sections.
+
+    Output:
+        The total size in bytes.
+
+    Time and space complexity: O(1) per section
+    """
+    return sum(len(section) for section in sections)
+
+
+def csr_arrays(graph) -> tuple:
+    """
+    Function description: Returns the offsets, targets and weights arrays of a graph in CSR form. A CSRGraph already
+    stores them, a Graph's adjacency list is flattened in its own road order.
+
+    Input:
+        graph: A Graph or CSRGraph.
+
+    Output:
+        The (offsets, targets, weights) tuple.
+
+    Raises:
+        ValueError: If a road weight of a Graph does not fit in 32 bits, a CSRGraph never holds one.
+
+    Time complexity: O(1) for a CSRGraph, O(|L| + |R|) for a Graph.
+
+    Space complexity: O(1) for a CSRGraph, O(|L| + |R|) for a Graph.
+    """
+    if isinstance(graph, CSRGraph):
+        return graph.offsets, graph.targets, graph.weights
+
+    offsets = array('q', [0])
+    targets = array('i')
+    weights = array('i')
+    for u in range(len(graph)):
+        for _, v, weight in graph.adjacent(u):
+            if not -WEIGHT_LIMIT <= weight < WEIGHT_LIMIT:
+                raise ValueError(f"Road {u} - {v} has weight {weight}, a snapshot needs 32 bit integer weights")
+            targets.append(v)
+            weights.append(weight)
+        offsets.append(len(targets))
+    return offsets, targets, weights
+
+
+def load_snapshot(path: str, use_mmap: bool = True) -> CSRGraph:
+    """
+    Function description: Loads a graph written by save_snapshot. With use_mmap the file is memory mapped and the CSR
+    arrays are read in place, nothing is parsed or copied per road and processes loading the same file share one
+    page cached copy of it. Otherwise the file is read into memory once.
+
+    Only the tracks, friends and pickup candidates are turned into Python objects, so loading costs O(|T| + |F| + P)
+    instead of the O(|R|) tuples and lists of building the graph from its roads.
+
+    Input:
+        path: The snapshot file.
+        use_mmap (optional): Whether to memory map the file, True by default.
+
+    Output:
+        A CSRGraph backed by the snapshot.
+
+    Raises:
+        ValueError: If the file is not a snapshot or was written in an unsupported format version.
+
+    Time complexity: O(|L| + |T| + |F| + P), the O(|L|) being a single list of references for the friend information.
+
+    Space complexity: O(|L| + |T| + |F| + P), plus the file itself when it is not memory mapped.
+    """
+    with open(path, "rb") as file:
+        if use_mmap:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = file.read()
+
+    return graph_from_buffer(buffer, path)
+
+
+def graph_from_buffer(buffer, name: str = "buffer") -> CSRGraph:
+    """
+    Function description: Builds a graph from a snapshot held in any buffer, e.g. a memory mapped file or a block of shared
+    memory. The CSR arrays are read in place, so the buffer must stay unchanged while the graph is in use.
+
+    Input:
+        buffer: The snapshot, anything supporting the buffer protocol.
+        name (optional): Where the snapshot comes from, for error messages.
+
+    Output:
+        A CSRGraph backed by the buffer.
+
+    Raises:
+        ValueError: If the buffer is not a snapshot or has an unsupported format version.
+
+    Time complexity: O(|L| + |T| + |F| + P)
+
+    Space complexity: O(|L| + |T| + |F| + P)
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{name} is not a CityMap snapshot")
+    (magic, version, byte_order, vertex_count, entry_count, max_weight, max_hops, track_count, friend_count,
+     name_bytes, candidate_count) = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{name} is not a CityMap snapshot")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported CityMap snapshot version {version}")
+
+    swap = byte_order != (0 if sys.byteorder == "little" else 1)
+    view = memoryview(buffer)
+    position = HEADER.size
+
+    def section(typecode: str, count: int):
+        # returns the next count integers of the file, in place unless they have to be byte swapped
+        nonlocal position
+        size = array(typecode).itemsize * count
+        data = view[position:position + size]
+        position += size + (-size % ALIGNMENT)
+        if swap:
+            data = array(typecode, data.tobytes())
+            data.byteswap()
+            return data
+        return data.cast(typecode)
+
+    offsets = section('q', vertex_count + 1)
+    targets = section('i', entry_count)
+    weights = section('i', entry_count)
+    track_values = section('q', 3 * track_count)
+    friend_locations = section('q', friend_count)
+    name_lengths = section('q', friend_count)
+    names = view[position:position + name_bytes].tobytes()
+    position += name_bytes + (-name_bytes % ALIGNMENT)
+    candidate_values = section('i', 3 * candidate_count)
+
+    tracks = [tuple(track_values[i:i + 3]) for i in range(0, 3 * track_count, 3)]
+
+    friends = []
+    start = 0
+    for location, length in zip(friend_locations, name_lengths):
+        friends.append((names[start:start + length].decode("utf-8"), location))
+        start += length
+
+    pickup_candidates = [(friends[candidate_values[i]][0], candidate_values[i + 1], candidate_values[i + 2])
+                         for i in range(0, 3 * candidate_count, 3)]
+
+    graph = CSRGraph.from_arrays(offsets, targets, weights, max_weight, tracks, friends, max_hops, pickup_candidates)
+    graph.snapshot = buffer # keeps the memory map or shared memory open for as long as the graph uses it
+    return graph
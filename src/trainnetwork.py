@@ -0,0 +1,392 @@
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+
+class TrainNetwork:
+    """
+    Class description:
+    This class works out where each friend can be picked up. Friends can ride the (directed) train tracks for at most
+    max_hops hops from their starting location, so the pickup locations of a friend are the locations reachable within
+    max_hops hops in the track network. They are found with a breadth first search from every friend over an index of
+    the tracks leaving each location, so the result does not depend on the order the tracks are given in.
+
+    Every (friend, hops) pair that can reach a location is recorded, with hops the fewest train hops that friend needs
+    to get there, so two friends who can both reach a station are both pickup candidates there.
+
+    Friends and tracks can be added, moved and removed afterwards. A change only searches again from the friends it can
+    affect, which are all within max_hops hops of it, and reports the locations whose pickup options changed.
+    """
+    def __init__(self, tracks, friends, max_hops: int = 2) -> None:
+        """
+        Function description: Builds the track index and finds the pickup locations of every friend.
+
+        Input:
+            tracks: List of tuples (start_vertex, end_vertex, weight) representing tracks.
+            friends: List of tuples (friend_name, location) representing friends and their locations.
+            max_hops (optional): The largest number of train hops a friend can take.
+
+        Output: None
+
+        Time complexity: O(|T| + |F| + P), at most O(|T| + |F| * max_hops * |T|)
+
+        Time complexity analysis:
+        - O(|T|) to build the index of the tracks leaving each location.
+        - Each friend's search visits every track leaving a location it reaches in fewer than max_hops hops once, so all
+        searches together cost O(|F| + P), where P is the number of (friend, location) pairs found plus the tracks leaving
+        them. When the friends' neighbourhoods do not overlap this is O(|F| + |T|).
+        - A search expands one frontier per hop, and each frontier crosses every track at most once, so a search never
+        costs more than O(max_hops * |T|) however many paths of max_hops hops there are.
+
+        Space complexity: O(|T| + P)
+        """
+        if max_hops < 0:
+            raise ValueError(f"max_hops must be non-negative, got {max_hops}")
+        self.max_hops = max_hops
+
+        # track_adjacency[u] lists the end location of every track leaving u
+        self.track_adjacency = {}
+        self.tracks = {} # track id -> (start_vertex, end_vertex, weight), in the order the tracks were given
+        for start_vertex, end_vertex, weight in tracks:
+            self.track_adjacency.setdefault(start_vertex, []).append(end_vertex)
+            self.tracks[len(self.tracks)] = (start_vertex, end_vertex, weight)
+        self.next_track = len(self.tracks)
+
+        # friend index -> (friend_name, location), a friend is identified by its index, which is never reused
+        self.friends = dict(enumerate(friends))
+        self.next_friend = len(self.friends)
+
+        # pickups[v] lists the (friend_index, hops) pairs of the friends that can be picked up at location v
+        self.pickups = {}
+        for friend_index in self.friends:
+            for location, hops in self.reach(friend_index).items():
+                self.pickups.setdefault(location, []).append((friend_index, hops))
+
+
+    def reach(self, friend_index: int) -> dict[int, int]:
+        """
+        Function description: Finds every location a friend can reach within max_hops train hops with a breadth first
+        search, one hop (frontier) at a time.
+
+        Input:
+            friend_index: The index of the friend in self.friends.
+
+        Output:
+            A dictionary from each reachable location to the fewest train hops needed to reach it.
+
+        Time complexity: O(P), the locations reached plus the tracks leaving those reached in fewer than max_hops hops.
+
+        Space complexity: O(P)
+        """
+        _, location = self.friends[friend_index]
+        hops_to = {location: 0}
+        frontier = [location]
+
+        for hops in range(1, self.max_hops + 1):
+            next_frontier = []
+            for u in frontier:
+                for v in self.track_adjacency.get(u, ()):
+                    if v not in hops_to:
+                        hops_to[v] = hops
+                        next_frontier.append(v)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return hops_to
+
+
+    def candidates(self) -> list[tuple[str, int, int]]:
+        """
+        Function description: Lists every pickup option as a (friend, location, hops) tuple, ordered by location, then
+        by train hops, then by the order the friends were given in.
+
+        Input: None
+
+        Output:
+            The list of (friend_name, location, hops) tuples.
+
+        Time complexity: O(P log P)
+
+        Space complexity: O(P)
+        """
+        result = []
+        for location in sorted(self.pickups):
+            result.extend(self.location_candidates(location))
+        return result
+
+
+    def location_candidates(self, location: int) -> list[tuple[str, int, int]]:
+        """
+        Function description: Lists the pickup options at one location, in the order of candidates.
+
+        Input:
+            location: The location to look at.
+
+        Output:
+            The list of (friend_name, location, hops) tuples, empty if no friend can be picked up there.
+
+        Time complexity: O(k log k), where k is the number of friends that can reach the location.
+
+        Space complexity: O(k)
+        """
+        pairs = sorted(self.pickups.get(location, ()), key=lambda pair: (pair[1], pair[0]))
+        return [(self.friends[friend_index][0], location, hops) for friend_index, hops in pairs]
+
+
+    def best_pickup(self, location: int) -> tuple[str, int, int] | None:
+        """
+        Function description: Returns the pickup option at a location with the fewest train hops, the earliest given
+        friend among equals.
+
+        Input:
+            location: The location to look at.
+
+        Output:
+            The (friend_name, location, hops) tuple, or None if no friend can be picked up there.
+
+        Time complexity: O(k), where k is the number of friends that can reach the location.
+
+        Space complexity: O(1)
+        """
+        pairs = self.pickups.get(location)
+        if not pairs:
+            return None
+        friend_index, hops = min(pairs, key=lambda pair: (pair[1], pair[0]))
+        return self.friends[friend_index][0], location, hops
+
+
+    def add_friend(self, name: str, location: int) -> set[int]:
+        """
+        Function description: Adds a friend, given after every existing friend.
+
+        Input:
+            name: The name of the friend.
+            location: The starting location of the friend.
+
+        Output:
+            The set of locations whose pickup options changed.
+
+        Time complexity: O(P_f), the locations the friend reaches plus the tracks leaving them.
+
+        Space complexity: O(P_f)
+        """
+        friend_index = self.next_friend
+        self.next_friend += 1
+        self.friends[friend_index] = (name, location)
+        return self.replace_reach(friend_index, {}, self.reach(friend_index))
+
+
+    def remove_friend(self, name: str) -> tuple[int, set[int]]:
+        """
+        Function description: Removes a friend, the first given with that name.
+
+        Input:
+            name: The name of the friend.
+
+        Output:
+            The location of the removed friend and the set of locations whose pickup options changed.
+
+        Raises:
+            ValueError: If there is no friend with that name.
+
+        Time complexity: O(|F| + P_f), finding the friend and the locations it reached.
+
+        Space complexity: O(P_f)
+        """
+        friend_index = self.friend_index(name)
+        old_reach = self.reach(friend_index)
+        location = self.friends.pop(friend_index)[1]
+        return location, self.replace_reach(friend_index, old_reach, {})
+
+
+    def move_friend(self, name: str, location: int) -> tuple[int, set[int]]:
+        """
+        Function description: Moves a friend, the first given with that name, to a new starting location. The friend keeps
+        its place in the order of the friends.
+
+        Input:
+            name: The name of the friend.
+            location: The new starting location.
+
+        Output:
+            The previous location of the friend and the set of locations whose pickup options changed.
+
+        Raises:
+            ValueError: If there is no friend with that name.
+
+        Time complexity: O(|F| + P_f), the locations reached from the old and the new location.
+
+        Space complexity: O(P_f)
+        """
+        friend_index = self.friend_index(name)
+        old_reach = self.reach(friend_index)
+        old_location = self.friends[friend_index][1]
+        self.friends[friend_index] = (name, location)
+        return old_location, self.replace_reach(friend_index, old_reach, self.reach(friend_index))
+
+
+    def add_track(self, start_vertex: int, end_vertex: int, weight) -> set[int]:
+        """
+        Function description: Adds a track. Only the friends that reach its start in fewer than max_hops hops can use it,
+        so only their searches are run again.
+
+        Input:
+            start_vertex, end_vertex: The ends of the track, which is directed.
+            weight: The travel time of the track.
+
+        Output:
+            The set of locations whose pickup options changed.
+
+        Time complexity: O(A P_f), for the A friends that reach start_vertex in fewer than max_hops hops.
+
+        Space complexity: O(A P_f)
+        """
+        def change() -> None:
+            self.track_adjacency.setdefault(start_vertex, []).append(end_vertex)
+            self.tracks[self.next_track] = (start_vertex, end_vertex, weight)
+            self.next_track += 1
+
+        return self.change_tracks(start_vertex, change)
+
+
+    def remove_track(self, start_vertex: int, end_vertex: int) -> tuple[int, set[int]]:
+        """
+        Function description: Removes a track from start_vertex to end_vertex, the first given if there are several. Only
+        the searches of the friends that reach start_vertex in fewer than max_hops hops are run again.
+
+        Input:
+            start_vertex, end_vertex: The ends of the track.
+
+        Output:
+            The weight of the removed track and the set of locations whose pickup options changed.
+
+        Raises:
+            ValueError: If there is no such track.
+
+        Time complexity: O(|T| + A P_f), finding the track and the searches of the A affected friends.
+
+        Space complexity: O(A P_f)
+        """
+        ends = self.track_adjacency.get(start_vertex, [])
+        if end_vertex not in ends:
+            raise ValueError(f"There is no track {start_vertex} -> {end_vertex}")
+        track_id = next(track_id for track_id, (u, v, _) in self.tracks.items() if (u, v) == (start_vertex, end_vertex))
+        weight = self.tracks[track_id][2]
+
+        def change() -> None:
+            ends.remove(end_vertex)
+            del self.tracks[track_id]
+
+        return weight, self.change_tracks(start_vertex, change)
+
+
+    def change_tracks(self, start_vertex: int, change) -> set[int]:
+        """
+        Function description: Applies a change to the tracks leaving start_vertex and runs the searches of the friends it
+        can affect again, those that reach start_vertex in fewer than max_hops hops.
+
+        Input:
+            start_vertex: The location the changed track leaves from.
+            change: A function that makes the change.
+
+        Output:
+            The set of locations whose pickup options changed.
+
+        Time complexity: O(A P_f), for the A affected friends.
+
+        Space complexity: O(A P_f)
+        """
+        affected = [friend_index for friend_index, hops in self.pickups.get(start_vertex, ()) if hops < self.max_hops]
+        old_reaches = [self.reach(friend_index) for friend_index in affected]
+        change()
+
+        touched = set()
+        for friend_index, old_reach in zip(affected, old_reaches):
+            touched |= self.replace_reach(friend_index, old_reach, self.reach(friend_index))
+        return touched
+
+
+    def replace_reach(self, friend_index: int, old_reach: dict[int, int], new_reach: dict[int, int]) -> set[int]:
+        """
+        Function description: Replaces the pickup pairs of a friend found by an old search with those of a new one.
+
+        Input:
+            friend_index: The friend.
+            old_reach, new_reach: The locations the friend reached before and after, with their hops, see reach.
+
+        Output:
+            The set of locations whose pickup options changed.
+
+        Time complexity: O(P_f k), where k is the number of friends that can be picked up at a location.
+
+        Space complexity: O(P_f)
+        """
+        touched = set()
+        for location, hops in old_reach.items():
+            if new_reach.get(location) != hops:
+                pairs = [pair for pair in self.pickups[location] if pair[0] != friend_index]
+                if pairs:
+                    self.pickups[location] = pairs
+                else:
+                    del self.pickups[location]
+                touched.add(location)
+        for location, hops in new_reach.items():
+            if old_reach.get(location) != hops:
+                self.pickups.setdefault(location, []).append((friend_index, hops))
+                touched.add(location)
+        return touched
+
+
+    def friend_index(self, name: str) -> int:
+        """
+        Function description: Finds the first given friend with a name.
+
+        Input:
+            name: The name of the friend.
+
+        Output:
+            The index of the friend.
+
+        Raises:
+            ValueError: If there is no friend with that name.
+
+        Time complexity: O(|F|)
+
+        Space complexity: O(1)
+        """
+        for friend_index, (friend_name, _) in self.friends.items():
+            if friend_name == name:
+                return friend_index
+        raise ValueError(f"There is no friend called {name}")
+
+
+    def update_candidates(self, candidates: list, locations: set, touched: set[int], vertex_count: int) -> None:
+        """
+        Function description: Brings a pickup candidate list, ordered as candidates orders it, and the set of its locations
+        up to date after a change, by replacing the options of every touched location in place.
+
+        Input:
+            candidates: The candidate list, locations at or above vertex_count left out.
+            locations: The set of the locations in candidates.
+            touched: The locations whose pickup options changed.
+            vertex_count: The number of locations of the graph.
+
+        Output: None
+
+        Time complexity: O(|touched| log P) to find the options of each touched location, plus moving the end of the list
+        when a location gains or loses options.
+
+        Space complexity: O(k) per touched location.
+        """
+        location_of = itemgetter(1)
+        for location in touched:
+            if location >= vertex_count:
+                continue
+            lo = bisect_left(candidates, location, key=location_of)
+            hi = bisect_right(candidates, location, lo=lo, key=location_of)
+            options = self.location_candidates(location)
+            candidates[lo:hi] = options
+            if options:
+                locations.add(location)
+            else:
+                locations.discard(location)
@@ -0,0 +1,225 @@
+import sys
+from collections import OrderedDict
+
+from src.repair import repair_tree
+
+
+class TreeCache:
+    """
+    Class description:
+    A bounded cache of shortest path trees, keyed by the location the tree was grown from, with least recently used (LRU)
+    eviction. It can be limited by the number of trees, by an approximate memory budget in bytes, or both.
+
+    Each entry remembers which locations it is guaranteed to be final for: either every location (a complete tree) or
+    the targets of the early exit search that built it. A lookup only hits if the entry covers what the caller needs.
+
+    The cache remembers the version of the graph it was filled from and empties itself as soon as the graph's version
+    changes, so a modified graph never serves out of date trees. A single road change can instead be reported with
+    repair, which repairs the complete trees in place of dropping them.
+    """
+    def __init__(self, graph, max_entries: int = None, max_bytes: int = None) -> None:
+        """
+        Function description: Initialises an empty cache for the trees of the given graph.
+
+        Input:
+            graph: The Graph or CSRGraph the trees are computed on, its version attribute is checked on every access.
+            max_entries (optional): The largest number of trees kept, None for no limit.
+            max_bytes (optional): The approximate memory budget of the kept trees in bytes, None for no limit.
+
+        Output: None
+
+        Time and space complexity: O(1)
+        """
+        self.graph = graph
+        self.graph_version = graph.version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.entries = OrderedDict() # source -> (tree, covered, size), least recently used first
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get(self, source: int, targets=None) -> tuple[list, list] | None:
+        """
+        Function description: Looks up the tree grown from source and marks it as the most recently used.
+
+        Input:
+            source: The location the tree was grown from.
+            targets (optional): The locations the caller needs final distances for, None if it needs a complete tree.
+
+        Output:
+            The cached (distance, parent) tuple, or None if there is no entry for source or it does not cover targets.
+
+        Time complexity: O(1) for a complete tree, O(|targets|) otherwise.
+
+        Space complexity: O(1)
+        """
+        self.check_graph()
+
+        entry = self.entries.get(source)
+        if entry is not None:
+            tree, covered, _ = entry
+            if covered is None or (targets is not None and covered.issuperset(targets)):
+                self.entries.move_to_end(source)
+                self.hits += 1
+                return tree
+
+        self.misses += 1
+        return None
+
+
+    def put(self, source: int, tree: tuple[list, list], targets=None) -> None:
+        """
+        Function description: Stores the tree grown from source, then evicts the least recently used trees until the cache
+        is within its limits again.
+
+        Input:
+            source: The location the tree was grown from.
+            tree: The (distance, parent) tuple. It is shared with the caller, neither must modify it afterwards.
+            targets (optional): The targets the search stopped at, None if the tree is complete.
+
+        Output: None
+
+        Time complexity: O(|targets|) plus O(1) per evicted tree.
+
+        Space complexity: O(|targets|)
+        """
+        self.check_graph()
+
+        old_entry = self.entries.pop(source, None)
+        if old_entry is not None:
+            self.total_bytes -= old_entry[2]
+
+        covered = None if targets is None else frozenset(targets)
+        size = self.tree_bytes(tree)
+        self.entries[source] = (tree, covered, size)
+        self.total_bytes += size
+
+        while self.entries and self.over_budget():
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+
+
+    def over_budget(self) -> bool:
+        """
+        Function description: Checks whether the cache holds more trees or bytes than it is allowed to.
+
+        Input: None
+
+        Output:
+            True if a limit is exceeded, False otherwise.
+
+        Time and space complexity: O(1)
+        """
+        if self.max_entries is not None and len(self.entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+
+    def tree_bytes(self, tree: tuple[list, list]) -> int:
+        """
+        Function description: Approximates the memory held by a tree: the two arrays plus one integer object per location.
+
+        Input:
+            tree: The (distance, parent) tuple.
+
+        Output:
+            The approximate size in bytes.
+
+        Time and space complexity: O(1)
+        """
+        distance, parent = tree
+        return sys.getsizeof(distance) + sys.getsizeof(parent) + 32 * len(distance)
+
+
+    def check_graph(self) -> None:
+        """
+        Function description: Empties the cache if the graph has been modified since the cached trees were computed.
+
+        Input: None
+
+        Output: None
+
+        Time complexity: O(1), or O(N) to drop N trees after a change.
+
+        Space complexity: O(1)
+        """
+        if self.graph.version != self.graph_version:
+            self.clear()
+            self.graph_version = self.graph.version
+
+
+    def repair(self, u: int, v: int, old_weight, new_weight) -> None:
+        """
+        Function description: Brings the cache up to date with a change of the road u - v. If it is the only change since
+        the cache was last used, the complete trees are repaired, see repair.repair_tree. Trees of early exit searches
+        only hold final distances for the locations they settled, which a change can reorder, so they are dropped. After
+        more than one change the cache is emptied.
+
+        Input:
+            u, v: The ends of the road.
+            old_weight: The weight before the change, None if the road was added.
+            new_weight: The weight after the change, None if the road was removed.
+
+        Output: None
+
+        Time complexity: O(|L|) plus the repair of each complete tree, see repair.repair_tree.
+
+        Space complexity: O(|L|) per repaired tree.
+        """
+        if self.graph.version != self.graph_version + 1:
+            self.check_graph() # more than one change, the trees cannot be repaired
+            return
+
+        for source, (tree, covered, size) in list(self.entries.items()):
+            if covered is None:
+                self.entries[source] = (repair_tree(self.graph, tree, u, v, old_weight, new_weight), None, size)
+            else:
+                del self.entries[source]
+                self.total_bytes -= size
+        self.graph_version = self.graph.version
+
+
+    def clear(self) -> None:
+        """
+        Function description: Removes every tree, the hit and miss statistics are kept.
+
+        Input: None
+
+        Output: None
+
+        Time complexity: O(N)
+
+        Space complexity: O(1)
+        """
+        self.entries.clear()
+        self.total_bytes = 0
+
+
+    def stats(self) -> dict:
+        """
+        Function description: Returns the usage statistics of the cache.
+
+        Input: None
+
+        Output:
+            A dictionary with the number of hits, misses, evictions, cached trees and approximate bytes held.
+
+        Time and space complexity: O(1)
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+        }
+
+
+    def __len__(self) -> int:
+        return len(self.entries)
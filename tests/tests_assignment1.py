@@ -1,4 +1,10 @@
 from src.assignment1 import CityMap
+from src.bucketqueue import BucketQueue
+from src.minheap import IndexedMinHeap
+from src import arrayengine
+from unittest.mock import patch
+import os
+import tempfile
 import unittest
 
 class TestCityMap(unittest.TestCase):
@@ -372,5 +378,507 @@ class TestCityMap(unittest.TestCase):
         error_message = f'Current wrong path: {path}'
         self.assertEqual(path, expected, error_message)
 
+    def test_dijkstras_queue_types(self):
+        # Every priority queue type must give the same shortest distances
+        roads = [(i, (i + 1) % 100, (i * 7) % 5 + 1) for i in range(100)] + [(i, (i + 37) % 100, 9) for i in range(0, 100, 3)]
+        tracks = []
+        friends = [("Grizz", 50)]
+        myCity = CityMap(roads, tracks, friends)
+
+        binary_distances, _ = myCity.dijkstras(start_node=0, queue="binary")
+        for queue in ["indexed", "bucket", "auto"]:
+            distances, _ = myCity.dijkstras(start_node=0, queue=queue)
+            self.assertEqual(distances, binary_distances)
+
+        with self.assertRaises(ValueError):
+            myCity.dijkstras(start_node=0, queue="fibonacci")
+
+
+    def test_auto_queue_selection(self):
+        # Small integer weights use the bucket queue, large or fractional weights use the indexed heap
+        friends = [("Grizz", 0)]
+        self.assertIsInstance(CityMap([(0, 1, 2), (1, 2, 3)], [], friends).new_priority_queue("auto"), BucketQueue)
+        self.assertIsInstance(CityMap([(0, 1, 2), (1, 2, 30)], [], friends).new_priority_queue("auto"), IndexedMinHeap)
+
+        fractional = CityMap([(0, 1, 0.5), (1, 2, 1.5)], [], friends)
+        self.assertIsInstance(fractional.new_priority_queue("auto"), IndexedMinHeap)
+        self.assertEqual(fractional.dijkstras(start_node=0)[0], [0, 0.5, 2.0])
+        with self.assertRaises(ValueError):
+            fractional.new_priority_queue("bucket")
+
+    def test_queue_ties(self):
+        # On a grid of unit roads every queue finds the same distances, but only the default binary heap settles equal 
+        # distances in the order of the original implementation, so it alone keeps its routes on ties
+        side = 3
+        roads = [(y * side + x, y * side + x + 1, 1) for y in range(side) for x in range(side - 1)]
+        roads += [(y * side + x, (y + 1) * side + x, 1) for y in range(side - 1) for x in range(side)]
+        myCity = CityMap(roads, [], [("Grizz", 0)])
+
+        binary_distances, _ = myCity.dijkstras(start_node=0, queue="binary")
+        self.assertEqual(myCity.dijkstras(start_node=0, queue="bucket")[0], binary_distances)
+        self.assertEqual(myCity.dijkstras(start_node=0)[0], binary_distances)
+
+        for start, end, binary_route, bucket_route in [(0, 5, [0, 1, 4, 5], [0, 1, 2, 5]), (1, 6, [1, 4, 7, 6], [1, 0, 3, 6])]:
+            self.assertEqual(myCity.dijkstras(start_node=start, end_node=end, bidirectional=False), binary_route)
+            self.assertEqual(myCity.dijkstras(start_node=start, end_node=end, bidirectional=False, queue="binary"), binary_route)
+            self.assertEqual(myCity.dijkstras(start_node=start, end_node=end, bidirectional=False, queue="bucket"), bucket_route)
+            self.assertEqual(len(bucket_route), len(binary_route))
+
+    def test_plan_route_from_trees(self):
+        # The route rebuilt from the two shortest path trees must follow roads and cost exactly the total time
+        roads = [(i, (i + 1) % 30, (i * 5) % 3 + 1) for i in range(30)] + [(i, (i + 11) % 30, 4) for i in range(0, 30, 4)]
+        tracks = [(3, 17, 1), (17, 25, 1), (25, 8, 1)]
+        friends = [("Grizz", 3), ("Ice", 21)]
+        myCity = CityMap(roads, tracks, friends)
+        weights = {}
+        for u, v, w in roads:
+            weights[(u, v)] = weights[(v, u)] = w
+
+        for start, destination in [(0, 15), (7, 7), (29, 12), (10, 2)]:
+            total_time, route, _, pickup = myCity.plan(start, destination)
+            self.assertEqual(route[0], start)
+            self.assertEqual(route[-1], destination)
+            self.assertIn(pickup, route)
+            self.assertEqual(sum(weights[(route[i], route[i + 1])] for i in range(len(route) - 1)), total_time)
+
+    def test_plan_route_ties(self):
+        # On a grid of unit roads many routes have the same length. By default plan keeps the route of the original 
+        # implementation (searches from the start and from the pickup), tree_route may pick another one of the same length
+        side = 4
+        roads = [(y * side + x, y * side + x + 1, 1) for y in range(side) for x in range(side - 1)]
+        roads += [(y * side + x, (y + 1) * side + x, 1) for y in range(side - 1) for x in range(side)]
+        expected = {
+            (0, 15): ([0, 1, 5, 9, 10, 14, 15], [0, 1, 5, 6, 10, 14, 15]),
+            (3, 12): ([3, 2, 6, 5, 4, 8, 12], [3, 2, 6, 5, 9, 13, 12]),
+            (15, 0): ([15, 14, 10, 6, 5, 4, 0], [15, 14, 10, 6, 5, 1, 0]),
+        }
+        for backend in ("list", "csr"):
+            myCity = CityMap(roads, [], [("Grizz", 5)], backend=backend)
+            for (start, destination), (route, tree_route) in expected.items():
+                self.assertEqual(myCity.plan(start, destination), (6, route, "Grizz", 5))
+                self.assertEqual(myCity.plan(start, destination, tree_route=True), (6, tree_route, "Grizz", 5))
+            self.assertEqual(myCity.plan_many(list(expected)), [(6, route, "Grizz", 5) for route, _ in expected.values()])
+            self.assertEqual(myCity.plan_many(list(expected), tree_route=True), 
+                             [(6, route, "Grizz", 5) for _, route in expected.values()])
+
+    def test_csr_backend(self):
+        # The CSR backend must give exactly the same plans as the adjacency list backend
+        roads = [(i, (i + 1) % 100, (i * 7) % 5 + 1) for i in range(100)] + [(i, (i + 37) % 100, 9) for i in range(0, 100, 3)]
+        tracks = [(i, (i + 2) % 100, 1) for i in range(0, 100, 5)]
+        friends = [("Grizz", 50), ("Ice", 99), ("Bebe", 10)]
+        listCity = CityMap(roads, tracks, friends)
+        csrCity = CityMap(roads, tracks, friends, backend="csr")
+
+        for start, destination in [(0, 99), (3, 3), (42, 17), (88, 61)]:
+            self.assertEqual(csrCity.plan(start, destination), listCity.plan(start, destination))
+
+        # the adjacency list is sized by the number of roads, so only compare the real locations
+        csr_distances, csr_parents = csrCity.dijkstras(start_node=7)
+        list_distances, list_parents = listCity.dijkstras(start_node=7)
+        self.assertEqual(csr_distances, list_distances[:100])
+        self.assertEqual(csr_parents, list_parents[:100])
+
+        with self.assertRaises(ValueError):
+            CityMap(roads, tracks, friends, backend="matrix")
+
+    def test_max_train_hops(self):
+        # The further the friend can ride the train, the closer the pickup gets to the route from 3 to 4
+        roads = [(0,1,10), (1,2,10), (2,3,10), (3,4,10)]
+        tracks = [(2,3,1), (1,2,1), (0,1,1), (3,4,1)]
+        friends = [("Grizz", 0)]
+
+        expected = {
+            0: (70, [3,2,1,0,1,2,3,4], "Grizz", 0),
+            1: (50, [3,2,1,2,3,4], "Grizz", 1),
+            2: (30, [3,2,3,4], "Grizz", 2),
+            3: (10, [3,4], "Grizz", 3),
+            4: (10, [3,4], "Grizz", 3), # 4 is reachable too, but with more train hops
+        }
+        for max_hops, plan in expected.items():
+            for backend in ("list", "csr"):
+                myCity = CityMap(roads, tracks, friends, backend=backend, max_hops=max_hops)
+                self.assertEqual(myCity.plan(start=3, destination=4), plan)
+
+        with self.assertRaises(ValueError):
+            CityMap(roads, tracks, friends, max_hops=-1)
+
+    def test_bidirectional_dijkstras(self):
+        # The bidirectional search must find paths as short as a full search, through the roads of the city
+        roads = [(i, (i + 1) % 60, (i * 7) % 5 + 1) for i in range(60)] + [(i, (i + 23) % 60, 6) for i in range(0, 60, 4)]
+        tracks = []
+        friends = [("Grizz", 5)]
+        myCity = CityMap(roads, tracks, friends)
+        weights = {}
+        for u, v, w in roads:
+            weights[(u, v)] = weights[(v, u)] = w
+
+        for start in range(0, 60, 7):
+            distances, _ = myCity.dijkstras(start_node=start)
+            full_settled = myCity.settled_count
+            for end in range(0, 60, 5):
+                length, path = myCity.bidirectional_dijkstras(start_node=start, end_node=end)
+                self.assertEqual(length, distances[end])
+                self.assertLessEqual(myCity.settled_count, full_settled)
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], end)
+                self.assertEqual(sum(weights[(path[i], path[i + 1])] for i in range(len(path) - 1)), length)
+                self.assertEqual(myCity.dijkstras(start_node=start, end_node=end), path)
+                self.assertEqual(myCity.bidirectional_dijkstras(start_node=start, end_node=end, queue="binary")[0], length)
+
+        self.assertEqual(myCity.bidirectional_dijkstras(start_node=9, end_node=9), (0, [9]))
+
+    def test_dijkstras_targets_and_bound(self):
+        # A line of locations 0 - 1 - ... - 19 with unit roads
+        roads = [(i, i + 1, 1) for i in range(19)]
+        tracks = []
+        friends = [("Grizz", 3)]
+        myCity = CityMap(roads, tracks, friends)
+
+        distances, parents = myCity.dijkstras(start_node=0, targets={2, 4})
+        self.assertEqual(myCity.settled_count, 5)
+        self.assertEqual(distances[:5], [0, 1, 2, 3, 4])
+        self.assertEqual(parents[4], 3)
+
+        distances, _ = myCity.dijkstras(start_node=10, max_distance=3)
+        self.assertEqual(myCity.settled_count, 7)
+        self.assertEqual(distances[7:14], [3, 2, 1, 0, 1, 2, 3])
+
+        distances, _ = myCity.dijkstras(start_node=5, targets=set())
+        self.assertEqual(myCity.settled_count, 0)
+        self.assertEqual(distances[5], 0)
+
+        self.assertEqual(myCity.dijkstras(start_node=0, end_node=6, bidirectional=False), [0, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(myCity.settled_count, 7)
+
+        # targets given with end_node are settled too, and the cached tree covers both
+        cachedCity = CityMap(roads, tracks, friends, cache_entries=4)
+        self.assertEqual(cachedCity.dijkstras(start_node=0, end_node=2, bidirectional=False, targets={9}), [0, 1, 2])
+        self.assertEqual(cachedCity.settled_count, 10)
+        distances, _ = cachedCity.dijkstras(start_node=0, targets={2, 9})
+        self.assertEqual(cachedCity.settled_count, 0)
+        self.assertEqual(distances[9], 9)
+
+        # plan only settles up to the pickup from each end, then from the pickup up to the destination
+        self.assertEqual(myCity.plan(start=1, destination=5, tree_route=True), (4, [1, 2, 3, 4, 5], "Grizz", 3))
+        self.assertEqual(myCity.settled_count, 8)
+        self.assertEqual(myCity.plan(start=1, destination=5), (4, [1, 2, 3, 4, 5], "Grizz", 3))
+        self.assertEqual(myCity.settled_count, 8 + 5)
+
+    def test_dijkstras_unreachable_end_node(self):
+        # 3 - 4 is cut off from the triangle 0 - 1 - 2, every search returns an empty path to it
+        roads = [(0, 1, 1), (0, 2, 1), (1, 2, 1), (3, 4, 1)]
+        for backend in ("list", "csr"):
+            myCity = CityMap(roads, [], [("Grizz", 1)], backend=backend, cache_entries=4)
+            self.assertEqual(myCity.dijkstras(start_node=0, end_node=4), [])
+            self.assertEqual(myCity.dijkstras(start_node=0, end_node=4, bidirectional=False), [])
+            self.assertEqual(myCity.dijkstras(start_node=0, end_node=4), []) # from the cached tree
+            if backend == "csr":
+                self.assertEqual(myCity.dijkstras(start_node=3, end_node=1, bidirectional=False, engine="array"), [])
+            myCity.build_contraction_hierarchy()
+            self.assertEqual(myCity.dijkstras(start_node=0, end_node=4), [])
+            self.assertEqual(myCity.dijkstras(start_node=4, end_node=3), [4, 3])
+
+    def test_plan_many(self):
+        # A batch must give the same results as planning each query on its own, in input order
+        roads = [(3, 4, 2), (4, 0, 5), (2, 4, 2), (0, 2, 2), (1, 0, 3)]
+        tracks = [(4, 1, 2)]
+        friends = [('Seulgi', 4), ('Winter', 3)]
+        myCity = CityMap(roads, tracks, friends)
+
+        queries = [(0, 1), (3, 1), (4, 4), (1, 0), (0, 1), (2, 3), (1, 1)]
+        expected = [myCity.plan(start, destination) for start, destination in queries]
+        self.assertEqual(myCity.plan_many(queries), expected)
+        self.assertEqual(myCity.plan_many([]), [])
+
+
+    def test_plan_many_shares_trees(self):
+        roads = [(i, (i + 1) % 50, (i * 3) % 4 + 1) for i in range(50)]
+        tracks = [(10, 30, 1)]
+        friends = [("Grizz", 10), ("Ice", 40)]
+        myCity = CityMap(roads, tracks, friends)
+
+        queries = [(s, d) for s in (0, 25) for d in (5, 45)] * 3
+        results = myCity.plan_many(queries)
+        batch_settled = myCity.settled_count
+
+        looped_settled = 0
+        for (start, destination), result in zip(queries, results):
+            self.assertEqual(result, myCity.plan(start, destination))
+            looped_settled += myCity.settled_count
+
+        # 4 distinct endpoints are searched once each instead of 2 searches for each of the 12 queries
+        self.assertEqual(batch_settled * 6, looped_settled)
+
+    def test_plan_many_workers(self):
+        # The worker processes read the graph from shared memory and must answer exactly like plan_many in this process
+        roads = [(i, (i + 1) % 100, (i * 7) % 5 + 1) for i in range(100)] + [(i, (i + 37) % 100, 9) for i in range(0, 100, 3)]
+        tracks = [(i, (i + 2) % 100, 1) for i in range(0, 100, 5)]
+        friends = [("Grizz", 50), ("Ice", 99), ("Bebe", 10)]
+        queries = [(i, (i * 31 + 7) % 100) for i in range(0, 100, 4)]
+
+        for backend in ("list", "csr"):
+            myCity = CityMap(roads, tracks, friends, backend=backend)
+            expected = myCity.plan_many(queries)
+            self.assertEqual(myCity.plan_many(queries, workers=2, chunk_size=3), expected)
+            self.assertEqual(myCity.plan_many(queries, workers=1), expected)
+
+        self.assertEqual(myCity.plan_many([], workers=2), [])
+        with self.assertRaises(ValueError):
+            myCity.plan_many(queries, workers=0)
+
+        # a graph the snapshot format cannot hold is answered in this process
+        for float_roads in ([(0,1,1.5), (1,2,2.0), (2,3,1.0)], [(0,1,1), (1,2,2 ** 31), (2,3,1)]):
+            myCity = CityMap(float_roads, [(0,1,1)], [("Grizz", 1)])
+            self.assertEqual(myCity.plan_many([(0, 3), (3, 2)], workers=2), myCity.plan_many([(0, 3), (3, 2)]))
+
+    def test_array_engine(self):
+        # The array engine must return exactly what the python loop returns, with and without NumPy
+        roads = [(i, (i + 1) % 80, (i * 7) % 5 + 1) for i in range(80)] + [(0, i, 20 + i % 3) for i in range(2, 78, 2)]
+        roads += [(80, 81, 4)] # a part of the city that cannot be reached from the rest
+        tracks = [(i, (i + 2) % 80, 1) for i in range(0, 80, 5)]
+        friends = [("Grizz", 50), ("Ice", 79), ("Bebe", 10)]
+        myCity = CityMap(roads, tracks, friends, backend="csr")
+
+        searches = [dict(start_node=0), dict(start_node=41), dict(start_node=41, targets={3, 60}), 
+                    dict(start_node=7, max_distance=9), dict(start_node=7, end_node=33, bidirectional=False), 
+                    dict(start_node=80)]
+        # with NumPy, every location is vectorised as if it were a hub
+        engines = [arrayengine.numpy, None] if arrayengine.numpy is not None else [None]
+        for numpy in engines:
+            with patch.object(arrayengine, "numpy", numpy), patch.object(arrayengine, "VECTOR_DEGREE", 1):
+                for queue in ("bucket", "indexed", "binary"):
+                    for search in searches:
+                        expected = myCity.dijkstras(queue=queue, engine="python", **search)
+                        expected_settled = myCity.settled_count
+                        self.assertEqual(myCity.dijkstras(queue=queue, engine="array", **search), expected)
+                        self.assertEqual(myCity.settled_count, expected_settled)
+
+        arrayCity = CityMap(roads, tracks, friends, backend="csr", engine="array")
+        self.assertEqual(arrayCity.plan(0, 60), myCity.plan(0, 60))
+        with self.assertRaises(ValueError):
+            CityMap(roads, tracks, friends, engine="array").dijkstras(start_node=0)
+        with self.assertRaises(ValueError):
+            myCity.dijkstras(start_node=0, engine="simd")
+
+    def test_distance_matrix(self):
+        roads = [(i, (i + 1) % 60, (i * 7) % 5 + 1) for i in range(60)] + [(i, (i + 23) % 60, 6) for i in range(0, 60, 4)]
+        roads += [(60, 61, 3)] # unreachable from the rest of the city
+        myCity = CityMap(roads, [], [("Grizz", 5)])
+        full = {s: myCity.dijkstras(start_node=s)[0] for s in range(62)}
+
+        sources = [3, 17, 44, 60, 17]
+        targets = [0, 59, 61, 3]
+        expected = [[full[s][t] for t in targets] for s in sources]
+        self.assertEqual([list(row) for row in myCity.distance_matrix(sources, targets)], expected)
+        self.assertEqual([list(row) for row in myCity.distance_matrix(sources, targets, workers=2, chunk_size=1)], expected)
+
+        # the same set of sources and targets only searches for the entries above the diagonal
+        points = [8, 31, 50, 2, 61]
+        expected = [[full[s][t] for t in points] for s in points]
+        self.assertEqual([list(row) for row in myCity.distance_matrix(points, symmetric=False)], expected)
+        for workers in (None, 2):
+            self.assertEqual([list(row) for row in myCity.distance_matrix(points, workers=workers)], expected)
+        myCity.distance_matrix(points)
+        symmetric_settled = myCity.settled_count
+        myCity.distance_matrix(points, symmetric=False)
+        self.assertLess(symmetric_settled, myCity.settled_count)
+
+        self.assertEqual(myCity.distance_matrix([]), [])
+
+    def test_astar_landmarks(self):
+        # A* with landmark bounds must find shortest paths, and save the searches from exploring the whole grid
+        side = 12
+        roads = [(y * side + x, y * side + x + 1, (x * 7 + y) % 5 + 1) for y in range(side) for x in range(side - 1)]
+        roads += [(y * side + x, (y + 1) * side + x, (x + y * 3) % 4 + 1) for y in range(side - 1) for x in range(side)]
+        roads += [(144, 145, 2)] # unreachable from the grid
+        myCity = CityMap(roads, [], [("Grizz", 5)], backend="csr")
+        full = {s: myCity.dijkstras(start_node=s)[0] for s in (0, 13, 77, 143, 144)}
+
+        with self.assertRaises(ValueError):
+            myCity.astar_dijkstras(0, 143)
+
+        myCity.build_landmarks(count=4)
+        self.assertEqual(len(myCity.landmarks), 4)
+        # the first landmark is the location furthest from location 0
+        self.assertEqual(myCity.landmarks.landmarks[0], max(range(side * side), key=lambda v: full[0][v]))
+        weight = {}
+        for u, v, w in roads:
+            weight[u, v] = weight[v, u] = w
+
+        for start in full:
+            for end in range(side * side + 2):
+                length, path = myCity.astar_dijkstras(start, end)
+                self.assertEqual(length, full[start][end])
+                if length != float('inf'):
+                    self.assertEqual(path[0], start)
+                    self.assertEqual(path[-1], end)
+                    self.assertEqual(sum(weight[a, b] for a, b in zip(path, path[1:])), length)
+
+        # point to point dijkstras now uses A*, and settles fewer locations than the plain search
+        path = myCity.dijkstras(start_node=13, end_node=130)
+        astar_settled = myCity.settled_count
+        self.assertEqual(path, myCity.astar_dijkstras(13, 130)[1])
+        myCity.dijkstras(start_node=13, targets={130})
+        self.assertLess(astar_settled, myCity.settled_count)
+
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            myCity.save_landmarks(path)
+            loadedCity = CityMap(roads, [], [("Grizz", 5)], backend="csr")
+            loadedCity.load_landmarks(path)
+            self.assertEqual(loadedCity.landmarks.landmarks, myCity.landmarks.landmarks)
+            self.assertEqual(loadedCity.landmarks.distances, myCity.landmarks.distances)
+            with self.assertRaises(ValueError):
+                CityMap(roads[:-1], [], [("Grizz", 5)], backend="csr").load_landmarks(path)
+        finally:
+            os.remove(path)
+
+    def test_contraction_hierarchy(self):
+        # queries through the hierarchy must find shortest paths made of real roads, and plan the same pickups
+        side = 10
+        roads = [(y * side + x, y * side + x + 1, (x * 7 + y) % 5 + 1) for y in range(side) for x in range(side - 1)]
+        roads += [(y * side + x, (y + 1) * side + x, (x + y * 3) % 4 + 1) for y in range(side - 1) for x in range(side)]
+        roads += [(100, 101, 2)] # unreachable from the grid
+        tracks = [(5, 55, 3), (55, 94, 2), (94, 40, 1), (101, 100, 1)]
+        friends = [("Grizz", 5), ("Ice", 94), ("Panda", 101)]
+        for backend in ("list", "csr"):
+            myCity = CityMap(roads, tracks, friends, backend=backend)
+            queries = [(0, 99), (13, 13), (77, 2), (45, 60), (0, 100)]
+            expected = [myCity.plan(start, destination) for start, destination in queries]
+            full = {s: myCity.dijkstras(start_node=s)[0] for s in (0, 13, 77, 100)}
+
+            myCity.build_contraction_hierarchy()
+            self.assertTrue(myCity.has_contraction_hierarchy())
+            weight = {}
+            for u, v, w in roads:
+                weight[u, v] = weight[v, u] = w
+
+            for start in full:
+                for end in range(side * side + 2):
+                    length, path = myCity.contraction.query(start, end)
+                    self.assertEqual(length, full[start][end])
+                    if length != float('inf'):
+                        self.assertEqual(path[0], start)
+                        self.assertEqual(path[-1], end)
+                        self.assertEqual(sum(weight[a, b] for a, b in zip(path, path[1:])), length)
+                    else:
+                        self.assertEqual(path, [])
+
+            # plan gives the same times and pickups, and its route is a real route of that length through the pickup
+            for (start, destination), result, plain in zip(queries, myCity.plan_many(queries), expected):
+                total_time, route, friend, pickup = result
+                self.assertEqual((total_time, friend, pickup), (plain[0], plain[2], plain[3]))
+                if total_time != float('inf'):
+                    self.assertEqual((route[0], route[-1]), (start, destination))
+                    self.assertIn(pickup, route)
+                    self.assertEqual(sum(weight[a, b] for a, b in zip(route, route[1:])), total_time)
+
+    def test_hub_labels(self):
+        # label lookups must give shortest distances, and plan must pick the same pickups as without labels
+        side = 9
+        roads = [(y * side + x, y * side + x + 1, (x * 5 + y) % 6 + 1) for y in range(side) for x in range(side - 1)]
+        roads += [(y * side + x, (y + 1) * side + x, (x + y * 2) % 3 + 1) for y in range(side - 1) for x in range(side)]
+        roads += [(81, 82, 4)] # unreachable from the grid
+        tracks = [(3, 30, 2), (30, 70, 5), (82, 81, 1)]
+        friends = [("Grizz", 3), ("Ice", 70), ("Panda", 82)]
+        myCity = CityMap(roads, tracks, friends, backend="csr")
+        queries = [(0, 80), (10, 10), (44, 8), (0, 81)]
+        expected = myCity.plan_many(queries)
+        full = {s: myCity.dijkstras(start_node=s)[0] for s in range(side * side + 2)}
+
+        with self.assertRaises(ValueError):
+            myCity.save_hub_labels("unused")
+        myCity.build_hub_labels()
+        self.assertTrue(myCity.has_hub_labels())
+        for start in full:
+            for end in range(side * side + 2):
+                self.assertEqual(myCity.hub_labels.distance(start, end)[0], full[start][end])
+        self.assertEqual([list(row) for row in myCity.distance_matrix([0, 40, 81])], 
+                         [[full[s][t] for t in (0, 40, 81)] for s in (0, 40, 81)])
+
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            myCity.save_hub_labels(path)
+            loadedCity = CityMap(roads, tracks, friends, backend="csr")
+            loadedCity.load_hub_labels(path)
+            self.assertEqual(loadedCity.hub_labels.hubs, myCity.hub_labels.hubs)
+            # no contraction hierarchy, the route of the chosen pickup comes from plain searches
+            for city in (myCity, loadedCity):
+                for query, result, plain in zip(queries, city.plan_many(queries), expected):
+                    total_time, route, friend, pickup = result
+                    self.assertEqual((total_time, friend, pickup), (plain[0], plain[2], plain[3]))
+                    if total_time != float('inf'):
+                        self.assertIn(pickup, route)
+                        self.assertEqual((route[0], route[-1]), query)
+            with self.assertRaises(ValueError):
+                CityMap(roads[:-1], [], [("Grizz", 5)], backend="csr").load_hub_labels(path)
+        finally:
+            os.remove(path)
+
+    def test_fused_plan(self):
+        # the layered search must pick the same time, friend and pickup as plan, with a real route through the pickup
+        side = 8
+        roads = [(y * side + x, y * side + x + 1, (x * 3 + y) % 4 + 1) for y in range(side) for x in range(side - 1)]
+        roads += [(y * side + x, (y + 1) * side + x, (x + y) % 3 + 1) for y in range(side - 1) for x in range(side)]
+        roads += [(64, 65, 1)] # unreachable from the grid
+        tracks = [(9, 27, 2), (27, 50, 1), (50, 9, 3), (62, 12, 2), (65, 64, 1)]
+        friends = [("Grizz", 9), ("Ice", 62), ("Panda", 45), ("Nom", 9), ("Chloe", 65)]
+        weight = {}
+        for u, v, w in roads:
+            weight[u, v] = weight[v, u] = w
+
+        for backend in ("list", "csr"):
+            myCity = CityMap(roads, tracks, friends, backend=backend)
+            for start in range(0, 66, 5):
+                for destination in range(3, 66, 7):
+                    total_time, route, friend, pickup = myCity.plan(start, destination, fused=True)
+                    expected = myCity.plan(start, destination)
+                    self.assertEqual((total_time, friend, pickup), (expected[0], expected[2], expected[3]))
+                    if total_time == float('inf'):
+                        self.assertEqual(route, [])
+                    else:
+                        self.assertEqual((route[0], route[-1]), (start, destination))
+                        self.assertIn(pickup, route)
+                        self.assertEqual(sum(weight[a, b] for a, b in zip(route, route[1:])), total_time)
+
+        # close endpoints next to a pickup settle far fewer states than the two searches reaching every pickup
+        myCity = CityMap(roads, tracks, friends)
+        myCity.plan(8, 10)
+        two_searches = myCity.settled_count
+        myCity.plan(8, 10, fused=True)
+        self.assertLess(myCity.settled_count, two_searches)
+
+    def test_plan_top_k(self):
+        # the options must come out in the order of an exhaustive ranking, the first being the plan of plan
+        side = 7
+        roads = [(y * side + x, y * side + x + 1, (x * 5 + y) % 4 + 1) for y in range(side) for x in range(side - 1)]
+        roads += [(y * side + x, (y + 1) * side + x, (x + 2 * y) % 3 + 1) for y in range(side - 1) for x in range(side)]
+        roads += [(49, 50, 2)] # unreachable from the grid
+        tracks = [(8, 20, 2), (20, 33, 1), (33, 8, 3), (40, 5, 2), (50, 49, 1)]
+        friends = [("Grizz", 8), ("Ice", 40), ("Panda", 24), ("Nom", 8), ("Chloe", 50)]
+        myCity = CityMap(roads, tracks, friends, backend="csr")
+        candidates = myCity.pickup_candidates()
+
+        for start, destination in [(0, 48), (24, 24), (6, 42), (3, 10)]:
+            distance_from_start = myCity.dijkstras(start_node=start)[0]
+            distance_from_destination = myCity.dijkstras(start_node=destination)[0]
+            ranking = sorted((distance_from_start[p] + distance_from_destination[p], hops, rank) 
+                             for rank, (_, p, hops) in enumerate(candidates) 
+                             if distance_from_start[p] + distance_from_destination[p] != float('inf'))
+
+            for k in (1, 3, len(candidates) + 2):
+                options = myCity.plan_top_k(start, destination, k)
+                self.assertEqual([(option[0], option[4], option[2], option[3]) for option in options], 
+                                 [(time, hops, candidates[rank][0], candidates[rank][1]) for time, hops, rank in ranking[:k]])
+                for total_time, route, _, pickup, _ in options:
+                    self.assertEqual((route[0], route[-1]), (start, destination))
+                    self.assertIn(pickup, route)
+            self.assertEqual(myCity.plan_top_k(start, destination, 1)[0][:4], myCity.plan(start, destination))
+
+        with self.assertRaises(ValueError):
+            myCity.plan_top_k(0, 1, 0)
+
 if __name__ == '__main__':
     unittest.main()
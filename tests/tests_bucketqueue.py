@@ -0,0 +1,45 @@
+from src.bucketqueue import BucketQueue
+import unittest
+
+class TestBucketQueue(unittest.TestCase):
+
+    def test_monotone_extraction(self):
+        queue = BucketQueue(max_weight=4)
+        queue.insert("a", 0)
+        self.assertEqual(queue.extract_min(), ("a", 0))
+
+        # every priority lies within max_weight of the last extracted one
+        for value, priority in [("b", 3), ("c", 1), ("d", 4), ("e", 1)]:
+            queue.insert(value, priority)
+        self.assertEqual(queue.peek(), ("c", 1))
+        self.assertEqual(queue.extract_min(), ("c", 1))
+        self.assertEqual(queue.extract_min(), ("e", 1))
+
+        # the circular buckets wrap around past max_weight
+        queue.insert("f", 5)
+        queue.insert("g", 2)
+        got = [queue.extract_min() for _ in range(len(queue))]
+        self.assertEqual(got, [("g", 2), ("b", 3), ("d", 4), ("f", 5)])
+        self.assertTrue(queue.is_empty())
+        self.assertIsNone(queue.extract_min())
+        self.assertIsNone(queue.peek())
+
+
+    def test_update_is_lazy(self):
+        queue = BucketQueue(max_weight=10)
+        queue.insert(7, 9)
+        queue.update(7, 2)
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.extract_min(), (7, 2))
+        self.assertEqual(queue.extract_min(), (7, 9)) # the stale copy is left for the caller to skip
+
+
+    def test_zero_max_weight(self):
+        queue = BucketQueue(max_weight=0)
+        queue.insert(1, 0)
+        queue.insert(2, 0)
+        self.assertEqual(queue.extract_min(), (1, 0))
+        self.assertEqual(queue.extract_min(), (2, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+from src.graph import Graph
+from src.csrgraph import CSRGraph
+import unittest
+
+class TestCSRGraph(unittest.TestCase):
+
+    def test_arrays_match_adjacency_list(self):
+        roads = [(0,1,4), (0,3,2), (2,0,3), (3,1,2), (2,4,2), (4,5,3)]
+        tracks = [(1,3,3), (3,4,2), (4,3,2), (4,5,4), (5,1,6)]
+        friends = [("Grizz", 1), ("Ice", 3)]
+        graph = Graph(roads, tracks, friends)
+        csr = CSRGraph(roads, tracks, friends)
+
+        self.assertEqual(len(csr), 6)
+        self.assertEqual(list(csr.offsets), [0, 3, 5, 7, 9, 11, 12])
+        for u in range(len(csr)):
+            self.assertEqual(list(csr.adjacent(u)), graph.adjacent(u))
+            self.assertEqual(csr.friend_info[u], graph.get_graph()[u][1])
+
+
+    def test_pickup_candidate_index(self):
+        roads = [(4, 0, 3), (0, 2, 4), (2, 3, 2), (4, 2, 2), (3, 0, 4), (1, 2, 1)]
+        tracks = [(2, 3, 3), (4, 0, 1), (0, 1, 2)]
+        friends = [('Winter', 0), ('Joy', 3), ('Irene', 2), ('CH', 3), ('Karina', 4)]
+        graph = Graph(roads, tracks, friends)
+        csr = CSRGraph(roads, tracks, friends)
+
+        # every pickup option, in location order, then train hops, then friend order
+        self.assertEqual(graph.pickup_candidates, [
+            ('Winter', 0, 0), ('Karina', 0, 1), ('Winter', 1, 1), ('Karina', 1, 2),
+            ('Irene', 2, 0), ('Joy', 3, 0), ('CH', 3, 0), ('Irene', 3, 1), ('Karina', 4, 0),
+        ])
+        self.assertEqual(csr.pickup_candidates, graph.pickup_candidates)
+
+        # the adjacency list keeps the first option of each location
+        scanned = [info for _, info in graph.get_graph() if info[0]]
+        firsts = [c for i, c in enumerate(graph.pickup_candidates) if i == 0 or graph.pickup_candidates[i - 1][1] != c[1]]
+        self.assertEqual(scanned, firsts)
+        self.assertEqual(graph.pickup_locations, frozenset({0, 1, 2, 3, 4}))
+        self.assertEqual(csr.pickup_locations, graph.pickup_locations)
+
+
+    def test_get_graph_view(self):
+        roads = [(0,1,2), (1,2,3)]
+        tracks = [(0,2,3)]
+        friends = [('RB', 2)]
+        graph = Graph(roads, tracks, friends)
+        view = CSRGraph(roads, tracks, friends).get_graph()
+
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view[1], [[(1, 0, 2), (1, 2, 3)], (None, float('inf'), float('inf'))])
+        self.assertEqual(view[-1], graph.get_graph()[2])
+        self.assertEqual(list(view), graph.get_graph())
+        with self.assertRaises(IndexError):
+            view[3]
+
+
+    def test_single_location_without_roads(self):
+        csr = CSRGraph([], [], [("Grizz", 0)])
+        self.assertEqual(len(csr), 1)
+        self.assertEqual(list(csr.adjacent(0)), [])
+        self.assertEqual(csr.friend_info[0], ("Grizz", 0, 0))
+
+
+    def test_weights_must_be_32_bit_integers(self):
+        for weight in [1.5, 2 ** 31, -2 ** 31 - 1, "3"]:
+            with self.assertRaises(ValueError):
+                CSRGraph([(0,1,1), (1,2,weight)], [], [("Grizz", 2)])
+
+        csr = CSRGraph([(0,1,2 ** 31 - 1), (1,2,-2 ** 31)], [], [("Grizz", 2)])
+        self.assertEqual(list(csr.weights), [2 ** 31 - 1, 2 ** 31 - 1, -2 ** 31, -2 ** 31])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+from src.assignment1 import CityMap
+from src.loader import EdgeColumns, read_edges, read_friends
+from array import array
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+class TestLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.roads = [(i, (i + 1) % 100, (i * 7) % 5 + 1) for i in range(100)] + [(i, (i + 37) % 100, 9) for i in range(0, 100, 3)]
+        self.tracks = [(i, (i + 2) % 100, 1) for i in range(0, 100, 5)]
+        self.friends = [("Grizz", 50), ("Ice", 99), ("Bebe, the second", 10)]
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+
+    def test_edge_columns(self):
+        columns = EdgeColumns()
+        columns.extend(iter(self.roads))
+        self.assertEqual(len(columns), len(self.roads))
+        self.assertEqual(list(columns), self.roads)
+        self.assertEqual(list(columns), self.roads) # it can be iterated again
+
+
+    def test_from_iterables(self):
+        city = CityMap(self.roads, self.tracks, self.friends, backend="csr")
+        streamed = CityMap.from_iterables(iter(self.roads), iter(self.tracks), iter(self.friends))
+
+        for start, destination in [(0, 99), (3, 3), (42, 17), (88, 61)]:
+            self.assertEqual(streamed.plan(start, destination), city.plan(start, destination))
+        self.assertEqual(list(streamed.road_graph.get_graph()), list(city.road_graph.get_graph()))
+
+
+    def test_from_files(self):
+        roads_path = self.write("roads.csv", "start,end,weight\n" + "".join(f"{u},{v},{w}\n" for u, v, w in self.roads))
+        tracks_path = self.write("tracks.csv", "# tracks\n\n" + "".join(f"{u},{v},{w}\n" for u, v, w in self.tracks))
+        friends_path = self.write("friends.csv", "name,location\n" + "".join(f"{name},{location}\n" for name, location in self.friends))
+        self.assertEqual(read_friends(friends_path), self.friends)
+
+        binary_path = os.path.join(self.directory, "roads.bin")
+        with open(binary_path, "wb") as file:
+            values = array('i', [value for road in self.roads for value in road])
+            if sys.byteorder == "big": # the files are little endian
+                values.byteswap()
+            file.write(values.tobytes())
+        self.assertEqual(list(read_edges(binary_path)), self.roads)
+
+        city = CityMap(self.roads, self.tracks, self.friends, backend="csr")
+        for path in (roads_path, binary_path):
+            loaded = CityMap.from_files(path, tracks_path, friends_path)
+            for start, destination in [(0, 99), (42, 17)]:
+                self.assertEqual(loaded.plan(start, destination), city.plan(start, destination))
+
+
+    def test_malformed_files(self):
+        with self.assertRaises(ValueError):
+            read_edges(self.write("roads.csv", "0,1,2\n1,2\n"))
+        with self.assertRaises(ValueError):
+            read_friends(self.write("friends.csv", "Grizz,1\nIce\n"))
+        with open(os.path.join(self.directory, "bad.bin"), "wb") as file:
+            file.write(bytes(8))
+        with self.assertRaises(ValueError):
+            read_edges(os.path.join(self.directory, "bad.bin"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+from src.minheap import MinHeap, IndexedMinHeap
+import random
+import unittest
+
+class TestMinHeap(unittest.TestCase):
+
+    def test_insert_and_extract(self):
+        heap = MinHeap()
+        for value, priority in [("a", 5), ("b", 3), ("c", 8), ("d", 1), ("e", 3)]:
+            heap.insert(value, priority)
+
+        self.assertEqual(heap.peek(), ("d", 1))
+        self.assertEqual(len(heap), 5)
+        got = [heap.extract_min()[1] for _ in range(5)]
+        self.assertEqual(got, [1, 3, 3, 5, 8])
+        self.assertTrue(heap.is_empty())
+        self.assertIsNone(heap.extract_min())
+
+
+    def test_heapify(self):
+        rng = random.Random(7)
+        items = [(i, rng.randrange(50)) for i in range(300)]
+        heap = MinHeap()
+        heap.heapify(items)
+
+        self.assertEqual(len(heap), 300)
+        self.assertEqual([heap.extract_min()[1] for _ in range(300)], sorted(priority for _, priority in items))
+
+
+    def test_push_pop_and_replace(self):
+        heap = MinHeap()
+        self.assertEqual(heap.push_pop("a", 4), ("a", 4)) # empty heap returns the new element
+        self.assertTrue(heap.is_empty())
+        with self.assertRaises(IndexError):
+            heap.replace("a", 4)
+
+        heap.heapify([("b", 2), ("c", 6), ("d", 9)])
+        self.assertEqual(heap.push_pop("e", 1), ("e", 1)) # smaller than the root, heap unchanged
+        self.assertEqual(heap.push_pop("f", 7), ("b", 2))
+        self.assertEqual(heap.replace("g", 1), ("c", 6)) # returned even though the new element is smaller
+        self.assertEqual(heap.heap[0], ("g", 1))
+        self.assertEqual([heap.extract_min() for _ in range(3)], [("g", 1), ("f", 7), ("d", 9)])
+
+
+class TestIndexedMinHeap(unittest.TestCase):
+
+    def test_extract_in_priority_order(self):
+        heap = IndexedMinHeap(6)
+        for value, priority in [(0, 5), (1, 3), (2, 8), (3, 1), (4, 4), (5, 7)]:
+            heap.insert(value, priority)
+
+        got = [heap.extract_min() for _ in range(6)]
+        expected = [(3, 1), (1, 3), (4, 4), (0, 5), (5, 7), (2, 8)]
+        self.assertEqual(got, expected)
+        self.assertTrue(heap.is_empty())
+        self.assertIsNone(heap.extract_min())
+
+
+    def test_decrease_key_contains_and_peek(self):
+        heap = IndexedMinHeap(4)
+        heap.insert(0, 10)
+        heap.insert(1, 20)
+        heap.insert(2, 30)
+
+        self.assertTrue(heap.contains(2))
+        self.assertFalse(heap.contains(3))
+        self.assertEqual(heap.peek(), (0, 10))
+
+        heap.decrease_key(2, 5)
+        self.assertEqual(heap.peek(), (2, 5))
+        self.assertEqual(len(heap), 3)
+
+        # a larger key is ignored
+        heap.decrease_key(1, 50)
+        self.assertEqual(heap.extract_min(), (2, 5))
+        self.assertFalse(heap.contains(2))
+        self.assertEqual(heap.extract_min(), (0, 10))
+        self.assertEqual(heap.extract_min(), (1, 20))
+
+
+    def test_matches_minheap_on_random_operations(self):
+        rng = random.Random(2004)
+        size = 200
+        indexed = IndexedMinHeap(size)
+        keys = {}
+
+        for _ in range(1000):
+            value = rng.randrange(size)
+            priority = rng.randrange(10000)
+            if indexed.contains(value):
+                indexed.decrease_key(value, priority)
+                keys[value] = min(keys[value], priority)
+            elif value not in keys:
+                indexed.insert(value, priority)
+                keys[value] = priority
+
+        reference = MinHeap()
+        for value, priority in keys.items():
+            reference.insert(value, priority)
+
+        while not reference.is_empty():
+            self.assertEqual(indexed.extract_min()[1], reference.extract_min()[1])
+        self.assertTrue(indexed.is_empty())
+
+if __name__ == '__main__':
+    unittest.main()
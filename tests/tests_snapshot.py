@@ -0,0 +1,62 @@
+from src.assignment1 import CityMap
+import os
+import tempfile
+import unittest
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.roads = [(i, (i + 1) % 100, (i * 7) % 5 + 1) for i in range(100)] + [(i, (i + 37) % 100, 9) for i in range(0, 100, 3)]
+        self.tracks = [(i, (i + 2) % 100, 1) for i in range(0, 100, 5)] + [(40, 50, 2)]
+        self.friends = [("Grizz", 50), ("Ice", 99), ("Bebe", 10), ("Grizz", 40)]
+        handle, self.path = tempfile.mkstemp(suffix=".citymap")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+
+    def test_round_trip(self):
+        queries = [(0, 99), (3, 3), (42, 17), (88, 61)]
+        for backend in ("list", "csr"):
+            city = CityMap(self.roads, self.tracks, self.friends, backend=backend, max_hops=3)
+            city.save(self.path)
+
+            for use_mmap in (True, False):
+                loaded = CityMap.load(self.path, mmap=use_mmap)
+                for start, destination in queries:
+                    self.assertEqual(loaded.plan(start, destination), city.plan(start, destination))
+                self.assertEqual(loaded.road_graph.pickup_candidates, city.road_graph.pickup_candidates)
+                self.assertEqual(loaded.road_graph.tracks, self.tracks)
+                self.assertEqual(loaded.road_graph.friends, self.friends)
+                self.assertEqual(loaded.road_graph.max_hops, 3)
+                self.assertEqual(list(loaded.road_graph.get_graph()), list(city.road_graph.get_graph()))
+
+
+    def test_save_loaded_city(self):
+        CityMap(self.roads, self.tracks, self.friends).save(self.path)
+        loaded = CityMap.load(self.path)
+
+        handle, copy_path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            loaded.save(copy_path)
+            with open(self.path, "rb") as original, open(copy_path, "rb") as copy:
+                self.assertEqual(original.read(), copy.read())
+        finally:
+            os.remove(copy_path)
+
+
+    def test_invalid_files(self):
+        with self.assertRaises(ValueError):
+            CityMap([(0,1,1.5)], [], [("Grizz", 0)]).save(self.path)
+        with self.assertRaises(ValueError):
+            CityMap([(0,1,1), (1,2,2 ** 31)], [], [("Grizz", 0)]).save(self.path)
+
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot at all, just some text" * 4)
+        with self.assertRaises(ValueError):
+            CityMap.load(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
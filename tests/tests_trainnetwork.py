@@ -0,0 +1,121 @@
+from src.assignment1 import CityMap
+from src.trainnetwork import TrainNetwork
+import os
+import random
+import tempfile
+import unittest
+
+class TestTrainNetwork(unittest.TestCase):
+
+    def test_two_hops_regardless_of_track_order(self):
+        tracks = [(0,1,2), (1,2,3), (2,3,4)]
+        friends = [("Grizz", 0)]
+
+        # the track into 2 is listed before the track into 1
+        for order in (tracks, tracks[::-1]):
+            network = TrainNetwork(order, friends)
+            self.assertEqual(network.reach(0), {0: 0, 1: 1, 2: 2})
+            self.assertEqual(network.candidates(), [("Grizz", 0, 0), ("Grizz", 1, 1), ("Grizz", 2, 2)])
+
+
+    def test_fewest_hops_through_cycles(self):
+        tracks = [(0,1,2), (1,0,2), (1,2,3), (0,2,5)]
+        network = TrainNetwork(tracks, [("Panda", 0)])
+        self.assertEqual(network.reach(0), {0: 0, 1: 1, 2: 1})
+
+
+    def test_every_friend_at_a_location(self):
+        tracks = [(1,3,3), (2,3,2)]
+        friends = [("Grizz", 3), ("Ice", 1), ("Panda", 2), ("Nom", 3)]
+        network = TrainNetwork(tracks, friends)
+
+        self.assertEqual(sorted(network.pickups[3]), [(0, 0), (1, 1), (2, 1), (3, 0)])
+        self.assertEqual(network.best_pickup(3), ("Grizz", 3, 0))
+        self.assertEqual([c for c in network.candidates() if c[1] == 3],
+                         [("Grizz", 3, 0), ("Nom", 3, 0), ("Ice", 3, 1), ("Panda", 3, 1)])
+        self.assertIsNone(network.best_pickup(0))
+
+
+    def test_max_hops(self):
+        tracks = [(0,1,1), (1,2,1), (2,3,1)]
+        self.assertEqual(TrainNetwork(tracks, [("Grizz", 0)], max_hops=0).reach(0), {0: 0})
+        self.assertEqual(TrainNetwork(tracks, [("Grizz", 0)], max_hops=3).reach(0), {0: 0, 1: 1, 2: 2, 3: 3})
+
+
+    def test_local_updates_match_a_rebuild(self):
+        # after every friend or track change, the pickup information must be the same as a city built from scratch
+        side = 6
+        roads = [(y * side + x, y * side + x + 1, (x + 2 * y) % 4 + 1) for y in range(side) for x in range(side - 1)]
+        roads += [(y * side + x, (y + 1) * side + x, (3 * x + y) % 5 + 1) for y in range(side - 1) for x in range(side)]
+        tracks = [(0, 7, 2), (7, 14, 3), (14, 21, 1), (21, 0, 2), (3, 9, 4), (9, 15, 1), (35, 28, 2)]
+        friends = [("Grizz", 0), ("Ice", 9), ("Panda", 35)]
+        rng = random.Random(7)
+
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            CityMap(roads, tracks, friends, backend="csr").save(path)
+            cities = [CityMap(roads, tracks, friends), CityMap(roads, tracks, friends, backend="csr"), CityMap.load(path)]
+            cities[1].build_contraction_hierarchy()
+
+            names = ["Grizz", "Ice", "Panda"]
+            for step in range(40):
+                action = step % 5
+                if action == 0:
+                    name = f"friend{step}"
+                    names.append(name)
+                    arguments = ("add_friend", name, rng.randrange(side * side))
+                elif action == 1:
+                    arguments = ("move_friend", rng.choice(names), rng.randrange(side * side))
+                elif action == 2 and len(names) > 1:
+                    name = rng.choice(names)
+                    names.remove(name)
+                    arguments = ("remove_friend", name)
+                elif action == 3 or not cities[0].road_graph.tracks:
+                    arguments = ("add_track", rng.randrange(side * side), rng.randrange(side * side), 3)
+                else:
+                    start_vertex, end_vertex, _ = rng.choice(list(cities[0].road_graph.tracks))
+                    arguments = ("remove_track", start_vertex, end_vertex)
+
+                for city in cities:
+                    getattr(city, arguments[0])(*arguments[1:])
+
+                graph = cities[0].road_graph
+                rebuilt = CityMap(roads, list(graph.tracks), list(graph.friends))
+                for city in cities:
+                    self.assertEqual(city.pickup_candidates(), rebuilt.pickup_candidates())
+                    self.assertEqual(city.road_graph.pickup_locations, rebuilt.road_graph.pickup_locations)
+                    self.assertEqual(city.plan(0, 35)[::2], rebuilt.plan(0, 35)[::2])
+                self.assertEqual(cities[0].road_graph.get_graph(), rebuilt.road_graph.get_graph())
+                self.assertEqual(cities[1].road_graph.friend_info, CityMap(roads, list(graph.tracks), list(graph.friends), 
+                                                                           backend="csr").road_graph.friend_info)
+
+            with self.assertRaises(ValueError):
+                cities[0].remove_friend("Nobody")
+            with self.assertRaises(ValueError):
+                cities[0].remove_track(1, 2)
+        finally:
+            os.remove(path)
+
+
+    def test_plan_after_removing_every_friend(self):
+        roads = [(0, 1, 1), (1, 2, 1), (2, 3, 2)]
+        for backend in ("list", "csr"):
+            city = CityMap(roads, [(1, 3, 2)], [("Grizz", 2), ("Ice", 3)], backend=backend)
+            city.remove_friend("Grizz")
+            city.remove_friend("Ice")
+
+            no_pickup = (float('inf'), [], None, None)
+            self.assertEqual(city.plan(0, 3), no_pickup)
+            self.assertEqual(city.plan(0, 3, fused=True), no_pickup)
+            self.assertEqual(city.plan_many([(0, 3), (3, 1)]), [no_pickup, no_pickup])
+            self.assertEqual(city.plan_top_k(0, 3, 2), [])
+            city.build_contraction_hierarchy()
+            self.assertEqual(city.plan(0, 3), no_pickup)
+
+            # a friend added back is picked up again
+            city.add_friend("Panda", 1)
+            self.assertEqual(city.plan(0, 3), (4, [0, 1, 2, 3], "Panda", 1))
+
+if __name__ == '__main__':
+    unittest.main()
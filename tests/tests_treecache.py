@@ -0,0 +1,130 @@
+from src.assignment1 import CityMap
+from src.graph import Graph
+from src.treecache import TreeCache
+import random
+import unittest
+
+class TestTreeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = Graph([(0, 1, 1), (1, 2, 1)], [], [("Grizz", 0)])
+        self.tree = ([0, 1, 2], [-1, 0, 1])
+
+
+    def test_lru_eviction_by_entries(self):
+        cache = TreeCache(self.graph, max_entries=2)
+        cache.put(0, self.tree)
+        cache.put(1, self.tree)
+        self.assertIs(cache.get(0), self.tree) # 0 is now the most recently used
+        cache.put(2, self.tree)
+
+        self.assertIsNone(cache.get(1))
+        self.assertIs(cache.get(0), self.tree)
+        self.assertIs(cache.get(2), self.tree)
+        self.assertEqual(cache.stats(), {"hits": 3, "misses": 1, "evictions": 1, "entries": 2, "bytes": cache.total_bytes})
+
+
+    def test_eviction_by_bytes(self):
+        size = TreeCache(self.graph).tree_bytes(self.tree)
+        cache = TreeCache(self.graph, max_bytes=2 * size)
+        for source in range(3):
+            cache.put(source, self.tree)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.total_bytes, 2 * size)
+        self.assertIsNone(cache.get(0))
+
+
+    def test_partial_trees_cover_their_targets(self):
+        cache = TreeCache(self.graph, max_entries=4)
+        cache.put(0, self.tree, targets={1, 2})
+
+        self.assertIs(cache.get(0, targets={2}), self.tree)
+        self.assertIsNone(cache.get(0, targets={0, 3}))
+        self.assertIsNone(cache.get(0)) # a complete tree is needed
+
+
+    def test_invalidated_when_graph_changes(self):
+        cache = TreeCache(self.graph, max_entries=4)
+        cache.put(0, self.tree)
+        self.graph.version += 1
+
+        self.assertIsNone(cache.get(0))
+        self.assertEqual(len(cache), 0)
+
+
+    def test_city_map_uses_cache(self):
+        roads = [(0,1,4), (0,3,2), (2,0,3), (3,1,2), (2,4,2), (4,5,3)]
+        tracks = [(1,3,3), (3,4,2), (4,3,2), (4,5,4), (5,1,6)]
+        friends = [("Grizz", 1), ("Ice", 3)]
+        cachedCity = CityMap(roads, tracks, friends, cache_entries=8)
+        plainCity = CityMap(roads, tracks, friends)
+
+        queries = [(2, 5), (0, 4), (2, 0), (5, 2), (2, 5)]
+        for start, destination in queries:
+            self.assertEqual(cachedCity.plan(start, destination, tree_route=True), plainCity.plan(start, destination, tree_route=True))
+        self.assertEqual(cachedCity.settled_count, 0) # both trees of the last query were cached
+        self.assertEqual(cachedCity.tree_cache.stats()["hits"], 6)
+
+        # the search from the pickup goes through the cache too
+        for start, destination in queries:
+            self.assertEqual(cachedCity.plan(start, destination), plainCity.plan(start, destination))
+
+        self.assertEqual(cachedCity.dijkstras(start_node=3), plainCity.dijkstras(start_node=3))
+        self.assertEqual(cachedCity.dijkstras(start_node=3, end_node=5), plainCity.dijkstras(start_node=3, end_node=5))
+        self.assertEqual(cachedCity.settled_count, 0)
+
+    def test_trees_repaired_after_road_updates(self):
+        # after every update the repaired trees must hold the distances of a new search, and a valid parent for each
+        side = 7
+        roads = [(y * side + x, y * side + x + 1, (x * 3 + y) % 5 + 1) for y in range(side) for x in range(side - 1)]
+        roads += [(y * side + x, (y + 1) * side + x, (x + y) % 4 + 1) for y in range(side - 1) for x in range(side)]
+        city = CityMap(roads, [], [("Grizz", 0)], cache_entries=10)
+        sources = [0, 24, 48]
+        rng = random.Random(4)
+
+        for step in range(60):
+            for source in sources:
+                city.dijkstras(start_node=source) # cached complete trees
+            u, v = rng.choice(roads)[:2]
+            weight = city.road_graph.road_weight(u, v)
+            if weight is None:
+                city.add_road(u, v, rng.randint(1, 6))
+            elif step % 5 == 0:
+                self.assertEqual(city.remove_road(u, v), weight)
+            else:
+                self.assertEqual(city.update_road(u, v, rng.randint(1, 9)), weight)
+            self.assertEqual(len(city.tree_cache), len(sources)) # repaired, not dropped
+
+            fresh = CityMap.__new__(CityMap)
+            fresh.road_graph = city.road_graph # searches without the cache, on the same roads
+            fresh.init_search_state()
+            for source in sources:
+                distance, parent = city.tree_cache.get(source)
+                self.assertEqual(distance, fresh.dijkstras(start_node=source)[0])
+                for x, p in enumerate(parent):
+                    if p != -1:
+                        self.assertEqual(distance[p] + city.road_graph.road_weight(p, x), distance[x])
+
+
+    def test_road_update_errors(self):
+        city = CityMap([(0, 1, 1), (1, 2, 1)], [], [("Grizz", 0)], cache_entries=2)
+        with self.assertRaises(ValueError):
+            city.add_road(0, 1, 3) # already exists
+        with self.assertRaises(ValueError):
+            city.update_road(0, 2, 3) # no such road
+        with self.assertRaises(ValueError):
+            city.remove_road(0, 7) # no such location
+        with self.assertRaises(ValueError):
+            CityMap([(0, 1, 1)], [], [("Grizz", 0)], backend="csr").update_road(0, 1, 2)
+
+        # two changes without a search in between cannot be repaired, the cache is emptied instead
+        city.dijkstras(start_node=0)
+        city.road_graph.update_road(0, 1, 5)
+        city.update_road(1, 2, 5)
+        self.assertEqual(len(city.tree_cache), 0)
+        self.assertEqual(city.dijkstras(start_node=0)[0], [0, 5, 10])
+
+
+if __name__ == '__main__':
+    unittest.main()